@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Búsqueda difusa de nombres (errores de escritura y tildes faltantes).
+
+Índice tipo SymSpell: para cada palabra del vocabulario se precalculan sus
+variantes con hasta `max_distancia` letras borradas. Una consulta solo genera
+los borrados de la palabra buscada y los cruza con el diccionario, así que no
+se recorre la lista de nombres. Si no aparece nada dentro de la distancia
+máxima, el respaldo busca con una letra más usando los borrados de un nivel
+más, que se calculan con el índice (no hay barrido de todo el vocabulario).
+
+Los contactos salen de las publicaciones de la palabra más selectiva, por
+distancia creciente y en orden de id: en cuanto k contactos le ganan a todo
+lo que falta se corta. Si todas las palabras están tal cual en el
+vocabulario y hay k contactos con todas, ni siquiera se buscan vecinas.
+
+Medido con 10^6 contactos (202 mil nombres reales repetidos) en un núcleo:
+palabras que existen ('maria', 'juan carlos') 0,02-0,2 ms; con un error
+('marai', 'juan carlso') 1-1,5 ms; respaldo ('mariaaaaaaa') unos 4 ms;
+construir el índice, 2,5 s.
+
+Uso:
+    python3 busqueda_difusa.py "cesar montoya"
+    python3 busqueda_difusa.py Velasquez -k 5
+"""
+import argparse
+import heapq
+import sys
+import time
+from collections import defaultdict
+
+from contacto import cargar_contactos
+from normalizacion import clave_normalizada
+
+
+def distancia_edicion(a, b, maximo=None):
+    """
+    Distancia Damerau-Levenshtein (transposiciones adyacentes)
+    Si se indica `maximo`, solo calcula la banda |i - j| <= maximo y corta
+    en cuanto la distancia lo supera (devuelve maximo + 1)
+    """
+    if a == b:
+        return 0
+    largo_a, largo_b = len(a), len(b)
+    if maximo is None:
+        maximo = max(largo_a, largo_b)
+    elif abs(largo_a - largo_b) > maximo:
+        return maximo + 1
+    tope = maximo + 1
+    # Fuera de la banda |i - j| <= maximo la distancia ya pasa el máximo
+    anterior_previa = None
+    anterior = [j if j <= maximo else tope for j in range(largo_b + 1)]
+    for i in range(1, largo_a + 1):
+        letra = a[i - 1]
+        previa = a[i - 2] if i > 1 else None
+        desde = i - maximo if i > maximo else 1
+        hasta = i + maximo if i + maximo < largo_b else largo_b
+        actual = [tope] * (largo_b + 1)
+        if i <= maximo:
+            actual[0] = i
+        minimo = actual[desde - 1]
+        for j in range(desde, hasta + 1):
+            otra = b[j - 1]
+            valor = anterior[j - 1] + (letra != otra)
+            if anterior[j] + 1 < valor:
+                valor = anterior[j] + 1
+            if actual[j - 1] + 1 < valor:
+                valor = actual[j - 1] + 1
+            if j > 1 and letra == b[j - 2] and previa == otra and anterior_previa[j - 2] + 1 < valor:
+                valor = anterior_previa[j - 2] + 1
+            actual[j] = valor
+            if valor < minimo:
+                minimo = valor
+        if minimo > maximo:
+            return tope
+        anterior_previa, anterior = anterior, actual
+    return min(anterior[largo_b], tope)
+
+
+def _niveles_borrados(palabra, max_distancia):
+    """Variantes de la palabra por cantidad de letras borradas: nivel 0 (la palabra), 1, ..."""
+    vistas = {palabra}
+    frontera = {palabra}
+    yield frontera
+    for _ in range(max_distancia):
+        siguiente = set()
+        for variante in frontera:
+            if len(variante) <= 1:
+                continue
+            for i in range(len(variante)):
+                siguiente.add(variante[:i] + variante[i + 1:])
+        siguiente -= vistas
+        vistas |= siguiente
+        frontera = siguiente
+        yield frontera
+
+
+def _borrados(palabra, max_distancia):
+    """Todas las variantes de la palabra con hasta max_distancia letras borradas"""
+    return set().union(*_niveles_borrados(palabra, max_distancia))
+
+
+class IndiceDifuso:
+    """Índice de borrados sobre las palabras (sin tildes) de los nombres"""
+
+    def __init__(self, contactos, max_distancia=2, longitud_prefijo=7):
+        self.contactos = list(contactos)
+        self.max_distancia = max_distancia
+        self.longitud_prefijo = longitud_prefijo
+        self._publicaciones = defaultdict(list)  # palabra -> ids de contactos
+        self._borrados = defaultdict(list)       # borrado -> palabras del vocabulario
+        self._borrados_respaldo = defaultdict(list)  # solo los de max_distancia + 1 letras
+
+        for i, contacto in enumerate(self.contactos):
+            for palabra in set(clave_normalizada(contacto.get('nombre') or '').split()):
+                self._publicaciones[sys.intern(palabra)].append(i)
+
+        for palabra in self._publicaciones:
+            niveles = _niveles_borrados(palabra[:longitud_prefijo], max_distancia + 1)
+            for nivel, borrados in enumerate(niveles):
+                destino = self._borrados if nivel <= max_distancia else self._borrados_respaldo
+                for borrado in borrados:
+                    destino[borrado].append(palabra)
+
+    def _cercanas(self, palabra, radio, indices):
+        cercanas = {}
+        revisadas = set()
+        for borrado in _borrados(palabra[:self.longitud_prefijo], radio):
+            for indice in indices:
+                for termino in indice.get(borrado, ()):
+                    if termino in revisadas:
+                        continue
+                    revisadas.add(termino)
+                    distancia = distancia_edicion(palabra, termino, radio)
+                    if distancia <= radio:
+                        cercanas[termino] = distancia
+        return cercanas
+
+    def _candidatas(self, palabra):
+        """Palabras del vocabulario cercanas: {palabra: distancia}"""
+        cercanas = self._cercanas(palabra, self.max_distancia, (self._borrados,))
+        if not cercanas:
+            # Respaldo: una letra más de distancia, con los borrados de un nivel más
+            cercanas = self._cercanas(palabra, self.max_distancia + 1,
+                                      (self._borrados, self._borrados_respaldo))
+        return cercanas
+
+    def _palabras_contacto(self, i):
+        return clave_normalizada(self.contactos[i].get('nombre') or '').split()
+
+    def _totales(self, cercanas, k):
+        """
+        {contacto: suma de las mejores distancias de cada palabra}, para los
+        contactos que coinciden con todas. Se corta en cuanto k contactos le
+        ganan a todos los que faltan: puede dejar afuera contactos que no
+        entran entre los k mejores
+        """
+        # Solo se recorren las publicaciones de la palabra más selectiva (la
+        # de menos contactos); las demás se comprueban en cada contacto
+        tamanos = [sum(len(self._publicaciones[t]) for t in c) for c in cercanas]
+        cercanas = list(cercanas)
+        guia = cercanas.pop(tamanos.index(min(tamanos)))
+        piso_otras = sum(min(c.values()) for c in cercanas)
+        por_distancia = defaultdict(list)
+        for termino, distancia in guia.items():
+            por_distancia[distancia].append(termino)
+        distancias = sorted(por_distancia)
+
+        totales = {}
+        vistos = set()
+        for distancia in distancias:
+            # Lo que falta ver suma al menos esto; `seguros` cuenta los
+            # contactos que ya le ganan a todo lo que falta
+            piso = distancia + piso_otras
+            seguros = sum(1 for total in totales.values() if total < piso)
+            if seguros >= k:
+                break
+            publicaciones = [self._publicaciones[t] for t in por_distancia[distancia]]
+            # Ids en orden creciente: los que empatan con el piso ya no pierden
+            # contra los que siguen
+            for i in publicaciones[0] if len(publicaciones) == 1 else heapq.merge(*publicaciones):
+                # Por distancia creciente: la primera vez es la mejor
+                if i in vistos:
+                    continue
+                vistos.add(i)
+                total = distancia
+                palabras_contacto = self._palabras_contacto(i) if cercanas else ()
+                for otras in cercanas:
+                    mejor = min((otras[p] for p in palabras_contacto if p in otras), default=None)
+                    if mejor is None:
+                        break
+                    total += mejor
+                else:
+                    totales[i] = total
+                    if total == piso:
+                        seguros += 1
+                        if seguros >= k:
+                            return totales
+        return totales
+
+    def buscar(self, consulta, k=10):
+        """Los k contactos más cercanos: lista de (distancia, contacto)"""
+        palabras = clave_normalizada(consulta).split()
+        if not palabras:
+            return []
+
+        totales = {}
+        if all(palabra in self._publicaciones for palabra in palabras):
+            # Con k contactos que tienen todas las palabras tal cual, el
+            # resultado son ellos (distancia 0): no hace falta ver vecinas
+            totales = self._totales([{palabra: 0} for palabra in palabras], k)
+        if len(totales) < k:
+            cercanas = [self._candidatas(palabra) for palabra in palabras]
+            if not all(cercanas):
+                return []
+            totales = self._totales(cercanas, k)
+
+        mejores_k = heapq.nsmallest(k, totales.items(), key=lambda x: (x[1], x[0]))
+        return [(distancia, self.contactos[i]) for i, distancia in mejores_k]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Búsqueda difusa de contactos por nombre")
+    parser.add_argument('consulta')
+    parser.add_argument('--archivo', default='CONTACTOS_FINALES_SIN_A.json')
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--max-distancia', type=int, default=2)
+    args = parser.parse_args()
+
+    contactos = cargar_contactos(args.archivo)
+
+    inicio = time.perf_counter()
+    indice = IndiceDifuso(contactos, max_distancia=args.max_distancia)
+    print(f"📚 Índice difuso: {len(indice._publicaciones):,} palabras "
+          f"({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+
+    inicio = time.perf_counter()
+    resultados = indice.buscar(args.consulta, k=args.k)
+    duracion = (time.perf_counter() - inicio) * 1_000_000
+
+    print(f"🔎 {len(resultados)} resultados en {duracion:.0f} µs")
+    for distancia, c in resultados:
+        print(f"   [{distancia}] {c.get('nombre'):<35} | {c['telefono']}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Capitalización de nombres en español y portugués.
+
+Un solo motor para todos los scripts de limpieza:
+- Partículas en minúscula salvo al inicio: de, del, la, el, los, las, y, da, do, dos
+- Cada parte de un nombre compuesto con guion o apóstrofo va en mayúscula
+  ("María-José", "O'Brien", "D'Angelo")
+- Prefijo Mc solo si el nombre ya lo trae ("McNally", "MCNALLY") o si es un
+  apellido conocido ("mcdonald" -> "McDonald"): "mcarolina" sigue siendo
+  "Mcarolina"
+
+Los nombres de pila se repiten mucho, así que cada palabra distinta se
+capitaliza una sola vez (caché LRU).
+
+Uso:
+    from capitalizacion import capitalizar_nombre, capitalizar_lote
+    capitalizar_nombre('MARIA DE LOS ANGELES')   # 'Maria de los Angeles'
+"""
+import re
+from functools import lru_cache
+
+PARTICULAS = frozenset(['de', 'del', 'la', 'el', 'los', 'las', 'y', 'da', 'do', 'dos'])
+
+# Apellidos Mc que se capitalizan así aunque vengan en minúscula
+APELLIDOS_MC = frozenset(['mcallister', 'mcbride', 'mccarthy', 'mcdonald', 'mcgregor',
+                          'mckenzie', 'mclaren', 'mcnally'])
+
+# Mc seguido de mayúscula en el texto original: 'McNally', 'MCNALLY'
+_PATRON_MC = re.compile(r'M[cC][A-ZÁÉÍÓÚÑ]')
+
+# Separa una palabra en partes conservando guiones y apóstrofos
+_PATRON_SEPARADORES = re.compile(r"([-'’])")
+
+# Cambio minúscula -> mayúscula dentro de una palabra ("cesarMontoya"),
+# salvo el de un prefijo Mc ("McDonald")
+_PATRON_CAMELCASE = re.compile(r'(?<=[a-z])(?<!\bMc)(?=[A-Z])')
+
+
+def _capitalizar_parte(parte):
+    minuscula = parte.lower()
+    if len(parte) > 4 and (minuscula in APELLIDOS_MC or _PATRON_MC.match(parte)):
+        return 'Mc' + minuscula[2].upper() + minuscula[3:]
+    return minuscula[:1].upper() + minuscula[1:]
+
+
+@lru_cache(maxsize=65536)
+def capitalizar_palabra(palabra):
+    """Capitaliza una palabra suelta (sin tratar partículas)"""
+    partes = _PATRON_SEPARADORES.split(palabra)
+    return ''.join(_capitalizar_parte(parte) for parte in partes)
+
+
+def capitalizar_nombre(nombre):
+    """Capitaliza un nombre completo; None o vacío se devuelven tal cual"""
+    if not nombre:
+        return nombre
+
+    resultado = []
+    for i, palabra in enumerate(nombre.split()):
+        minuscula = palabra.lower()
+        if i > 0 and minuscula in PARTICULAS:
+            resultado.append(minuscula)
+        else:
+            resultado.append(capitalizar_palabra(palabra))
+    return ' '.join(resultado)
+
+
+def tiene_camelcase(texto):
+    """True si hay palabras pegadas por mayúscula: 'CesarMontoya'"""
+    return _PATRON_CAMELCASE.search(texto) is not None
+
+
+def separar_camelcase(texto):
+    """'CesarMontoya' -> 'Cesar Montoya' (respeta 'McDonald')"""
+    return _PATRON_CAMELCASE.sub(' ', texto)
+
+
+def capitalizar_lote(nombres):
+    """Capitaliza varios nombres; conserva el orden"""
+    return [capitalizar_nombre(nombre) for nombre in nombres]
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Clasificador de nombres: persona, negocio o basura.
+
+El volcado crudo trae entradas como '?? Kk', '??!!5', '???' o '01 19' que
+hoy sobreviven o caen por chequeos sueltos de largo. Este módulo las puntúa
+con un modelo naive Bayes sobre n-gramas de caracteres (1 a 3) y palabras
+completas, cada rasgo a una cubeta fija (hashing), para que la basura salga
+antes de las etapas caras (segmentación de nombres pegados, validación de
+WhatsApp).
+
+El modelo se entrena con los propios datos: lo que no tiene ninguna palabra
+(o solo meses y días, y el motor de limpieza lo descarta) es basura, lo que
+tiene una palabra de negocio es negocio y el resto es persona; la basura se
+completa con ejemplos sintéticos de semilla fija. Los datos y el modelo
+(modelo_basura.json) están en el directorio de datos; el modelo se
+reentrena solo si falta o si los datos de entrenamiento son más recientes.
+
+El léxico de negocios manda sobre el modelo: un nombre con una de esas
+palabras es negocio ('Hotel Caribe'), y uno sin ninguna no puede serlo
+('Bo' queda entre persona y basura).
+
+Los lotes se evalúan con NumPy si está instalado (una suma por clase sobre
+todos los n-gramas del lote); si no, con Python puro y el mismo resultado.
+
+Uso:
+    python3 clasificador_basura.py                # clasificar con los valores por defecto
+    python3 clasificador_basura.py entrenar
+    python3 clasificador_basura.py clasificar contactos_ultra_limpios.json CONTACTOS_BASURA.json
+    python3 clasificador_basura.py probar '?? Kk' 'Taxi Pedro' 'Maria Jose'
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import time
+import zlib
+from functools import lru_cache
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:  # el clasificador funciona igual sin NumPy, solo más lento
+    np = None
+
+import metricas
+from contacto import archivo_atomico, ruta_datos
+from lexer_nombres import NOMBRE, PALABRAS, PARTICULA, tokenizar
+from normalizacion import Lexico, clave_normalizada
+
+RUTA_MODELO = ruta_datos('modelo_basura.json')
+RUTA_ENTRENAMIENTO = ruta_datos('contactos_ultra_limpios.json')
+
+PERSONA = 'persona'
+NEGOCIO = 'negocio'
+BASURA = 'basura'
+CLASES = (PERSONA, NEGOCIO, BASURA)
+_NEGOCIO = CLASES.index(NEGOCIO)
+_SOLO_NEGOCIO = [1.0 if clase == NEGOCIO else 0.0 for clase in CLASES]
+
+CUBETAS = 1 << 14
+ORDENES = (1, 2, 3)
+UMBRAL_BASURA = 0.9  # confianza mínima para sacar un nombre como basura
+SEMILLA = 39
+
+_CLASIFICADOS = metricas.contador(
+    'clasificador_nombres_total', 'Nombres clasificados por clase', ('clase',))
+_LATENCIA_LOTE = metricas.histograma(
+    'clasificador_lote_segundos', 'Latencia de clasificar un lote de nombres')
+
+# Palabras que delatan un negocio o servicio (etiquetado del entrenamiento)
+PALABRAS_NEGOCIO = Lexico([
+    'agencia', 'airbnb', 'aseo', 'banco', 'booking', 'brokers', 'burger',
+    'carpintero', 'claro', 'clinica', 'constructora', 'contador', 'davivienda',
+    'drogueria', 'electricaribe', 'electricista', 'empresa', 'expedia',
+    'ferreteria', 'google', 'grua', 'grupo', 'hostal', 'hotel', 'indriver',
+    'inmobiliaria', 'joyeria', 'latoneria', 'lavadora', 'litografia', 'ltda',
+    'luxury', 'mecanico', 'mercado', 'movistar', 'mudanzas', 'muebles',
+    'oficina', 'olimpica', 'paintball', 'pintor', 'pizza', 'pollo',
+    'repuesto', 'repuestos', 'restaurante', 'sas', 'servientrega', 'spa',
+    'spinning', 'surtigas', 'taxi', 'taxis', 'tienda', 'tigo', 'tour', 'tours',
+    'transporte', 'uber',
+])
+
+
+@lru_cache(maxsize=65536)
+def tiene_palabra_negocio(nombre):
+    """True si alguna palabra del nombre está en PALABRAS_NEGOCIO"""
+    return any(t.texto in PALABRAS_NEGOCIO for t in tokenizar(nombre) if t.tipo in PALABRAS)
+
+
+@lru_cache(maxsize=65536)
+def rasgos(nombre):
+    """Cubetas de los n-gramas de caracteres y de las palabras del nombre (sin repetir)"""
+    # Sin tildes ni mayúsculas y todos los dígitos iguales: '2024' y '1987'
+    # son el mismo rasgo
+    texto = ' ' + re.sub(r'\d', '0', clave_normalizada(nombre)) + ' '
+    cubetas = []
+    for orden in ORDENES:
+        for i in range(len(texto) - orden + 1):
+            ngrama = f'{orden}{texto[i:i + orden]}'.encode('utf-8')
+            cubetas.append(zlib.crc32(ngrama) & (CUBETAS - 1))
+    # Cada palabra completa también es un rasgo: 'hotel' pesa como una unidad
+    # y no se diluye entre los n-gramas del resto del nombre
+    for palabra in texto.split():
+        cubetas.append(zlib.crc32(f'p{palabra}'.encode('utf-8')) & (CUBETAS - 1))
+    return tuple(sorted(set(cubetas)))
+
+
+def _softmax(puntajes):
+    maximo = max(puntajes)
+    exponentes = [math.exp(p - maximo) for p in puntajes]
+    total = sum(exponentes)
+    return [e / total for e in exponentes]
+
+
+class ClasificadorBasura:
+    """Naive Bayes multinomial sobre cubetas de n-gramas (suavizado de Laplace)"""
+
+    def __init__(self, conteos, documentos, alfa=1.0):
+        self.conteos = conteos        # clase -> lista de CUBETAS conteos
+        self.documentos = documentos  # clase -> ejemplos de entrenamiento
+        self.alfa = alfa
+
+        # Previas uniformes: en el volcado hay veinte personas por cada negocio
+        # o basura, y con previas empíricas esas clases quedan aplastadas
+        self._log_previas = [-math.log(len(CLASES))] * len(CLASES)
+        self._log_probabilidades = []
+        for clase in CLASES:
+            denominador = math.log(sum(conteos[clase]) + alfa * CUBETAS)
+            self._log_probabilidades.append(
+                [math.log(n + alfa) - denominador for n in conteos[clase]])
+
+        if np is not None:
+            self._previas_np = np.array(self._log_previas)
+            self._probabilidades_np = np.array(self._log_probabilidades)
+
+    @classmethod
+    def entrenar(cls, ejemplos, alfa=1.0):
+        """ejemplos: iterable de (nombre, clase)"""
+        conteos = {c: [0] * CUBETAS for c in CLASES}
+        documentos = {c: 0 for c in CLASES}
+        for nombre, clase in ejemplos:
+            documentos[clase] += 1
+            fila = conteos[clase]
+            for cubeta in rasgos(nombre):
+                fila[cubeta] += 1
+        return cls(conteos, documentos, alfa)
+
+    def guardar(self, ruta=RUTA_MODELO):
+        modelo = {
+            'cubetas': CUBETAS,
+            'ordenes': list(ORDENES),
+            'alfa': self.alfa,
+            'documentos': self.documentos,
+            'conteos': self.conteos,
+        }
+        # Temporal propio (archivo_atomico): dos entrenamientos a la vez no se pisan
+        with archivo_atomico(ruta) as f:
+            json.dump(modelo, f, separators=(',', ':'))
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_MODELO):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            modelo = json.load(f)
+        if modelo['cubetas'] != CUBETAS or tuple(modelo['ordenes']) != ORDENES:
+            raise ValueError(f"{ruta} se entrenó con otros rasgos; vuelva a entrenar")
+        return cls(modelo['conteos'], modelo['documentos'], modelo['alfa'])
+
+    def _probabilidades_numpy(self, listas, negocios):
+        largos = np.fromiter(map(len, listas), dtype=np.int64, count=len(listas))
+        cubetas = np.fromiter(chain.from_iterable(listas), dtype=np.int64, count=int(largos.sum()))
+        filas = np.repeat(np.arange(len(listas)), largos)
+
+        puntajes = np.tile(self._previas_np, (len(listas), 1))
+        for k in range(len(CLASES)):
+            puntajes[:, k] += np.bincount(filas, weights=self._probabilidades_np[k][cubetas],
+                                          minlength=len(listas))
+        puntajes -= puntajes.max(axis=1, keepdims=True)
+        probabilidades = np.exp(puntajes)
+        # El léxico decide si es negocio; el modelo reparte el resto
+        negocios = np.fromiter(negocios, dtype=bool, count=len(listas))
+        probabilidades[negocios] = _SOLO_NEGOCIO
+        probabilidades[~negocios, _NEGOCIO] = 0.0
+        probabilidades /= probabilidades.sum(axis=1, keepdims=True)
+        mejores = probabilidades.argmax(axis=1)
+        return [(CLASES[k], float(probabilidades[i, k])) for i, k in enumerate(mejores)]
+
+    def _probabilidades_python(self, listas, negocios):
+        resultado = []
+        for cubetas, negocio in zip(listas, negocios):
+            if negocio:
+                resultado.append((NEGOCIO, 1.0))
+                continue
+            puntajes = [previa + sum(fila[c] for c in cubetas)
+                        for previa, fila in zip(self._log_previas, self._log_probabilidades)]
+            puntajes[_NEGOCIO] = float('-inf')
+            probabilidades = _softmax(puntajes)
+            k = probabilidades.index(max(probabilidades))
+            resultado.append((CLASES[k], probabilidades[k]))
+        return resultado
+
+    def clasificar_lote(self, nombres):
+        """Lista de (clase, confianza) para cada nombre, en el mismo orden"""
+        inicio = time.perf_counter()
+        listas = [rasgos(nombre or '') for nombre in nombres]
+        if not listas:
+            return []
+        negocios = [tiene_palabra_negocio(nombre or '') for nombre in nombres]
+        if np is not None:
+            resultado = self._probabilidades_numpy(listas, negocios)
+        else:
+            resultado = self._probabilidades_python(listas, negocios)
+
+        _LATENCIA_LOTE.observar(time.perf_counter() - inicio)
+        for clase in CLASES:
+            _CLASIFICADOS.inc(sum(1 for c, _ in resultado if c == clase), clase=clase)
+        return resultado
+
+    def clasificar(self, nombre):
+        return self.clasificar_lote([nombre])[0]
+
+    def es_basura_lote(self, nombres, umbral=UMBRAL_BASURA):
+        """Lista de booleanos: True si el nombre es basura con confianza >= umbral"""
+        return [clase == BASURA and confianza >= umbral
+                for clase, confianza in self.clasificar_lote(nombres)]
+
+
+def _tiene_palabra(nombre, tipos=PALABRAS):
+    """Alguna palabra de 3 letras o más ('01 19', '?? Kk' no tienen)"""
+    return any(t.tipo in tipos and len(t.texto) >= 3 for t in tokenizar(nombre))
+
+
+def _basura_sintetica(azar, cantidad):
+    """Basura con la forma de la del volcado: signos, fechas sueltas, letras dobles"""
+    consonantes = 'bcdfghjklmnpqrstvwxz'
+    piezas = [
+        lambda: azar.choice('?!.*#-_/') * azar.randint(1, 4),
+        lambda: str(azar.randint(0, 9999)).zfill(azar.choice((1, 2, 4))),
+        lambda: f'{azar.randint(1, 31):02d} {azar.randint(1, 12):02d}',
+        lambda: azar.choice(consonantes).upper() + azar.choice(consonantes),
+        lambda: azar.choice(consonantes).upper() * 2,
+        lambda: azar.choice(consonantes) * azar.randint(2, 4),
+    ]
+    ejemplos = ['?? Kk', '??!!5', '???', '01 19']
+    while len(ejemplos) < cantidad:
+        partes = [azar.choice(piezas)() for _ in range(azar.randint(1, 3))]
+        ejemplos.append(azar.choice(('', ' ')).join(partes))
+    return ejemplos
+
+
+def ejemplos_de_entrenamiento(contactos, semilla=SEMILLA):
+    """
+    (nombre crudo, clase) a partir de los contactos y el motor de limpieza,
+    más basura sintética (tantos ejemplos como negocios, al menos 200)
+    """
+    # Import diferido: el motor importa este módulo
+    from motor_limpieza import limpiar_detallado
+
+    ejemplos = []
+    for contacto in contactos:
+        nombre = contacto['nombre'] or ''
+        # Etiquetar no es limpiar: no cuenta en las métricas del motor
+        _, _, descarte = limpiar_detallado(dict(contacto), registrar=False)
+        if not _tiene_palabra(nombre):
+            clase = BASURA
+        elif descarte and not _tiene_palabra(nombre, (NOMBRE, PARTICULA)):
+            # Descartado por el motor y solo con meses o días: 'Dom 1 Sep 2024'
+            clase = BASURA
+        elif tiene_palabra_negocio(nombre):
+            clase = NEGOCIO
+        else:
+            clase = PERSONA
+        ejemplos.append((nombre, clase))
+
+    negocios = sum(1 for _, clase in ejemplos if clase == NEGOCIO)
+    azar = random.Random(semilla)
+    ejemplos.extend((nombre, BASURA) for nombre in _basura_sintetica(azar, max(negocios, 200)))
+    return ejemplos
+
+
+def entrenar_desde_archivo(ruta_entrenamiento=RUTA_ENTRENAMIENTO, ruta_modelo=RUTA_MODELO):
+    with open(ruta_entrenamiento, 'r', encoding='utf-8') as f:
+        contactos = json.load(f)
+    clasificador = ClasificadorBasura.entrenar(ejemplos_de_entrenamiento(contactos))
+    clasificador.guardar(ruta_modelo)
+    return clasificador
+
+
+@lru_cache(maxsize=1)
+def cargar_clasificador(ruta_modelo=RUTA_MODELO, ruta_entrenamiento=RUTA_ENTRENAMIENTO):
+    """Abre el modelo; lo reentrena si falta o si los datos son más recientes"""
+    if (not os.path.exists(ruta_modelo)
+            or os.path.getmtime(ruta_modelo) < os.path.getmtime(ruta_entrenamiento)):
+        return entrenar_desde_archivo(ruta_entrenamiento, ruta_modelo)
+    return ClasificadorBasura.cargar(ruta_modelo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clasificador persona / negocio / basura")
+    # Sin acción (como etapa del pipeline): clasificar con los valores por defecto
+    parser.set_defaults(accion='clasificar', entrada='contactos_ultra_limpios.json',
+                        salida='CONTACTOS_BASURA.json', umbral=UMBRAL_BASURA)
+    acciones = parser.add_subparsers(dest='accion')
+    acciones.add_parser('entrenar', help=f"Entrena con {os.path.basename(RUTA_ENTRENAMIENTO)}")
+    clasificar = acciones.add_parser('clasificar', help="Separa la basura de un archivo de contactos")
+    clasificar.add_argument('entrada', nargs='?', default='contactos_ultra_limpios.json')
+    clasificar.add_argument('salida', nargs='?', default='CONTACTOS_BASURA.json')
+    clasificar.add_argument('--umbral', type=float, default=UMBRAL_BASURA)
+    probar = acciones.add_parser('probar', help="Clasifica los nombres dados")
+    probar.add_argument('nombres', nargs='+')
+    args = parser.parse_args()
+
+    if args.accion == 'entrenar':
+        clasificador = entrenar_desde_archivo()
+        print(f"✅ Modelo en {RUTA_MODELO}")
+        for clase in CLASES:
+            print(f"   {clase:<8} {clasificador.documentos[clase]:6,} ejemplos")
+
+    elif args.accion == 'probar':
+        clasificador = cargar_clasificador()
+        for nombre, (clase, confianza) in zip(args.nombres, clasificador.clasificar_lote(args.nombres)):
+            print(f"{nombre!r:<32} → {clase:<8} {confianza:.3f}")
+
+    else:
+        clasificador = cargar_clasificador()
+        print(f"📖 Leyendo {ruta_datos(args.entrada)}...")
+        with open(ruta_datos(args.entrada), 'r', encoding='utf-8') as f:
+            contactos = json.load(f)
+
+        etiquetas = clasificador.clasificar_lote([c['nombre'] for c in contactos])
+        basura = [
+            dict(c, clase=clase, confianza=round(confianza, 4))
+            for c, (clase, confianza) in zip(contactos, etiquetas)
+            if clase == BASURA and confianza >= args.umbral
+        ]
+        with open(ruta_datos(args.salida), 'w', encoding='utf-8') as f:
+            json.dump(basura, f, indent=2, ensure_ascii=False)
+
+        por_clase = {c: sum(1 for clase, _ in etiquetas if clase == c) for c in CLASES}
+        print(f"📊 Personas: {por_clase[PERSONA]:,}  Negocios: {por_clase[NEGOCIO]:,}  "
+              f"Basura: {por_clase[BASURA]:,}")
+        print(f"✅ {len(basura):,} contactos basura (confianza >= {args.umbral}) en {ruta_datos(args.salida)}")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Capa de consultas en memoria sobre contactos limpios.
+
+Construye una sola vez los índices (teléfono, prefijo de nombre, apartamento
+y año) para que las consultas de los operadores no escaneen toda la lista.
+
+Cada palabra normalizada del nombre se guarda una sola vez con sus ids, y
+las palabras ordenadas permiten sacar con bisect el rango de las que
+empiezan por un prefijo. Un prefijo de varias palabras ("juan car") se
+responde intersectando los ids de cada palabra y comprobando después que el
+nombre contenga la frase desde el inicio de una palabra.
+
+Uso:
+    python3 consultas_contactos.py --apt 1722 --anio 2023
+    python3 consultas_contactos.py --prefijo cesar
+    python3 consultas_contactos.py --telefono +573168728800
+"""
+import argparse
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from contacto import cargar_contactos
+from normalizacion import clave_normalizada
+from parser_notas import parsear_nota
+
+def _solo_digitos(telefono):
+    return ''.join(c for c in telefono if c.isdigit())
+
+
+class IndiceContactos:
+    """Índices hash, de palabras del nombre y por campos de nota sobre una foto de los contactos"""
+
+    def __init__(self, contactos):
+        self.contactos = list(contactos)
+        self._por_telefono = defaultdict(list)
+        self._por_palabra = defaultdict(list)
+        self._por_apartamento = defaultdict(list)
+        self._por_anio = defaultdict(list)
+
+        for i, contacto in enumerate(self.contactos):
+            self._indexar(i, contacto)
+        self._palabras = sorted(self._por_palabra)
+
+    def _indexar(self, i, contacto):
+        telefono = contacto.get('telefono')
+        if telefono:
+            # Puede haber varios contactos con el mismo teléfono (libretas
+            # sin deduplicar): se guardan todos, en orden
+            self._por_telefono[_solo_digitos(telefono)].append(i)
+
+        nombre = contacto.get('nombre')
+        if nombre:
+            # Cada palabra por separado para que "montoya" encuentre "César Montoya"
+            for palabra in dict.fromkeys(clave_normalizada(nombre).split()):
+                self._por_palabra[palabra].append(i)
+
+        # Usar las columnas de la nota si ya vienen de la limpieza
+        if 'apartamento' in contacto:
+            campos = contacto
+        else:
+            campos = parsear_nota(contacto.get('nota'))
+
+        if campos.get('apartamento'):
+            self._por_apartamento[campos['apartamento']].append(i)
+        if campos.get('anio'):
+            self._por_anio[campos['anio']].append(i)
+
+    def _ids_palabra_prefijo(self, fragmento):
+        """Ids de contactos con alguna palabra que empiece por el fragmento"""
+        ids = set()
+        j = bisect_left(self._palabras, fragmento)
+        while j < len(self._palabras) and self._palabras[j].startswith(fragmento):
+            ids.update(self._por_palabra[self._palabras[j]])
+            j += 1
+        return ids
+
+    def _ids_prefijo(self, prefijo, limite=None):
+        """Ids de contactos con alguna palabra que empiece por el prefijo"""
+        clave = clave_normalizada(prefijo).strip()
+        palabras = clave.split() or ['']
+
+        # Las palabras anteriores a la última tienen que estar completas
+        conjuntos = [set(self._por_palabra.get(palabra, ())) for palabra in palabras[:-1]]
+        conjuntos.append(self._ids_palabra_prefijo(palabras[-1]))
+        conjuntos.sort(key=len)
+        ids = conjuntos[0].intersection(*conjuntos[1:])
+
+        if len(palabras) > 1:
+            # Las palabras tienen que ir seguidas y en ese orden
+            frase = ' ' + clave
+            ids = {i for i in ids
+                   if frase in ' ' + ' '.join(clave_normalizada(self.contactos[i]['nombre']).split())}
+
+        ids = sorted(ids)
+        return ids[:limite] if limite else ids
+
+    def buscar_telefono(self, telefono):
+        """Búsqueda exacta por teléfono (con o sin +): todos los contactos con ese número"""
+        return [self.contactos[i] for i in self._por_telefono.get(_solo_digitos(telefono), [])]
+
+    def buscar_prefijo(self, prefijo, limite=None):
+        """Contactos con alguna palabra del nombre que empiece por el prefijo"""
+        return [self.contactos[i] for i in self._ids_prefijo(prefijo, limite)]
+
+    def buscar_apartamento(self, apartamento):
+        return [self.contactos[i] for i in self._por_apartamento.get(str(apartamento).upper(), [])]
+
+    def buscar_anio(self, anio):
+        return [self.contactos[i] for i in self._por_anio.get(int(anio), [])]
+
+    def buscar(self, telefono=None, prefijo=None, apartamento=None, anio=None, limite=None):
+        """Consulta combinada: intersección de todos los filtros indicados"""
+        conjuntos = []
+
+        if telefono:
+            conjuntos.append(set(self._por_telefono.get(_solo_digitos(telefono), [])))
+        if apartamento:
+            conjuntos.append(set(self._por_apartamento.get(str(apartamento).upper(), [])))
+        if anio:
+            conjuntos.append(set(self._por_anio.get(int(anio), [])))
+        if prefijo:
+            conjuntos.append(set(self._ids_prefijo(prefijo)))
+
+        if not conjuntos:
+            return []
+
+        # Intersectar empezando por el conjunto más pequeño
+        conjuntos.sort(key=len)
+        ids = conjuntos[0].intersection(*conjuntos[1:])
+
+        resultado = [self.contactos[i] for i in sorted(ids)]
+        return resultado[:limite] if limite else resultado
+
+
+def cargar_indice(ruta):
+    """Carga un archivo JSON de contactos y construye el índice"""
+    return IndiceContactos(cargar_contactos(ruta))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consultas rápidas sobre contactos limpios")
+    parser.add_argument('--archivo', default='CONTACTOS_FINALES_SIN_A.json')
+    parser.add_argument('--telefono')
+    parser.add_argument('--prefijo')
+    parser.add_argument('--apt', dest='apartamento')
+    parser.add_argument('--anio', type=int)
+    parser.add_argument('--limite', type=int, default=50)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    indice = cargar_indice(args.archivo)
+    print(f"📚 Índice construido: {len(indice.contactos):,} contactos "
+          f"({(time.perf_counter() - inicio) * 1000:.1f} ms)")
+
+    inicio = time.perf_counter()
+    resultados = indice.buscar(
+        telefono=args.telefono,
+        prefijo=args.prefijo,
+        apartamento=args.apartamento,
+        anio=args.anio,
+        limite=args.limite
+    )
+    duracion = (time.perf_counter() - inicio) * 1_000_000
+
+    print(f"🔎 {len(resultados)} resultados en {duracion:.0f} µs")
+    for i, c in enumerate(resultados, 1):
+        print(f"   {i:2}. {c.get('nombre') or 'Sin nombre':<35} | {c['telefono']}")
+        if c.get('nota'):
+            print(f"       📝 {c['nota']}")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Registro compacto de contacto.
+
+Los contactos viajaban entre scripts como dicts que cada etapa reconstruía.
+`Contacto` usa __slots__ (sin __dict__ por registro) e interna las cadenas
+que se repiten miles de veces (notas como "Apt 1722", apartamento, canal),
+así todas las copias comparten el mismo objeto.
+
+Acepta el mismo acceso que los dicts de antes (c['nombre'], c.get('nota')),
+así que los scripts existentes funcionan sin cambios en sus bucles.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+from parser_notas import CAMPOS_NOTA
+
+CAMPOS_BASE = ('nombre', 'telefono', 'nota')
+
+# Directorio de los archivos de contactos (el pipeline lo define por etapa)
+DIRECTORIO_DATOS = os.environ.get('CONTACTOS_DIR', '/workspace')
+
+
+def _internar(texto):
+    return sys.intern(texto) if isinstance(texto, str) else texto
+
+
+class Contacto:
+    """Contacto con nombre, teléfono, nota y las columnas extraídas de la nota"""
+
+    __slots__ = CAMPOS_BASE + CAMPOS_NOTA
+
+    def __init__(self, nombre, telefono, nota=None, apartamento=None, mes=None,
+                 anio=None, reservo=None, canal=None):
+        self.nombre = nombre
+        self.telefono = telefono
+        self.nota = _internar(nota)
+        self.apartamento = _internar(apartamento)
+        self.mes = mes
+        self.anio = anio
+        # reservo es None mientras la nota no se haya parseado
+        self.reservo = reservo
+        self.canal = _internar(canal)
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(
+            datos.get('nombre'),
+            datos.get('telefono'),
+            datos.get('nota'),
+            datos.get('apartamento'),
+            datos.get('mes'),
+            datos.get('anio'),
+            datos.get('reservo'),
+            datos.get('canal'),
+        )
+
+    def tiene_campos_nota(self):
+        return self.reservo is not None
+
+    def a_dict(self):
+        """Dict para JSON; las columnas de nota solo si ya se parsearon"""
+        datos = {'nombre': self.nombre, 'telefono': self.telefono, 'nota': self.nota}
+        if self.tiene_campos_nota():
+            for campo in CAMPOS_NOTA:
+                datos[campo] = getattr(self, campo)
+        return datos
+
+    # Acceso tipo dict, compatible con el código que usaba dicts
+    def __getitem__(self, clave):
+        if clave not in self.__slots__:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def __setitem__(self, clave, valor):
+        if clave not in self.__slots__:
+            raise KeyError(clave)
+        setattr(self, clave, _internar(valor) if clave == 'nota' else valor)
+
+    def get(self, clave, defecto=None):
+        return getattr(self, clave) if clave in self else defecto
+
+    def __contains__(self, clave):
+        if clave in CAMPOS_BASE:
+            return True
+        return clave in CAMPOS_NOTA and self.tiene_campos_nota()
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Contacto):
+            return NotImplemented
+        return all(getattr(self, c) == getattr(otro, c) for c in self.__slots__)
+
+    def __repr__(self):
+        return f"Contacto({self.nombre!r}, {self.telefono!r}, {self.nota!r})"
+
+
+def a_json(objeto):
+    """Para json.dump(..., default=a_json)"""
+    if isinstance(objeto, Contacto):
+        return objeto.a_dict()
+    raise TypeError(f"No se puede serializar {type(objeto).__name__}")
+
+
+def ruta_datos(nombre):
+    """Ruta de un archivo de datos dentro de DIRECTORIO_DATOS"""
+    return os.path.join(DIRECTORIO_DATOS, nombre)
+
+
+@contextmanager
+def archivo_atomico(ruta, modo='w', sincronizar=False):
+    """
+    Archivo que reemplaza a `ruta` con os.replace al cerrarse sin errores: o
+    queda el viejo o el nuevo. El temporal es propio (mkstemp en el mismo
+    directorio), así dos procesos que escriben la misma ruta no se pisan.
+    Con sincronizar, fsync del archivo y del directorio antes de volver
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=f'.{os.path.basename(ruta)}.', suffix='.tmp',
+                                            dir=directorio)
+    try:
+        with os.fdopen(descriptor, modo, encoding=None if 'b' in modo else 'utf-8') as f:
+            yield f
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+    if sincronizar:
+        descriptor = os.open(directorio, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def cargar_contactos(ruta):
+    """Lee un archivo JSON de contactos directamente como objetos Contacto"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f, object_hook=Contacto.desde_dict)
+
+
+def iterar_contactos(ruta, tamano_bloque=1 << 16, desde=0, con_posicion=False):
+    """
+    Recorre un archivo JSON de contactos (una lista) sin cargarlo completo:
+    lee por bloques y decodifica un contacto a la vez.
+
+    desde: byte donde retomar (una posición devuelta antes con con_posicion).
+    con_posicion: produce (contacto, byte siguiente al contacto) para poder
+    retomar la lectura con desde=
+    """
+    decodificador = json.JSONDecoder(object_hook=Contacto.desde_dict)
+    with open(ruta, 'rb') as binario:
+        binario.seek(desde)
+        f = io.TextIOWrapper(binario, encoding='utf-8', newline='')
+        buffer = f.read(tamano_bloque)
+        posicion = 0
+        if desde == 0:
+            posicion = len(buffer) - len(buffer.lstrip())
+            if not buffer.startswith('[', posicion):
+                raise ValueError(f"{ruta} no contiene una lista JSON de contactos")
+            posicion += 1
+        fin_archivo = False
+
+        # Bytes del archivo hasta buffer[marca] (solo si se piden posiciones)
+        bytes_leidos = desde
+        marca = 0
+
+        while True:
+            # Saltar espacios y comas entre contactos
+            while posicion < len(buffer) and buffer[posicion] in ' \t\r\n,':
+                posicion += 1
+            if posicion < len(buffer) and buffer[posicion] == ']':
+                return
+
+            try:
+                contacto, posicion = decodificador.raw_decode(buffer, posicion)
+            except json.JSONDecodeError:
+                if fin_archivo:
+                    raise
+                # Contacto incompleto: descartar lo ya leído y traer otro bloque
+                if con_posicion:
+                    bytes_leidos += len(buffer[marca:posicion].encode('utf-8'))
+                buffer = buffer[posicion:]
+                posicion = marca = 0
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                buffer += bloque
+                continue
+
+            if con_posicion:
+                bytes_leidos += len(buffer[marca:posicion].encode('utf-8'))
+                marca = posicion
+                yield contacto, bytes_leidos
+            else:
+                yield contacto
+
+
+def guardar_contactos(ruta, contactos):
+    """Escribe los contactos con el mismo formato JSON de siempre"""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(contactos, f, indent=2, ensure_ascii=False, default=a_json)
+
+
+def escribir_contactos(ruta, contactos):
+    """
+    Igual que guardar_contactos pero acepta cualquier iterable y escribe un
+    contacto a la vez (mismo JSON byte a byte). Devuelve cuántos escribió
+    """
+    total = 0
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for contacto in contactos:
+            texto = json.dumps(contacto, indent=2, ensure_ascii=False, default=a_json)
+            f.write(',\n  ' if total else '[\n  ')
+            f.write(texto.replace('\n', '\n  '))
+            total += 1
+        f.write('\n]' if total else '[]')
+    return total
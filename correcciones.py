@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tabla compilada de correcciones manuales de nombres.
+
+Las correcciones viven en correcciones_nombres.json (original -> corregido)
+en vez de diccionarios literales dentro de cada script. Para usarlas se
+compilan a correcciones_nombres.bin: una tabla hash de direccionamiento
+abierto, con clave el nombre original sin tildes y en minúsculas. El
+binario se abre con mmap, así que cargarlo no depende del número de
+correcciones y cada búsqueda lee solo la ranura y el registro que necesita.
+
+Formato del binario (little endian):
+    cabecera: b'CORRNOM1', ranuras (uint32), entradas (uint32)
+    ranuras:  hash de la clave (uint64), offset del registro (uint32); 0 = vacía
+    registro: largo clave (uint16), largo valor (uint16), clave, valor (UTF-8)
+
+Uso:
+    python3 correcciones.py                 # compilar el JSON
+    python3 correcciones.py Acesarmontoya   # consultar una corrección
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from contacto import archivo_atomico
+from normalizacion import clave_normalizada
+
+
+DIRECTORIO_CODIGO = os.path.dirname(os.path.abspath(__file__))
+RUTA_JSON = os.path.join(DIRECTORIO_CODIGO, 'correcciones_nombres.json')
+RUTA_BINARIO = os.path.join(DIRECTORIO_CODIGO, 'correcciones_nombres.bin')
+
+_MAGICO = b'CORRNOM1'
+_CABECERA = struct.Struct('<8sII')
+_RANURA = struct.Struct('<QI')
+_REGISTRO = struct.Struct('<HH')
+_FACTOR_CARGA = 0.7
+
+
+def _hash(clave_bytes):
+    return int.from_bytes(hashlib.blake2b(clave_bytes, digest_size=8).digest(), 'little')
+
+
+def compilar(ruta_json=RUTA_JSON, ruta_binario=RUTA_BINARIO):
+    """Compila el JSON de correcciones a la tabla binaria"""
+    with open(ruta_json, 'r', encoding='utf-8') as f:
+        correcciones = json.load(f)
+
+    entradas = {}
+    for original, corregido in correcciones.items():
+        clave = clave_normalizada(original)
+        if clave in entradas and entradas[clave] != corregido:
+            raise ValueError(f"Corrección en conflicto para '{original}': "
+                             f"'{entradas[clave]}' vs '{corregido}'")
+        entradas[clave] = corregido
+
+    ranuras = 1
+    while ranuras * _FACTOR_CARGA < max(len(entradas), 1):
+        ranuras *= 2
+
+    inicio_registros = _CABECERA.size + ranuras * _RANURA.size
+    tabla = bytearray(ranuras * _RANURA.size)
+    registros = bytearray()
+
+    for clave, valor in entradas.items():
+        clave_bytes = clave.encode('utf-8')
+        valor_bytes = valor.encode('utf-8')
+        offset = inicio_registros + len(registros)
+        registros += _REGISTRO.pack(len(clave_bytes), len(valor_bytes)) + clave_bytes + valor_bytes
+
+        valor_hash = _hash(clave_bytes)
+        posicion = valor_hash & (ranuras - 1)
+        while _RANURA.unpack_from(tabla, posicion * _RANURA.size)[1] != 0:
+            posicion = (posicion + 1) & (ranuras - 1)
+        _RANURA.pack_into(tabla, posicion * _RANURA.size, valor_hash, offset)
+
+    # Temporal propio (archivo_atomico): dos procesos que compilan a la vez no se pisan
+    with archivo_atomico(ruta_binario, 'wb') as f:
+        f.write(_CABECERA.pack(_MAGICO, ranuras, len(entradas)))
+        f.write(tabla)
+        f.write(registros)
+    return len(entradas)
+
+
+class TablaCorrecciones:
+    """Tabla de correcciones de solo lectura sobre el binario mapeado en memoria"""
+
+    def __init__(self, ruta_binario=RUTA_BINARIO):
+        with open(ruta_binario, 'rb') as f:
+            self._datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, self._ranuras, self._entradas = _CABECERA.unpack_from(self._datos, 0)
+        if magico != _MAGICO:
+            raise ValueError(f"{ruta_binario} no es una tabla de correcciones")
+        self._mascara = self._ranuras - 1
+
+    def buscar(self, nombre):
+        """Nombre corregido, o None si no hay corrección para ese nombre"""
+        if not nombre:
+            return None
+        clave_bytes = clave_normalizada(nombre).encode('utf-8')
+        valor_hash = _hash(clave_bytes)
+        posicion = valor_hash & self._mascara
+
+        while True:
+            hash_ranura, offset = _RANURA.unpack_from(self._datos, _CABECERA.size + posicion * _RANURA.size)
+            if offset == 0:
+                return None
+            if hash_ranura == valor_hash:
+                largo_clave, largo_valor = _REGISTRO.unpack_from(self._datos, offset)
+                inicio = offset + _REGISTRO.size
+                if self._datos[inicio:inicio + largo_clave] == clave_bytes:
+                    inicio += largo_clave
+                    return self._datos[inicio:inicio + largo_valor].decode('utf-8')
+            posicion = (posicion + 1) & self._mascara
+
+    def __contains__(self, nombre):
+        return self.buscar(nombre) is not None
+
+    def __len__(self):
+        return self._entradas
+
+
+def cargar_correcciones(ruta_json=RUTA_JSON, ruta_binario=RUTA_BINARIO):
+    """Abre la tabla compilada; la recompila si el JSON es más reciente"""
+    if (not os.path.exists(ruta_binario)
+            or os.path.getmtime(ruta_binario) < os.path.getmtime(ruta_json)):
+        compilar(ruta_json, ruta_binario)
+    return TablaCorrecciones(ruta_binario)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        tabla = cargar_correcciones()
+        for nombre in sys.argv[1:]:
+            print(f"{nombre} → {tabla.buscar(nombre)}")
+    else:
+        total = compilar()
+        print(f"✅ {total} correcciones compiladas en {RUTA_BINARIO}")
@@ -2,6 +2,40 @@
 import json
 import re
 
+from consultas_contactos import IndiceContactos
+from contacto import Contacto, a_json, ruta_datos
+from lista_ordenada import ListaOrdenada
+from muestreo import muestra_estratificada
+from normalizacion import Lexico
+
+# Nombres VÁLIDOS que empiezan con A (no eliminar la A); se comparan sin tildes
+NOMBRES_VALIDOS_CON_A = Lexico([
+    'Abad', 'Abel', 'Abraham', 'Abril', 'Ada', 'Adam', 'Adán', 
+    'Addison', 'Adelaida', 'Adela', 'Adelina', 'Adolfo', 'Adriana', 
+    'Adrián', 'Adriano', 'Agatha', 'Agnes', 'Agustín', 'Agustina', 
+    'Aida', 'Aiden', 'Aileen', 'Aimee', 'Aisha', 'Alan', 'Alana', 
+    'Alba', 'Albert', 'Alberta', 'Alberto', 'Aldo', 'Alejandra', 
+    'Alejandro', 'Alejo', 'Alessandra', 'Alessandro', 'Alex', 'Alexa', 
+    'Alexander', 'Alexandra', 'Alexis', 'Alfonso', 'Alfred', 'Alfredo', 
+    'Alice', 'Alicia', 'Alina', 'Alison', 'Allan', 'Allen', 'Allison', 
+    'Alma', 'Alonso', 'Altagracia', 'Álvaro', 'Alyssa', 
+    'Amada', 'Amalia', 'Amanda', 'Amaya', 'Amber', 'Amelia', 'America', 
+    'Amira', 'Amparo', 'Amy', 'Ana', 'Anabel', 'Anastasia', 'Andrea', 
+    'Andrés', 'Andrew', 'Andy', 'Ángel', 'Ángela', 'Angélica', 
+    'Angelina', 'Angelo', 'Angie', 'Aníbal', 'Anita', 'Anna', 'Anne', 
+    'Annie', 'Anthony', 'Antonia', 'Antonio', 'Antony', 'Anuar', 'Anyela', 
+    'Apollo', 'Aquiles', 'Arabella', 'Araceli', 'Aracely', 'Aranza', 
+    'Arcadio', 'Ariadna', 'Ariana', 'Ariel', 'Ariela', 'Arlene', 'Arleth', 
+    'Armando', 'Arnaldo', 'Arnold', 'Arnulfo', 'Arquímedes', 'Arsenio', 
+    'Artemio', 'Arthur', 'Arturo', 'Ashley', 'Astrid', 'Asunción', 
+    'Atanasio', 'Athena', 'Aubrey', 'Audrey', 'Augusto', 'Aurelia', 
+    'Aurelio', 'Aurora', 'Austin', 'Ava', 'Avelino', 'Avery', 'Axel', 
+    'Ayla', 'Azucena', 'Azul',
+    # Casos especiales que encontramos
+    'Acevedo', 'Acuerdo', 'Administrador', 'Administradora', 'Admisiones',
+    'Adp', 'Adelantos', 'Adatours', 'Adora', 'Addora'
+])
+
 def eliminar_a_inicial(nombre):
     """
     Elimina la A mayúscula del principio SOLO si la siguiente letra NO es otra A
@@ -22,38 +56,9 @@ def eliminar_a_inicial(nombre):
     if nombre[0] == 'A':
         # Si la siguiente letra NO es otra A mayúscula
         if nombre[1] != 'A':
-            # Lista de nombres VÁLIDOS que empiezan con A (no eliminar la A)
-            nombres_validos_con_a = [
-                'Abad', 'Abel', 'Abraham', 'Abril', 'Ada', 'Adam', 'Adán', 
-                'Addison', 'Adelaida', 'Adela', 'Adelina', 'Adolfo', 'Adriana', 
-                'Adrián', 'Adriano', 'Agatha', 'Agnes', 'Agustín', 'Agustina', 
-                'Aida', 'Aiden', 'Aileen', 'Aimee', 'Aisha', 'Alan', 'Alana', 
-                'Alba', 'Albert', 'Alberta', 'Alberto', 'Aldo', 'Alejandra', 
-                'Alejandro', 'Alejo', 'Alessandra', 'Alessandro', 'Alex', 'Alexa', 
-                'Alexander', 'Alexandra', 'Alexis', 'Alfonso', 'Alfred', 'Alfredo', 
-                'Alice', 'Alicia', 'Alina', 'Alison', 'Allan', 'Allen', 'Allison', 
-                'Alma', 'Alonso', 'Altagracia', 'Alvaro', 'Álvaro', 'Alyssa', 
-                'Amada', 'Amalia', 'Amanda', 'Amaya', 'Amber', 'Amelia', 'America', 
-                'Amira', 'Amparo', 'Amy', 'Ana', 'Anabel', 'Anastasia', 'Andrea', 
-                'Andrés', 'Andrew', 'Andy', 'Ángel', 'Angela', 'Ángela', 'Angélica', 
-                'Angelina', 'Angelo', 'Angie', 'Aníbal', 'Anita', 'Anna', 'Anne', 
-                'Annie', 'Anthony', 'Antonia', 'Antonio', 'Antony', 'Anuar', 'Anyela', 
-                'Apollo', 'Aquiles', 'Arabella', 'Araceli', 'Aracely', 'Aranza', 
-                'Arcadio', 'Ariadna', 'Ariana', 'Ariel', 'Ariela', 'Arlene', 'Arleth', 
-                'Armando', 'Arnaldo', 'Arnold', 'Arnulfo', 'Arquímedes', 'Arsenio', 
-                'Artemio', 'Arthur', 'Arturo', 'Ashley', 'Astrid', 'Asunción', 
-                'Atanasio', 'Athena', 'Aubrey', 'Audrey', 'Augusto', 'Aurelia', 
-                'Aurelio', 'Aurora', 'Austin', 'Ava', 'Avelino', 'Avery', 'Axel', 
-                'Ayla', 'Azucena', 'Azul',
-                # Casos especiales que encontramos
-                'Acevedo', 'Acuerdo', 'Administrador', 'Administradora', 'Admisiones',
-                'Adp', 'Adrian', 'Adelantos', 'Adatours', 'Adora', 'Addora'
-            ]
-            
-            # Verificar si es un nombre válido (comparación case-insensitive)
-            for nombre_valido in nombres_validos_con_a:
-                if nombre.lower() == nombre_valido.lower() or nombre.startswith(nombre_valido + ' '):
-                    return nombre  # Es un nombre válido, no eliminar la A
+            # Verificar si es un nombre válido (sin distinguir mayúsculas ni tildes)
+            if nombre.split(' ', 1)[0] in NOMBRES_VALIDOS_CON_A:
+                return nombre  # Es un nombre válido, no eliminar la A
             
             # Si no es un nombre válido y la siguiente letra es minúscula, eliminar la A
             if nombre[1].islower():
@@ -66,65 +71,68 @@ def eliminar_a_inicial(nombre):
     
     return nombre
 
-# Cargar contactos
-print("📖 Leyendo archivo CONTACTOS_100_LIMPIOS.json...")
-with open('/workspace/CONTACTOS_100_LIMPIOS.json', 'r') as f:
-    contactos = json.load(f)
+def main():
+    """Ejecuta la etapa completa: lee, limpia y guarda los archivos"""
+    # Cargar contactos
+    print("📖 Leyendo archivo CONTACTOS_100_LIMPIOS.json...")
+    with open(ruta_datos('CONTACTOS_100_LIMPIOS.json'), 'r') as f:
+        contactos = json.load(f, object_hook=Contacto.desde_dict)
 
-print(f"📊 Total de contactos: {len(contactos)}")
+    print(f"📊 Total de contactos: {len(contactos)}")
 
-# Procesar cada contacto
-contactos_corregidos = []
-cambios = []
+    # Procesar cada contacto (la entrada ya viene en orden alfabético)
+    orden = ListaOrdenada(contactos)
+    cambios = []
 
-for contacto in contactos:
-    nombre_original = contacto.get('nombre', '')
-    nombre_corregido = eliminar_a_inicial(nombre_original)
-    
-    if nombre_corregido != nombre_original:
-        cambios.append({
-            'original': nombre_original,
-            'corregido': nombre_corregido
-        })
-    
-    contactos_corregidos.append({
-        'nombre': nombre_corregido,
-        'telefono': contacto['telefono'],
-        'nota': contacto.get('nota')
-    })
-
-# Ordenar alfabéticamente
-contactos_corregidos.sort(key=lambda x: (x['nombre'] or '').lower())
-
-print(f"\n✅ Nombres corregidos: {len(cambios)}")
-print(f"📝 Total final: {len(contactos_corregidos)} contactos")
-
-# Guardar archivos finales
-with open('/workspace/CONTACTOS_FINALES_SIN_A.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_corregidos, f, indent=2, ensure_ascii=False)
-
-with open('/workspace/MUESTRA_50_SIN_A.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_corregidos[:50], f, indent=2, ensure_ascii=False)
-
-print("\n📁 ARCHIVOS GUARDADOS:")
-print("   ✅ /workspace/CONTACTOS_FINALES_SIN_A.json")
-print("   ✅ /workspace/MUESTRA_50_SIN_A.json")
-
-# Mostrar ejemplos de cambios
-print("\n🔍 EJEMPLOS DE CORRECCIONES:")
-print("="*80)
-for i, cambio in enumerate(cambios[:30], 1):
-    print(f"{i:2}. \"{cambio['original']}\" → \"{cambio['corregido']}\"")
-
-# Verificar casos específicos
-print("\n✅ VERIFICACIÓN DE CASOS ESPECÍFICOS:")
-print("="*80)
-casos_verificar = [
-    "andrea", "angie", "carlos", "cesar", "andres", "diana"
-]
-for caso in casos_verificar:
-    encontrados = [c for c in contactos_corregidos if caso in (c.get('nombre', '').lower())][:3]
-    if encontrados:
-        print(f"\n{caso.upper()}:")
-        for e in encontrados:
-            print(f"  • {e['nombre']}")
\ No newline at end of file
+    for contacto in contactos:
+        nombre_original = contacto.get('nombre', '')
+        nombre_corregido = eliminar_a_inicial(nombre_original)
+
+        if nombre_corregido != nombre_original:
+            cambios.append({
+                'original': nombre_original,
+                'corregido': nombre_corregido
+            })
+            # Se actualiza el mismo registro (conserva las columnas de la nota)
+            orden.renombrar(contacto, nombre_corregido)
+
+    # Orden alfabético (mantenido al renombrar)
+    contactos_corregidos = list(orden)
+
+    print(f"\n✅ Nombres corregidos: {len(cambios)}")
+    print(f"📝 Total final: {len(contactos_corregidos)} contactos")
+
+    # Guardar archivos finales
+    with open(ruta_datos('CONTACTOS_FINALES_SIN_A.json'), 'w', encoding='utf-8') as f:
+        json.dump(contactos_corregidos, f, indent=2, ensure_ascii=False, default=a_json)
+
+    with open(ruta_datos('MUESTRA_50_SIN_A.json'), 'w', encoding='utf-8') as f:
+        json.dump(muestra_estratificada(contactos_corregidos), f, indent=2, ensure_ascii=False, default=a_json)
+
+    print("\n📁 ARCHIVOS GUARDADOS:")
+    print(f"   ✅ {ruta_datos('CONTACTOS_FINALES_SIN_A.json')}")
+    print(f"   ✅ {ruta_datos('MUESTRA_50_SIN_A.json')}")
+
+    # Mostrar ejemplos de cambios
+    print("\n🔍 EJEMPLOS DE CORRECCIONES:")
+    print("="*80)
+    for i, cambio in enumerate(cambios[:30], 1):
+        print(f"{i:2}. \"{cambio['original']}\" → \"{cambio['corregido']}\"")
+
+    # Verificar casos específicos
+    print("\n✅ VERIFICACIÓN DE CASOS ESPECÍFICOS:")
+    print("="*80)
+    casos_verificar = [
+        "andrea", "angie", "carlos", "cesar", "andres", "diana"
+    ]
+    indice = IndiceContactos(contactos_corregidos)
+    for caso in casos_verificar:
+        encontrados = indice.buscar_prefijo(caso, limite=3)
+        if encontrados:
+            print(f"\n{caso.upper()}:")
+            for e in encontrados:
+                print(f"  • {e['nombre']}")
+
+
+if __name__ == "__main__":
+    main()
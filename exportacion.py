@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Exportación de la libreta a vCard 3.0 y al CSV de Google Contacts.
+
+Los contactos se leen y se escriben de a uno (iterar_contactos), así que una
+libreta de cualquier tamaño se exporta en memoria constante. Con
+--por-archivo o --max-mb la salida se parte en fragmentos (LIBRETA_001.vcf,
+LIBRETA_002.vcf, ...) que se pueden subir en paralelo; cada fragmento del CSV
+lleva su encabezado.
+
+Las columnas de la nota se vuelven etiquetas: 'Reservó', el canal
+('Airbnb') y el apartamento ('Apt 1722'). En vCard van en CATEGORIES y en el
+CSV en Group Membership, junto a '* myContacts' para que Google las muestre
+en Contactos.
+
+Uso:
+    python3 exportacion.py                                   # etapa del pipeline
+    python3 exportacion.py CONTACTOS_CON_WHATSAPP.json libreta.vcf
+    python3 exportacion.py CONTACTOS_CON_WHATSAPP.json google.csv --por-archivo 3000
+    python3 exportacion.py LIBRETA.jsonl libreta.vcf --max-mb 5 --formato vcard
+"""
+import argparse
+import csv
+import io
+import os
+from collections import namedtuple
+
+from contacto import ruta_datos
+from orden_externo import iterar_exportacion
+from parser_notas import parsear_nota
+
+GRUPO_GOOGLE = '* myContacts'
+
+COLUMNAS_GOOGLE = ['Name', 'Given Name', 'Family Name', 'Notes', 'Group Membership',
+                   'Phone 1 - Type', 'Phone 1 - Value']
+
+ANCHO_LINEA_VCARD = 75  # octetos por línea antes de plegar (RFC 2425)
+
+
+def campos_nota(contacto):
+    """Columnas de la nota; se parsean si el contacto no las trae"""
+    if contacto.get('reservo') is not None:
+        return contacto
+    return parsear_nota(contacto.get('nota'))
+
+
+def etiquetas(contacto):
+    """Etiquetas del contacto a partir de las columnas de su nota"""
+    campos = campos_nota(contacto)
+    resultado = []
+    if campos.get('reservo'):
+        resultado.append('Reservó')
+    if campos.get('canal'):
+        resultado.append(campos['canal'].capitalize())
+    if campos.get('apartamento'):
+        resultado.append(f"Apt {campos['apartamento']}")
+    return resultado
+
+
+def partir_nombre(nombre):
+    """'Juan Carlos Pérez' -> ('Juan', 'Carlos Pérez'): primera palabra y el resto"""
+    partes = (nombre or '').split(None, 1)
+    return (partes[0] if partes else '', partes[1] if len(partes) > 1 else '')
+
+
+# --- vCard 3.0 ---
+
+def _escapar_vcard(texto):
+    return (texto.replace('\\', '\\\\').replace('\r\n', '\n').replace('\n', '\\n')
+            .replace(',', '\\,').replace(';', '\\;'))
+
+
+def _plegar(linea):
+    """Parte una línea larga en trozos de hasta 75 octetos sin cortar un carácter UTF-8"""
+    if len(linea.encode('utf-8')) <= ANCHO_LINEA_VCARD:
+        return linea
+    trozos = []
+    actual = ''
+    tamano = 0
+    for caracter in linea:
+        bytes_caracter = len(caracter.encode('utf-8'))
+        # Las líneas de continuación empiezan con un espacio
+        limite = ANCHO_LINEA_VCARD if not trozos else ANCHO_LINEA_VCARD - 1
+        if tamano + bytes_caracter > limite:
+            trozos.append(actual)
+            actual = ''
+            tamano = 0
+        actual += caracter
+        tamano += bytes_caracter
+    trozos.append(actual)
+    return '\r\n '.join(trozos)
+
+
+def vcard(contacto):
+    """Un contacto como tarjeta vCard 3.0 (líneas CRLF)"""
+    nombre = contacto.get('nombre') or ''
+    telefono = contacto.get('telefono') or ''
+    nombre_pila, apellidos = partir_nombre(nombre)
+    lineas = [
+        'BEGIN:VCARD',
+        'VERSION:3.0',
+        # FN es obligatorio: sin nombre se muestra el teléfono
+        f"FN:{_escapar_vcard(nombre or telefono)}",
+        f"N:{_escapar_vcard(apellidos)};{_escapar_vcard(nombre_pila)};;;",
+    ]
+    if telefono:
+        lineas.append(f"TEL;TYPE=CELL:{telefono}")
+    if contacto.get('nota'):
+        lineas.append(f"NOTE:{_escapar_vcard(contacto['nota'])}")
+    categorias = etiquetas(contacto)
+    if categorias:
+        lineas.append('CATEGORIES:' + ','.join(_escapar_vcard(e) for e in categorias))
+    lineas.append('END:VCARD')
+    return ''.join(_plegar(linea) + '\r\n' for linea in lineas)
+
+
+# --- CSV de Google Contacts ---
+
+def fila_google(contacto):
+    nombre = contacto.get('nombre') or ''
+    nombre_pila, apellidos = partir_nombre(nombre)
+    grupos = ' ::: '.join([GRUPO_GOOGLE] + etiquetas(contacto))
+    return [nombre, nombre_pila, apellidos, contacto.get('nota') or '', grupos,
+            'Mobile', contacto.get('telefono') or '']
+
+
+def _linea_csv(fila):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(fila)
+    return buffer.getvalue()
+
+
+Formato = namedtuple('Formato', ['extension', 'encabezado', 'serializar'])
+
+
+FORMATOS = {
+    'vcard': Formato('.vcf', '', vcard),
+    'google': Formato('.csv', _linea_csv(COLUMNAS_GOOGLE), lambda c: _linea_csv(fila_google(c))),
+}
+
+
+def formato_de_ruta(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    for nombre, formato in FORMATOS.items():
+        if formato.extension == extension:
+            return nombre
+    raise ValueError(f"{ruta}: extensión desconocida (use .vcf o .csv, o --formato)")
+
+
+class EscritorFragmentado:
+    """
+    Escribe registros de texto en un archivo, o en fragmentos numerados si
+    se pasa un máximo de registros o de bytes por archivo. Un registro nunca
+    se parte entre fragmentos
+    """
+
+    def __init__(self, ruta, encabezado='', max_registros=None, max_bytes=None):
+        self.ruta = ruta
+        self.encabezado = encabezado.encode('utf-8')
+        self.max_registros = max_registros
+        self.max_bytes = max_bytes
+        self.fragmentado = bool(max_registros or max_bytes)
+        self.rutas = []
+        self._f = None
+        self._registros = 0
+        self._bytes = 0
+
+    def _ruta_fragmento(self, numero):
+        base, extension = os.path.splitext(self.ruta)
+        return f"{base}_{numero:03d}{extension}"
+
+    def _abrir(self):
+        if self._f:
+            self._f.close()
+        ruta = self._ruta_fragmento(len(self.rutas) + 1) if self.fragmentado else self.ruta
+        self._f = open(ruta, 'wb')
+        self.rutas.append(ruta)
+        self._f.write(self.encabezado)
+        self._registros = 0
+        self._bytes = len(self.encabezado)
+
+    def escribir(self, registro):
+        datos = registro.encode('utf-8')
+        lleno = self._f is not None and self._registros and (
+            (self.max_registros and self._registros >= self.max_registros)
+            or (self.max_bytes and self._bytes + len(datos) > self.max_bytes))
+        if self._f is None or lleno:
+            self._abrir()
+        self._f.write(datos)
+        self._registros += 1
+        self._bytes += len(datos)
+
+    def cerrar(self):
+        """Cierra el último fragmento; devuelve las rutas escritas"""
+        if self._f is None:
+            self._abrir()  # libreta vacía: un archivo con solo el encabezado
+        self._f.close()
+        return self.rutas
+
+
+def exportar(contactos, ruta, formato=None, max_contactos=None, max_bytes=None):
+    """
+    Escribe un iterable de contactos en `formato` ('vcard' o 'google', por
+    defecto según la extensión). Devuelve (contactos escritos, rutas)
+    """
+    formato = FORMATOS[formato or formato_de_ruta(ruta)]
+    escritor = EscritorFragmentado(ruta, formato.encabezado, max_contactos, max_bytes)
+    total = 0
+    try:
+        for contacto in contactos:
+            escritor.escribir(formato.serializar(contacto))
+            total += 1
+    finally:
+        rutas = escritor.cerrar()
+    return total, rutas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta contactos a vCard 3.0 o CSV de Google Contacts")
+    parser.add_argument('entrada', nargs='?', default=None,
+                        help="JSON, JSONL o CSV de contactos (por defecto CONTACTOS_CON_WHATSAPP.json)")
+    parser.add_argument('salida', nargs='?', default=None)
+    parser.add_argument('--formato', choices=sorted(FORMATOS), default=None,
+                        help="Por defecto según la extensión de la salida")
+    parser.add_argument('--por-archivo', type=int, default=None, help="Contactos por fragmento")
+    parser.add_argument('--max-mb', type=float, default=None, help="Tamaño máximo de cada fragmento")
+    args = parser.parse_args()
+
+    if args.entrada is None:
+        # Como etapa del pipeline: la libreta validada en los dos formatos
+        trabajos = [(ruta_datos('CONTACTOS_CON_WHATSAPP.json'), ruta_datos('CONTACTOS_CON_WHATSAPP.vcf')),
+                    (ruta_datos('CONTACTOS_CON_WHATSAPP.json'), ruta_datos('CONTACTOS_GOOGLE.csv'))]
+    else:
+        trabajos = [(args.entrada, args.salida or os.path.splitext(args.entrada)[0] + '.vcf')]
+
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else None
+    for entrada, salida in trabajos:
+        print(f"📖 Exportando {entrada}...")
+        total, rutas = exportar(iterar_exportacion(entrada), salida, args.formato,
+                                args.por_archivo, max_bytes)
+        print(f"✅ {total:,} contactos en {len(rutas)} archivo(s):")
+        for ruta in rutas:
+            print(f"   📁 {ruta}")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Filtro de Bloom persistente de números sin WhatsApp.
+
+Los números que Whapi ya marcó como inválidos (invalid.csv) vuelven en cada
+importación y se validan y eliminan otra vez. La etapa de validación los
+agrega a este filtro, que queda en el directorio de datos y se acumula de
+ronda en ronda; las etapas de ingreso (procesar_flujo, orden_externo, el
+servicio de limpieza) lo consultan antes de deduplicar, limpiar o validar.
+
+El filtro responde "seguro que no está" con unos pocos bits por número
+(≈1,2 bytes con 1 % de falsos positivos). Los positivos se confirman contra
+la lista exacta de números (enteros ordenados, búsqueda binaria), que se
+guarda en el mismo archivo: la respuesta final nunca es un falso positivo.
+Como la lista exacta viaja con el filtro, dos filtros siempre se pueden
+unir, y si se llenan se reconstruyen más grandes.
+
+Formato del archivo: 'BLOOMSW1', bits, hashes y cantidad (uint64), los
+bits, y los números (int64 little-endian, ordenados).
+
+Uso:
+    python3 filtro_bloom.py agregar invalid.csv              # suma al filtro del directorio de datos
+    python3 filtro_bloom.py unir otro.bloom                  # fusiona otro filtro
+    python3 filtro_bloom.py consultar +573001234567 5491155556666
+    python3 filtro_bloom.py info
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from heapq import merge
+
+try:
+    import numpy as np
+except ImportError:  # se calcula número a número
+    np = None
+
+from carga_telefonos import cargar_telefonos, telefono_a_entero
+from contacto import archivo_atomico, ruta_datos
+
+ARCHIVO_FILTRO = 'sin_whatsapp.bloom'
+MAGIA = b'BLOOMSW1'
+_CABECERA = struct.Struct('<8sQQQ')
+
+CAPACIDAD = 100000  # números antes de reconstruir el filtro más grande
+TASA_ERROR = 0.01
+
+_MASCARA = (1 << 64) - 1
+
+
+def _mezclar(x):
+    """splitmix64: un entero -> 64 bits bien repartidos"""
+    z = (x + 0x9E3779B97F4A7C15) & _MASCARA
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA
+    return z ^ (z >> 31)
+
+
+def _mezclar_lote(numeros):
+    """_mezclar sobre un arreglo uint64 (la aritmética ya es módulo 2**64)"""
+    z = numeros.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def dimensiones(capacidad, tasa_error=TASA_ERROR):
+    """(bits, hashes) óptimos para `capacidad` números con esa tasa de falsos positivos"""
+    bits = max(64, math.ceil(-capacidad * math.log(tasa_error) / math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacidad * math.log(2)))
+    return bits, hashes
+
+
+class FiltroBloom:
+    """Filtro de Bloom de enteros con confirmación exacta de los positivos"""
+
+    def __init__(self, bits=None, hashes=None, capacidad=CAPACIDAD):
+        if bits is None:
+            bits, hashes = dimensiones(capacidad)
+        self.bits = bits
+        self.hashes = hashes
+        self._bytes = bytearray(bits // 8)
+        self._exactos = array('q')
+        self._pendientes = []  # agregados aún sin ordenar dentro de _exactos
+
+    @property
+    def capacidad(self):
+        return int(self.bits * math.log(2) / self.hashes)
+
+    def _posiciones(self, numero):
+        mezcla = _mezclar(numero)
+        h1, h2 = mezcla & 0xFFFFFFFF, (mezcla >> 32) | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _marcar(self, numeros):
+        if np is not None and len(numeros) > 64:
+            mezcla = _mezclar_lote(np.asarray(numeros, dtype=np.int64))
+            h1 = mezcla & np.uint64(0xFFFFFFFF)
+            h2 = (mezcla >> np.uint64(32)) | np.uint64(1)
+            bytes_filtro = np.frombuffer(self._bytes, dtype=np.uint8)
+            for i in range(self.hashes):
+                posiciones = (h1 + np.uint64(i) * h2) % np.uint64(self.bits)
+                np.bitwise_or.at(bytes_filtro, (posiciones >> np.uint64(3)).astype(np.intp),
+                                 (np.uint8(1) << (posiciones & np.uint64(7)).astype(np.uint8)))
+            return
+        for numero in numeros:
+            for posicion in self._posiciones(numero):
+                self._bytes[posicion >> 3] |= 1 << (posicion & 7)
+
+    def _ordenar(self):
+        if self._pendientes:
+            nuevos = sorted(set(self._pendientes))
+            self._exactos = array('q', _sin_repetidos(merge(self._exactos, nuevos)))
+            self._pendientes = []
+
+    def __len__(self):
+        self._ordenar()
+        return len(self._exactos)
+
+    def agregar(self, numeros):
+        """Agrega enteros (un iterable, ndarray o array('q')); devuelve cuántos eran nuevos"""
+        numeros = [int(n) for n in numeros]
+        nuevos = [n for n in numeros if not self.contiene(n)]
+        if not nuevos:
+            return 0
+        self._pendientes.extend(nuevos)
+        if len(self) > self.capacidad:
+            self._reconstruir(max(len(self) * 2, CAPACIDAD))
+        else:
+            self._marcar(nuevos)
+        return len(set(nuevos))
+
+    def _reconstruir(self, capacidad):
+        """Filtro más grande con los mismos números (posible gracias a la lista exacta)"""
+        self.bits, self.hashes = dimensiones(capacidad)
+        self._bytes = bytearray(self.bits // 8)
+        self._ordenar()
+        self._marcar(self._exactos)
+
+    def quizas_contiene(self, numero):
+        """Solo el filtro: False es seguro, True puede ser un falso positivo"""
+        return all(self._bytes[p >> 3] & (1 << (p & 7)) for p in self._posiciones(numero))
+
+    def contiene(self, numero):
+        if numero is None or not self.quizas_contiene(numero):
+            return False
+        self._ordenar()
+        i = bisect_left(self._exactos, numero)
+        return i < len(self._exactos) and self._exactos[i] == numero
+
+    __contains__ = contiene
+
+    def contiene_telefono(self, telefono):
+        """'+573001234567' o '573001234567'"""
+        return self.contiene(telefono_a_entero(telefono))
+
+    def unir(self, otro):
+        """Agrega los números de otro filtro; con las mismas dimensiones basta un OR de bits"""
+        otro._ordenar()
+        if (otro.bits, otro.hashes) == (self.bits, self.hashes):
+            self._ordenar()
+            self._exactos = array('q', _sin_repetidos(merge(self._exactos, otro._exactos)))
+            for i, byte in enumerate(otro._bytes):
+                self._bytes[i] |= byte
+            if len(self) > self.capacidad:
+                self._reconstruir(len(self) * 2)
+            return
+        self.agregar(otro._exactos)
+
+    def guardar(self, ruta):
+        """Escritura atómica (archivo_atomico): la validación y el CLI pueden escribir a la vez"""
+        self._ordenar()
+        with archivo_atomico(ruta, 'wb') as f:
+            f.write(_CABECERA.pack(MAGIA, self.bits, self.hashes, len(self._exactos)))
+            f.write(self._bytes)
+            exactos = array('q', self._exactos)
+            if sys.byteorder != 'little':
+                exactos.byteswap()
+            exactos.tofile(f)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta, 'rb') as f:
+            magia, bits, hashes, cantidad = _CABECERA.unpack(f.read(_CABECERA.size))
+            if magia != MAGIA:
+                raise ValueError(f"{ruta} no es un filtro de números sin WhatsApp")
+            filtro = cls(bits, hashes)
+            filtro._bytes = bytearray(f.read(bits // 8))
+            filtro._exactos.fromfile(f, cantidad)
+        if sys.byteorder != 'little':
+            filtro._exactos.byteswap()
+        return filtro
+
+
+def _sin_repetidos(ordenados):
+    anterior = None
+    for numero in ordenados:
+        if numero != anterior:
+            yield numero
+            anterior = numero
+
+
+def ruta_filtro():
+    return ruta_datos(ARCHIVO_FILTRO)
+
+
+@lru_cache(maxsize=1)
+def cargar_filtro(ruta=None):
+    """El filtro del directorio de datos, o None si todavía no existe"""
+    ruta = ruta or ruta_filtro()
+    if not os.path.exists(ruta):
+        return None
+    return FiltroBloom.cargar(ruta)
+
+
+def actualizar_filtro(numeros, ruta=None):
+    """Suma números al filtro persistido (lo crea si no existe); devuelve (filtro, nuevos)"""
+    ruta = ruta or ruta_filtro()
+    filtro = FiltroBloom.cargar(ruta) if os.path.exists(ruta) else FiltroBloom()
+    nuevos = filtro.agregar(numeros)
+    filtro.guardar(ruta)
+    cargar_filtro.cache_clear()
+    return filtro, nuevos
+
+
+def sin_conocidos(contactos, filtro, descartados=None):
+    """
+    Deja pasar los contactos cuyo teléfono no está en el filtro. Si se pasa
+    una lista en `descartados`, agrega ahí los que quedan afuera
+    """
+    for contacto in contactos:
+        if filtro.contiene_telefono(contacto['telefono']):
+            if descartados is not None:
+                descartados.append(contacto)
+            continue
+        yield contacto
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filtro de números sin WhatsApp")
+    parser.add_argument('--filtro', default=None, help=f"Por defecto {ARCHIVO_FILTRO} en el directorio de datos")
+    acciones = parser.add_subparsers(dest='accion', required=True)
+    agregar = acciones.add_parser('agregar', help="Suma los números de listas (invalid.csv, ...)")
+    agregar.add_argument('archivos', nargs='+')
+    unir = acciones.add_parser('unir', help="Fusiona otros filtros en este")
+    unir.add_argument('filtros', nargs='+')
+    consultar = acciones.add_parser('consultar', help="Consulta teléfonos")
+    consultar.add_argument('telefonos', nargs='+')
+    acciones.add_parser('info')
+    args = parser.parse_args()
+    ruta = args.filtro or ruta_filtro()
+
+    if args.accion == 'agregar':
+        for archivo in args.archivos:
+            filtro, nuevos = actualizar_filtro(cargar_telefonos(archivo), ruta)
+            print(f"➕ {archivo}: {nuevos:,} números nuevos")
+        print(f"✅ {len(filtro):,} números en {ruta}")
+
+    elif args.accion == 'unir':
+        filtro = FiltroBloom.cargar(ruta) if os.path.exists(ruta) else FiltroBloom()
+        for otro in args.filtros:
+            filtro.unir(FiltroBloom.cargar(otro))
+            print(f"🔗 {otro} unido")
+        filtro.guardar(ruta)
+        print(f"✅ {len(filtro):,} números en {ruta}")
+
+    elif args.accion == 'consultar':
+        filtro = cargar_filtro(ruta) or FiltroBloom()
+        for telefono in args.telefonos:
+            estado = "❌ sin WhatsApp" if filtro.contiene_telefono(telefono) else "✅ no está en el filtro"
+            print(f"   {telefono:<18} {estado}")
+
+    else:
+        filtro = cargar_filtro(ruta)
+        if filtro is None:
+            print(f"⚠️  No existe {ruta}")
+            sys.exit(1)
+        ocupacion = sum(bin(b).count('1') for b in filtro._bytes) / filtro.bits
+        print(f"📊 {ruta}")
+        print(f"   Números:   {len(filtro):,} (capacidad {filtro.capacidad:,})")
+        print(f"   Bits:      {filtro.bits:,} ({filtro.bits // 8:,} bytes), {filtro.hashes} hashes")
+        print(f"   Ocupación: {ocupacion:.1%} → falsos positivos ≈ {ocupacion ** filtro.hashes:.2%}")
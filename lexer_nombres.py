@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Lexer de nombres de contacto.
+
+Un nombre crudo ("03 04 2025erika Sotelo", "de Mar 2024 B Juan-Pablo") se
+recorre una sola vez y se parte en tokens ya clasificados. Las reglas de
+limpieza trabajan sobre esa lista en vez de encadenar regex sobre el texto,
+así el orden entre reglas queda explícito. Los tokens de cada nombre
+distinto se calculan una vez (caché LRU).
+
+Tipos de token:
+    DIGITOS    '2025', '03'
+    ESPACIO    uno o más espacios en blanco
+    SIGNO      cualquier otro carácter suelto ('-', '/', '.', '@', emoji...)
+    MES        'ene', 'Marzo', ...
+    DIA        'lun', 'Sábado', ...
+    PARTICULA  'de', 'del', 'la', 'dos', ...
+    INICIAL    una sola letra ('B')
+    NOMBRE     cualquier otra palabra
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from capitalizacion import PARTICULAS
+from parser_notas import MESES_NOTA
+
+DIGITOS = 'DIGITOS'
+ESPACIO = 'ESPACIO'
+SIGNO = 'SIGNO'
+MES = 'MES'
+DIA = 'DIA'
+PARTICULA = 'PARTICULA'
+INICIAL = 'INICIAL'
+NOMBRE = 'NOMBRE'
+
+# Tipos que son palabras (letras)
+PALABRAS = frozenset([MES, DIA, PARTICULA, INICIAL, NOMBRE])
+
+MESES = frozenset(MESES_NOTA)
+DIAS_SEMANA = frozenset([
+    'lun', 'mar', 'mié', 'jue', 'vie', 'sáb', 'dom',
+    'lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo',
+])
+
+Token = namedtuple('Token', ['tipo', 'texto'])
+
+_PATRON_TOKEN = re.compile(r'(\d+)|([^\W\d_]+)|(\s+)|(.)', re.DOTALL)
+
+
+def _clasificar_palabra(palabra):
+    minuscula = palabra.lower()
+    if len(palabra) == 1:
+        return INICIAL
+    if minuscula in MESES:
+        return MES
+    if minuscula in DIAS_SEMANA:
+        return DIA
+    if minuscula in PARTICULAS:
+        return PARTICULA
+    return NOMBRE
+
+
+@lru_cache(maxsize=65536)
+def tokenizar(texto):
+    """Tupla de tokens del texto (un solo recorrido)"""
+    tokens = []
+    for match in _PATRON_TOKEN.finditer(texto):
+        digitos, palabra, espacio, signo = match.groups()
+        if digitos is not None:
+            tokens.append(Token(DIGITOS, digitos))
+        elif palabra is not None:
+            tokens.append(Token(_clasificar_palabra(palabra), palabra))
+        elif espacio is not None:
+            tokens.append(Token(ESPACIO, espacio))
+        else:
+            tokens.append(Token(SIGNO, signo))
+    return tuple(tokens)
+
+
+def texto_de(tokens):
+    return ''.join(token.texto for token in tokens)
+
+
+def tramos_de_palabras(tokens):
+    """Tramos de palabras y espacios que empiezan con una palabra"""
+    tramo = []
+    for token in tokens:
+        if token.tipo in PALABRAS or (tramo and token.tipo == ESPACIO):
+            tramo.append(token)
+        elif tramo:
+            yield tramo
+            tramo = []
+    if tramo:
+        yield tramo
+
+
+def es_inicial_mayuscula(token):
+    return token.tipo == INICIAL and 'A' <= token.texto <= 'Z'
@@ -4,6 +4,10 @@ import csv
 import os
 from datetime import datetime
 
+from contacto import Contacto, a_json
+from muestreo import muestra_estratificada
+from paises import pais_de_telefono
+
 def limpiar_contactos_sin_whatsapp():
     """
     Limpia contactos que no tienen WhatsApp activo según validación de Whapi
@@ -36,7 +40,7 @@ def limpiar_contactos_sin_whatsapp():
         print("   2. Renómbralo a uno de estos nombres:")
         for archivo in archivos_posibles[:3]:
             print(f"      - {archivo}")
-        print("   3. Colócalo en el directorio /workspace/")
+        print(f"   3. Colócalo en el directorio {os.getcwd()}/")
         print("   4. Ejecuta este script nuevamente")
         return
     
@@ -82,7 +86,7 @@ def limpiar_contactos_sin_whatsapp():
     
     # PASO 3: Leer contactos originales
     with open('CONTACTOS_FINALES_SIN_A.json', 'r', encoding='utf-8') as f:
-        contactos_originales = json.load(f)
+        contactos_originales = json.load(f, object_hook=Contacto.desde_dict)
     
     print(f"📊 Total contactos originales: {len(contactos_originales)}")
     
@@ -105,15 +109,15 @@ def limpiar_contactos_sin_whatsapp():
     # PASO 5: Guardar archivos
     # Contactos válidos
     with open('CONTACTOS_VALIDADOS_WHATSAPP.json', 'w', encoding='utf-8') as f:
-        json.dump(contactos_con_whatsapp, f, indent=2, ensure_ascii=False)
+        json.dump(contactos_con_whatsapp, f, indent=2, ensure_ascii=False, default=a_json)
     
     # Muestra de 50
     with open('MUESTRA_50_VALIDADOS.json', 'w', encoding='utf-8') as f:
-        json.dump(contactos_con_whatsapp[:50], f, indent=2, ensure_ascii=False)
+        json.dump(muestra_estratificada(contactos_con_whatsapp), f, indent=2, ensure_ascii=False, default=a_json)
     
     # Contactos excluidos (para referencia)
     with open('CONTACTOS_SIN_WHATSAPP.json', 'w', encoding='utf-8') as f:
-        json.dump(contactos_sin_whatsapp, f, indent=2, ensure_ascii=False)
+        json.dump(contactos_sin_whatsapp, f, indent=2, ensure_ascii=False, default=a_json)
     
     # PASO 6: Crear script SQL para limpiar BD
     with open('limpiar_contactos_bd.sql', 'w', encoding='utf-8') as f:
@@ -181,33 +185,8 @@ def limpiar_contactos_sin_whatsapp():
     print("\n🌍 ANÁLISIS POR PAÍS (contactos con WhatsApp):")
     paises = {}
     for contacto in contactos_con_whatsapp:
-        telefono = contacto['telefono']
-        # Extraer código de país (primeros 2-3 dígitos después del +)
-        if telefono.startswith('+'):
-            codigo = telefono[1:3]
-            if codigo == '57':  # Colombia
-                pais = 'Colombia'
-            elif codigo == '1':  # USA/Canadá
-                pais = 'USA/Canadá'
-            elif codigo == '52':  # México
-                pais = 'México'
-            elif codigo == '54':  # Argentina
-                pais = 'Argentina'
-            elif codigo == '34':  # España
-                pais = 'España'
-            elif codigo == '44':  # UK
-                pais = 'Reino Unido'
-            elif codigo == '55':  # Brasil
-                pais = 'Brasil'
-            elif codigo == '51':  # Perú
-                pais = 'Perú'
-            elif codigo == '59':  # Ecuador/Uruguay
-                pais = 'Ecuador/Uruguay'
-            elif codigo == '50':  # Centroamérica
-                pais = 'Centroamérica'
-            else:
-                pais = f'Código +{codigo}'
-            
+        pais = pais_de_telefono(contacto['telefono'])
+        if pais:
             paises[pais] = paises.get(pais, 0) + 1
     
     # Ordenar por cantidad
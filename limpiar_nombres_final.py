@@ -2,37 +2,50 @@
 import json
 import re
 
-# Leer el archivo
-with open('/workspace/contactos_ultra_limpios.json', 'r') as f:
-    contactos = json.load(f)
+from capitalizacion import capitalizar_nombre
+from contacto import Contacto, a_json, ruta_datos
+from lexer_nombres import DIA, DIGITOS, ESPACIO, MES, es_inicial_mayuscula, texto_de, tokenizar
+from lista_ordenada import ListaOrdenada
+from muestreo import muestra_estratificada
+from parser_notas import parsear_nota
+
+def _fin_de_fecha(tokens):
+    """
+    Posición donde termina la fecha al inicio del nombre: números, meses,
+    días, "de", espacios, guiones y barras ("03 04 2025", "Mar 6 Ago 2024",
+    "1 de Abril de 2023"). Sin ningún número no es una fecha: un mes suelto
+    es un nombre ("Julio", "Julio Guecha") y se queda
+    """
+    fin = 0
+    con_numero = False
+    for i, token in enumerate(tokens):
+        separador = token.tipo == ESPACIO or token.texto in ('-', '/')
+        if token.tipo in (DIGITOS, MES, DIA) or (separador and fin == i):
+            fin = i + 1
+            con_numero = con_numero or token.tipo == DIGITOS
+        elif not (separador or token.texto.lower() == 'de'):
+            break
+    return fin if con_numero else 0
 
 def limpiar_nombre(nombre):
     if not nombre:
         return None
     
-    original = nombre
-    
-    # Remover TODOS los números del principio, sin importar el formato
-    # Esto es MUY agresivo pero necesario
-    while nombre and nombre[0].isdigit():
-        # Encontrar donde terminan los números/códigos
-        i = 0
-        while i < len(nombre) and (nombre[i].isdigit() or nombre[i] in ' -/'):
-            i += 1
-        nombre = nombre[i:].strip()
+    tokens = tokenizar(nombre)
     
-    # Ahora remover patrones específicos que puedan quedar
-    # Remover fechas con mes
-    nombre = re.sub(r'^(?:de\s+)?(?:ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic|enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre)\s*(?:\d{2,4})?', '', nombre, flags=re.IGNORECASE)
+    # Remover la fecha del principio, sin importar el formato
+    i = _fin_de_fecha(tokens)
     
-    # Remover letras sueltas al inicio (como "B", "A")
-    nombre = re.sub(r'^[A-Z]\s+', '', nombre)
+    # Remover una letra suelta al inicio (como "B", "A")
+    if i + 1 < len(tokens) and es_inicial_mayuscula(tokens[i]) and tokens[i + 1].tipo == ESPACIO:
+        i += 2
     
     # Remover guiones y caracteres especiales al inicio
-    nombre = re.sub(r'^[-\s,\.]+', '', nombre)
+    while i < len(tokens) and (tokens[i].tipo == ESPACIO or tokens[i].texto in '-,.'):
+        i += 1
     
     # Limpiar espacios múltiples
-    nombre = re.sub(r'\s+', ' ', nombre).strip()
+    nombre = ' '.join(texto_de(tokens[i:]).split())
     
     # Si el nombre quedó vacío o muy corto, retornar None
     if not nombre or len(nombre) < 2:
@@ -43,17 +56,7 @@ def limpiar_nombre(nombre):
         return None
     
     # Capitalizar correctamente
-    palabras = nombre.split()
-    palabras_capitalizadas = []
-    palabras_minusculas = ['de', 'del', 'la', 'el', 'los', 'las', 'y']
-    
-    for i, palabra in enumerate(palabras):
-        if i == 0 or palabra.lower() not in palabras_minusculas:
-            palabras_capitalizadas.append(palabra.capitalize())
-        else:
-            palabras_capitalizadas.append(palabra.lower())
-    
-    return ' '.join(palabras_capitalizadas)
+    return capitalizar_nombre(nombre)
 
 def procesar_nota(nota, nombre_original):
     if not nota:
@@ -62,7 +65,8 @@ def procesar_nota(nota, nombre_original):
     # Extraer fecha del nombre original si existe
     fecha_match = re.search(r'\d{1,2}[\s/]\d{1,2}[\s/]\d{2,4}', nombre_original or '')
     if not fecha_match:
-        fecha_match = re.search(r'\d{1,2}\s+de\s+\w+\s+de\s+\d{4}', nombre_original or '')
+        # "1 de Abril de 2023", "Dom 1 Sep 2024"
+        fecha_match = re.search(r'\d{1,2}\s+(?:de\s+)?[^\W\d_]+\s+(?:de\s+)?\d{4}', nombre_original or '')
     
     if fecha_match and fecha_match.group() not in nota:
         fecha = fecha_match.group()
@@ -74,41 +78,52 @@ def procesar_nota(nota, nombre_original):
     
     return nota if nota else None
 
-# Procesar todos los contactos
-contactos_limpios = []
-for contacto in contactos:
-    nombre_limpio = limpiar_nombre(contacto.get('nombre'))
-    
-    if nombre_limpio:
-        nota_procesada = procesar_nota(contacto.get('nota'), contacto.get('nombre'))
-        
-        contactos_limpios.append({
-            'nombre': nombre_limpio,
-            'telefono': contacto['telefono'],
-            'nota': nota_procesada
-        })
-
-# Ordenar por nombre
-contactos_limpios.sort(key=lambda x: x['nombre'])
-
-print(f"✅ Procesados {len(contactos_limpios)} contactos con nombres limpios")
-print(f"📝 Con notas: {len([c for c in contactos_limpios if c['nota']])}")
-
-# Guardar archivos finales
-with open('/workspace/contactos_definitivos.json', 'w') as f:
-    json.dump(contactos_limpios, f, indent=2, ensure_ascii=False)
-
-with open('/workspace/muestra_50_definitivos.json', 'w') as f:
-    json.dump(contactos_limpios[:50], f, indent=2, ensure_ascii=False)
-
-print("\n📄 Archivos guardados:")
-print("   - /workspace/contactos_definitivos.json")
-print("   - /workspace/muestra_50_definitivos.json")
-
-# Mostrar muestra
-print("\n🎯 Primeros 10 contactos DEFINITIVOS:")
-for i, c in enumerate(contactos_limpios[:10], 1):
-    print(f"\n{i}. {c['nombre']}")
-    print(f"   📱 {c['telefono']}")
-    if c['nota']:
-        print(f"   📝 {c['nota']}")
\ No newline at end of file
+def main():
+    """Ejecuta la etapa completa: lee, limpia y guarda los archivos"""
+    # Leer el archivo
+    with open(ruta_datos('contactos_ultra_limpios.json'), 'r') as f:
+        contactos = json.load(f, object_hook=Contacto.desde_dict)
+
+    # Procesar todos los contactos
+    orden = ListaOrdenada()
+    for contacto in contactos:
+        nombre_limpio = limpiar_nombre(contacto.get('nombre'))
+
+        if nombre_limpio:
+            nota_procesada = procesar_nota(contacto.get('nota'), contacto.get('nombre'))
+
+            orden.agregar(Contacto(
+                nombre_limpio,
+                contacto['telefono'],
+                nota_procesada,
+                **parsear_nota(nota_procesada)
+            ))
+
+    # Orden por nombre (mantenido al agregar)
+    contactos_limpios = list(orden)
+
+    print(f"✅ Procesados {len(contactos_limpios)} contactos con nombres limpios")
+    print(f"📝 Con notas: {len([c for c in contactos_limpios if c['nota']])}")
+
+    # Guardar archivos finales
+    with open(ruta_datos('contactos_definitivos.json'), 'w') as f:
+        json.dump(contactos_limpios, f, indent=2, ensure_ascii=False, default=a_json)
+
+    with open(ruta_datos('muestra_50_definitivos.json'), 'w') as f:
+        json.dump(muestra_estratificada(contactos_limpios), f, indent=2, ensure_ascii=False, default=a_json)
+
+    print("\n📄 Archivos guardados:")
+    print(f"   - {ruta_datos('contactos_definitivos.json')}")
+    print(f"   - {ruta_datos('muestra_50_definitivos.json')}")
+
+    # Mostrar muestra
+    print("\n🎯 Primeros 10 contactos DEFINITIVOS:")
+    for i, c in enumerate(contactos_limpios[:10], 1):
+        print(f"\n{i}. {c['nombre']}")
+        print(f"   📱 {c['telefono']}")
+        if c['nota']:
+            print(f"   📝 {c['nota']}")
+
+
+if __name__ == "__main__":
+    main()
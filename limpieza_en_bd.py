@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Limpieza en sitio de la tabla "Contactos".
+
+En vez de exportar a JSON, limpiar y generar SQL, recorre la tabla por
+páginas con paginación por clave (WHERE id > último id ORDER BY id LIMIT n:
+cada página es una consulta indexada, sin OFFSET y sin mantener un cursor
+abierto durante toda la corrida), pasa cada fila por el motor de limpieza y
+escribe de vuelta solo los nombres y notas que cambiaron, con un UPDATE por
+lotes y una transacción por página.
+
+Cada UPDATE exige que la fila siga como se leyó (name y nota iguales a los
+leídos); si un job de sincronización la cambió en medio, no se pisa y se
+cuenta como conflicto. Los contactos que el motor descarta (sin nombre
+válido) no se tocan: borrar es tarea del flujo de validación.
+
+Aquí, a diferencia de la cadena en JSON, la fila original no queda en
+ningún lado, así que un nombre solo se escribe si el motor lo deja como
+está al pasarlo de nuevo: una segunda corrida (o un --desde-id que se
+solapa) no cambia nada. Tampoco se escribe, y se cuenta como sospechoso,
+un nombre que quedó solo en partículas ('1 de Abril de 2023sandra' ->
+'De de') o que no conserva ninguna palabra del original.
+
+La tabla no tiene columna de notas: con --columna-nota se indica cuál usar.
+Sin ella solo se actualiza el nombre, y se informa cuántas notas (fechas
+que el motor saca del nombre) quedaron sin guardar.
+
+Funciona con PostgreSQL (psycopg 3 o psycopg2, opcionales) y con SQLite
+como réplica local para probar:
+
+    python3 limpieza_en_bd.py preparar contactos_ultra_limpios.json /tmp/contactos.db --columna-nota nota
+    python3 limpieza_en_bd.py limpiar sqlite:////tmp/contactos.db --columna-nota nota --simular
+    python3 limpieza_en_bd.py limpiar "$DATABASE_URL" --lote 2000
+    python3 limpieza_en_bd.py limpiar "$DATABASE_URL" --desde-id 150000      # retomar
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, namedtuple
+
+from capitalizacion import PARTICULAS
+from contacto import Contacto, iterar_contactos
+from motor_limpieza import limpiar_detallado
+from normalizacion import clave_normalizada
+
+TABLA = 'Contactos'
+TAMANO_LOTE = 1000
+EJEMPLOS = 10
+
+# marcador de parámetros y comparación que trata NULL = NULL como verdadero
+Dialecto = namedtuple('Dialecto', ['marcador', 'igual'])
+SQLITE = Dialecto('?', 'IS')
+POSTGRES = Dialecto('%s', 'IS NOT DISTINCT FROM')
+
+_IDENTIFICADOR = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def columna(nombre):
+    """Identificador entre comillas dobles (los de Prisma son sensibles a mayúsculas)"""
+    if not _IDENTIFICADOR.match(nombre):
+        raise ValueError(f"Nombre de columna inválido: {nombre!r}")
+    return f'"{nombre}"'
+
+
+def conectar(url):
+    """(conexión DB-API, dialecto) para 'postgresql://...', 'sqlite:///ruta' o una ruta"""
+    if url.startswith(('postgres://', 'postgresql://')):
+        try:
+            import psycopg
+        except ImportError:
+            try:
+                import psycopg2 as psycopg
+            except ImportError:
+                raise RuntimeError("Para PostgreSQL hace falta psycopg: pip install 'psycopg[binary]'")
+        return psycopg.connect(url), POSTGRES
+    ruta = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url
+    return sqlite3.connect(ruta), SQLITE
+
+
+def _consultas(dialecto, columna_nota, columna_actualizado):
+    m = dialecto.marcador
+    columnas = ['id', 'phoneNumber', 'name'] + ([columna_nota] if columna_nota else [])
+    seleccion = (f"SELECT {', '.join(columna(c) for c in columnas)} FROM {columna(TABLA)} "
+                 f"WHERE {columna('id')} > {m} ORDER BY {columna('id')} LIMIT {m}")
+
+    asignaciones = [f"{columna('name')} = {m}"]
+    condiciones = [f"{columna('id')} = {m}", f"{columna('name')} {dialecto.igual} {m}"]
+    if columna_nota:
+        asignaciones.append(f"{columna(columna_nota)} = {m}")
+        condiciones.append(f"{columna(columna_nota)} {dialecto.igual} {m}")
+    if columna_actualizado:
+        asignaciones.append(f"{columna(columna_actualizado)} = CURRENT_TIMESTAMP")
+    actualizacion = (f"UPDATE {columna(TABLA)} SET {', '.join(asignaciones)} "
+                     f"WHERE {' AND '.join(condiciones)}")
+    return seleccion, actualizacion
+
+
+def sospechoso(original, limpio):
+    """True si el nombre limpio es solo partículas o no conserva ninguna palabra del original"""
+    propias = [p for p in clave_normalizada(limpio).split() if p not in PARTICULAS]
+    # Subcadena y no palabra: '2023sandra Varela' conserva 'sandra'
+    original = clave_normalizada(original)
+    return not any(palabra in original for palabra in propias)
+
+
+def estable(nombre, telefono, nota):
+    """True si el motor deja la fila como está: volver a limpiarla no la cambia"""
+    limpio = limpiar_detallado(Contacto(nombre, telefono, nota), registrar=False)[0]
+    return limpio is not None and (limpio.nombre, limpio.nota) == (nombre, nota)
+
+
+def paginas(conexion, seleccion, tamano_lote, desde_id=0):
+    """Filas de la tabla por páginas (paginación por clave sobre id)"""
+    ultimo = desde_id
+    while True:
+        cursor = conexion.cursor()
+        cursor.execute(seleccion, (ultimo, tamano_lote))
+        filas = cursor.fetchall()
+        cursor.close()
+        if not filas:
+            return
+        yield filas
+        ultimo = filas[-1][0]
+
+
+def limpiar_tabla(conexion, dialecto, tamano_lote=TAMANO_LOTE, columna_nota=None,
+                  columna_actualizado='updatedAt', desde_id=0, simular=False, ejemplos=None):
+    """
+    Limpia la tabla en sitio. Devuelve un Counter con leidos, actualizados,
+    sin_cambios, descartados, sospechosos, conflictos y notas_sin_columna. Si
+    se pasa una lista en `ejemplos`, agrega ahí (id, antes, después) de los
+    primeros cambios
+    """
+    seleccion, actualizacion = _consultas(dialecto, columna_nota, columna_actualizado)
+    totales = Counter()
+    inicio = time.time()
+
+    for filas in paginas(conexion, seleccion, tamano_lote, desde_id):
+        cambios = []
+        for fila in filas:
+            identificador, telefono, nombre = fila[:3]
+            nota = fila[3] if columna_nota else None
+            limpio, _, descarte = limpiar_detallado(Contacto(nombre, telefono, nota))
+            totales['leidos'] += 1
+
+            if descarte:
+                totales['descartados'] += 1
+                continue
+            if not columna_nota and limpio.nota != nota:
+                totales['notas_sin_columna'] += 1
+            nueva_nota = limpio.nota if columna_nota else nota
+            if (limpio.nombre, nueva_nota) == (nombre, nota):
+                totales['sin_cambios'] += 1
+                continue
+            if sospechoso(nombre, limpio.nombre) or not estable(limpio.nombre, telefono, nueva_nota):
+                totales['sospechosos'] += 1
+                continue
+
+            parametros = [limpio.nombre] + ([limpio.nota] if columna_nota else [])
+            parametros += [identificador, nombre] + ([nota] if columna_nota else [])
+            cambios.append(parametros)
+            if ejemplos is not None and len(ejemplos) < EJEMPLOS:
+                ejemplos.append((identificador, (nombre, nota), (limpio.nombre, limpio.nota)))
+
+        # Una transacción por página: si algo falla, se pierde a lo sumo una página
+        if cambios and not simular:
+            cursor = conexion.cursor()
+            try:
+                cursor.executemany(actualizacion, cambios)
+                actualizados = cursor.rowcount if cursor.rowcount >= 0 else len(cambios)
+                conexion.commit()
+            except Exception:
+                conexion.rollback()
+                raise
+            finally:
+                cursor.close()
+        else:
+            actualizados = len(cambios)
+        totales['actualizados'] += actualizados
+        totales['conflictos'] += len(cambios) - actualizados
+
+        velocidad = totales['leidos'] / max(time.time() - inicio, 1e-9)
+        print(f"   📄 hasta id {filas[-1][0]}: {totales['leidos']:,} leídos, "
+              f"{totales['actualizados']:,} actualizados ({velocidad:,.0f} filas/s)")
+
+    return totales
+
+
+def preparar_sqlite(ruta_json, ruta_db, columna_nota=None):
+    """Crea la réplica SQLite de "Contactos" con los contactos de un JSON; devuelve cuántos cargó"""
+    conexion = sqlite3.connect(ruta_db)
+    columnas = [f"{columna('id')} INTEGER PRIMARY KEY AUTOINCREMENT",
+                f"{columna('phoneNumber')} TEXT NOT NULL UNIQUE",
+                f"{columna('name')} TEXT"]
+    if columna_nota:
+        columnas.append(f"{columna(columna_nota)} TEXT")
+    columnas.append(f"{columna('updatedAt')} TIMESTAMP")
+    conexion.execute(f"CREATE TABLE IF NOT EXISTS {columna(TABLA)} ({', '.join(columnas)})")
+
+    nombres = ['phoneNumber', 'name'] + ([columna_nota] if columna_nota else [])
+    insercion = (f"INSERT OR IGNORE INTO {columna(TABLA)} ({', '.join(columna(c) for c in nombres)}) "
+                 f"VALUES ({', '.join('?' * len(nombres))})")
+    filas = ((c['telefono'], c['nombre']) + ((c['nota'],) if columna_nota else ())
+             for c in iterar_contactos(ruta_json))
+    with conexion:
+        conexion.executemany(insercion, filas)
+    total = conexion.execute(f"SELECT COUNT(*) FROM {columna(TABLA)}").fetchone()[0]
+    conexion.close()
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Limpieza en sitio de la tabla "Contactos"')
+    acciones = parser.add_subparsers(dest='accion', required=True)
+
+    limpiar = acciones.add_parser('limpiar', help="Limpia la tabla en sitio")
+    limpiar.add_argument('url', nargs='?', default=os.environ.get('DATABASE_URL'),
+                         help="postgresql://..., sqlite:///ruta o ruta (por defecto $DATABASE_URL)")
+    limpiar.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por página y transacción")
+    limpiar.add_argument('--columna-nota', default=None, help="Columna donde guardar la nota")
+    limpiar.add_argument('--columna-actualizado', default='updatedAt',
+                         help="Columna de fecha de modificación ('' para no tocarla)")
+    limpiar.add_argument('--desde-id', type=int, default=0, help="Retomar después de este id")
+    limpiar.add_argument('--simular', action='store_true', help="Contar cambios sin escribir")
+
+    preparar = acciones.add_parser('preparar', help="Crea una réplica SQLite desde un JSON de contactos")
+    preparar.add_argument('entrada')
+    preparar.add_argument('base')
+    preparar.add_argument('--columna-nota', default=None)
+    args = parser.parse_args()
+
+    if args.accion == 'preparar':
+        total = preparar_sqlite(args.entrada, args.base, args.columna_nota)
+        print(f"✅ {total:,} contactos en {args.base}")
+        sys.exit(0)
+
+    if not args.url:
+        print("❌ Falta la URL de la base (argumento o $DATABASE_URL)")
+        sys.exit(1)
+
+    try:
+        conexion, dialecto = conectar(args.url)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"🗄️  Limpiando \"{TABLA}\" en páginas de {args.lote:,}"
+          f"{' (simulación, sin escribir)' if args.simular else ''}...")
+    ejemplos = []
+    try:
+        totales = limpiar_tabla(conexion, dialecto, args.lote, args.columna_nota,
+                                args.columna_actualizado or None, args.desde_id, args.simular, ejemplos)
+    finally:
+        conexion.close()
+
+    print(f"\n📊 Leídos:        {totales['leidos']:,}")
+    print(f"✏️  Actualizados:  {totales['actualizados']:,}")
+    print(f"   Sin cambios:   {totales['sin_cambios']:,}")
+    print(f"🗑️  Descartados:   {totales['descartados']:,} (sin nombre válido, no se tocan)")
+    if totales['sospechosos']:
+        print(f"⚠️  Sospechosos:   {totales['sospechosos']:,} (el nombre limpio no es confiable, no se tocan)")
+    if totales['conflictos']:
+        print(f"⚠️  Conflictos:    {totales['conflictos']:,} (la fila cambió mientras se limpiaba)")
+    if totales['notas_sin_columna']:
+        print(f"⚠️  {totales['notas_sin_columna']:,} notas sin guardar: use --columna-nota")
+    if ejemplos:
+        print("\n🔍 EJEMPLOS:")
+        for identificador, (nombre, nota), (nuevo, nueva_nota) in ejemplos:
+            print(f"   {identificador:>8}  {nombre!r} → {nuevo!r}"
+                  + (f"  📝 {nueva_nota}" if nueva_nota != nota else ""))
@@ -2,6 +2,13 @@
 import json
 import re
 
+from capitalizacion import capitalizar_nombre
+from contacto import Contacto, a_json, ruta_datos
+from lexer_nombres import DIGITOS, ESPACIO, PALABRAS, texto_de, tokenizar
+from lista_ordenada import ListaOrdenada
+from muestreo import muestra_estratificada
+from parser_notas import parsear_nota
+
 # Mapeo de meses
 MESES = {
     '01': 'Enero', '02': 'Febrero', '03': 'Marzo', '04': 'Abril',
@@ -12,6 +19,46 @@ MESES = {
     '9': 'Septiembre'
 }
 
+def _es_digitos(token, minimo, maximo=None):
+    return token.tipo == DIGITOS and minimo <= len(token.texto) <= (maximo or minimo)
+
+
+def separar_fecha(nombre):
+    """
+    Separa una fecha o código pegado al inicio del nombre.
+    Devuelve (resto del nombre, texto para la nota o None), o None si no hay
+    """
+    tokens = tokenizar(nombre)
+    tipos = [token.tipo for token in tokens]
+    
+    # Patrón 1: "03 04 2025erika Natalia Sotelo" -> fecha DD MM YYYY pegada al nombre
+    # Patrón 3: "1 Jul 2025alejandro Paiva" -> fecha con mes en texto
+    if (len(tokens) >= 5 and _es_digitos(tokens[0], 1, 2)
+            and tipos[1] == ESPACIO and tipos[3] == ESPACIO
+            and _es_digitos(tokens[4], 4, len(tokens[4].texto))):
+        año = tokens[4].texto[:4]
+        resto = tokens[4].texto[4:] + texto_de(tokens[5:])
+        mes = tokens[2]
+        if resto and _es_digitos(mes, 1, 2):
+            return resto, f"{MESES.get(mes.texto.lstrip('0'), mes.texto)} {año}"
+        if resto and mes.tipo in PALABRAS and len(mes.texto) >= 3 and mes.texto.isascii():
+            return resto, f"{mes.texto} {año}"
+    
+    # Patrón 4: "2024carolina Giraldo" -> año pegado al nombre
+    # Patrón 5: "21adriana Torres" -> código corto (año abreviado)
+    if (len(tokens) >= 2 and tipos[0] == DIGITOS and len(tokens[0].texto) in (2, 4)
+            and tipos[1] in PALABRAS and tokens[1].texto[0].isascii()):
+        codigo = tokens[0].texto
+        resto = texto_de(tokens[1:])
+        if len(resto) >= 2:
+            if len(codigo) == 4:
+                return resto, codigo
+            # Si es 20-29, probablemente es 2020-2029
+            return resto, f"20{codigo}" if 20 <= int(codigo) <= 29 else None
+    
+    return None
+
+
 def limpiar_contacto(contacto):
     """Limpia completamente un contacto"""
     nombre_original = contacto.get('nombre', '')
@@ -23,77 +70,28 @@ def limpiar_contacto(contacto):
     nombre = nombre_original
     notas_extra = []
     
-    # Patrón 1: "03 04 2025erika Natalia Sotelo" -> fecha DD MM YYYY pegada al nombre
-    match = re.match(r'^(\d{1,2})\s+(\d{1,2})\s+(\d{4})(.+)$', nombre)
-    if match:
-        dia = match.group(1)
-        mes = match.group(2)
-        año = match.group(3)
-        nombre = match.group(4).strip()
-        
-        # Convertir mes a nombre
-        mes_nombre = MESES.get(mes.lstrip('0'), mes)
-        notas_extra.append(f"{mes_nombre} {año}")
+    fecha = separar_fecha(nombre)
+    if fecha:
+        nombre, nota_fecha = fecha
+        nombre = nombre.strip()
+        if nota_fecha:
+            notas_extra.append(nota_fecha)
     
-    # Patrón 2: "01 07 2025yeifer David Sanchez Diaz" -> sin espacio entre año y nombre
-    if not match:
-        match = re.match(r'^(\d{1,2})\s+(\d{1,2})\s+(\d{4})([a-zA-Z].*)$', nombre)
-        if match:
-            dia = match.group(1)
-            mes = match.group(2)
-            año = match.group(3)
-            nombre = match.group(4).strip()
-            
-            mes_nombre = MESES.get(mes.lstrip('0'), mes)
-            notas_extra.append(f"{mes_nombre} {año}")
-    
-    # Patrón 3: "1 Jul 2025alejandro Paiva" -> fecha con mes en texto
-    if not match:
-        match = re.match(r'^(\d{1,2})\s+([A-Za-z]{3,})\s+(\d{4})(.+)$', nombre)
-        if match:
-            dia = match.group(1)
-            mes_texto = match.group(2)
-            año = match.group(3)
-            nombre = match.group(4).strip()
-            notas_extra.append(f"{mes_texto} {año}")
-    
-    # Patrón 4: "2024carolina Giraldo" -> año pegado al nombre
-    if not match:
-        match = re.match(r'^(\d{4})([a-zA-Z].+)$', nombre)
-        if match:
-            año = match.group(1)
-            nombre = match.group(2).strip()
-            notas_extra.append(año)
-    
-    # Patrón 5: "21adriana Torres" -> código corto (año abreviado)
-    if not match:
-        match = re.match(r'^(\d{2})([a-zA-Z].+)$', nombre)
-        if match:
-            codigo = match.group(1)
-            nombre = match.group(2).strip()
-            # Si es 20-29, probablemente es 2020-2029
-            if int(codigo) >= 20 and int(codigo) <= 29:
-                notas_extra.append(f"20{codigo}")
+    tokens = tokenizar(nombre)
+    i = 0
     
     # Patrón 6: Números sueltos al inicio
-    nombre = re.sub(r'^\d+\s*', '', nombre)
+    if tokens and tokens[0].tipo == DIGITOS:
+        i = 2 if len(tokens) > 1 and tokens[1].tipo == ESPACIO else 1
     
     # Limpiar el nombre de caracteres especiales al inicio
-    nombre = re.sub(r'^[-\.,\s]+', '', nombre)
+    while i < len(tokens) and (tokens[i].tipo == ESPACIO or tokens[i].texto in '-.,'):
+        i += 1
+    nombre = texto_de(tokens[i:])
     
     # Capitalizar correctamente
     if nombre:
-        palabras = nombre.lower().split()
-        palabras_minusculas = ['de', 'del', 'la', 'el', 'los', 'las', 'y', 'da']
-        resultado = []
-        
-        for i, palabra in enumerate(palabras):
-            if i == 0 or palabra not in palabras_minusculas:
-                resultado.append(palabra.capitalize())
-            else:
-                resultado.append(palabra)
-        
-        nombre = ' '.join(resultado)
+        nombre = capitalizar_nombre(nombre)
     
     # Construir la nota final
     nota_final = nota_original if nota_original else ""
@@ -118,63 +116,73 @@ def limpiar_contacto(contacto):
     if not nombre or len(nombre) < 2:
         return None
     
-    return {
-        'nombre': nombre,
-        'telefono': contacto['telefono'],
-        'nota': nota_final if nota_final else None
-    }
-
-# Leer el archivo original
-print("📖 Leyendo archivo original...")
-with open('/workspace/CONTACTOS_LIMPIOS_FINAL.json', 'r') as f:
-    contactos = json.load(f)
-
-print(f"📊 Total de contactos a procesar: {len(contactos)}")
-
-# Procesar por lotes
-contactos_limpios = []
-batch_size = 500
-total_batches = (len(contactos) + batch_size - 1) // batch_size
-
-for batch_num in range(total_batches):
-    start_idx = batch_num * batch_size
-    end_idx = min((batch_num + 1) * batch_size, len(contactos))
-    
-    print(f"\n🔄 Procesando lote {batch_num + 1}/{total_batches} (contactos {start_idx + 1} a {end_idx})...")
-    
-    batch = contactos[start_idx:end_idx]
-    
-    for contacto in batch:
-        limpio = limpiar_contacto(contacto)
-        if limpio:
-            contactos_limpios.append(limpio)
-    
-    print(f"   ✅ Lote procesado: {len([c for c in batch if limpiar_contacto(c)])} contactos válidos")
+    nota_final = nota_final if nota_final else None
+
+    return Contacto(
+        nombre,
+        contacto['telefono'],
+        nota_final,
+        # Campos estructurados de la nota (apartamento, mes, año, reserva)
+        **parsear_nota(nota_final)
+    )
+
+def main():
+    """Ejecuta la etapa completa: lee, limpia y guarda los archivos"""
+    # Leer el archivo original
+    print("📖 Leyendo archivo original...")
+    with open(ruta_datos('CONTACTOS_LIMPIOS_FINAL.json'), 'r') as f:
+        contactos = json.load(f, object_hook=Contacto.desde_dict)
+
+    print(f"📊 Total de contactos a procesar: {len(contactos)}")
+
+    # Procesar por lotes
+    orden = ListaOrdenada()
+    batch_size = 500
+    total_batches = (len(contactos) + batch_size - 1) // batch_size
+
+    for batch_num in range(total_batches):
+        start_idx = batch_num * batch_size
+        end_idx = min((batch_num + 1) * batch_size, len(contactos))
+
+        print(f"\n🔄 Procesando lote {batch_num + 1}/{total_batches} (contactos {start_idx + 1} a {end_idx})...")
+
+        batch = contactos[start_idx:end_idx]
+
+        for contacto in batch:
+            limpio = limpiar_contacto(contacto)
+            if limpio:
+                orden.agregar(limpio)
+
+        print(f"   ✅ Lote procesado: {len([c for c in batch if limpiar_contacto(c)])} contactos válidos")
+
+    # Orden alfabético (mantenido al agregar)
+    contactos_limpios = list(orden)
+
+    print(f"\n📊 RESUMEN FINAL:")
+    print(f"   • Total procesados: {len(contactos)}")
+    print(f"   • Contactos válidos: {len(contactos_limpios)}")
+    print(f"   • Con notas: {len([c for c in contactos_limpios if c['nota']])}")
 
-# Ordenar alfabéticamente
-contactos_limpios.sort(key=lambda x: x['nombre'].lower())
+    # Guardar archivos
+    with open(ruta_datos('CONTACTOS_DEFINITIVOS.json'), 'w', encoding='utf-8') as f:
+        json.dump(contactos_limpios, f, indent=2, ensure_ascii=False, default=a_json)
 
-print(f"\n📊 RESUMEN FINAL:")
-print(f"   • Total procesados: {len(contactos)}")
-print(f"   • Contactos válidos: {len(contactos_limpios)}")
-print(f"   • Con notas: {len([c for c in contactos_limpios if c['nota']])}")
+    with open(ruta_datos('MUESTRA_50_DEFINITIVOS.json'), 'w', encoding='utf-8') as f:
+        json.dump(muestra_estratificada(contactos_limpios), f, indent=2, ensure_ascii=False, default=a_json)
 
-# Guardar archivos
-with open('/workspace/CONTACTOS_DEFINITIVOS.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_limpios, f, indent=2, ensure_ascii=False)
+    print("\n✅ Archivos guardados:")
+    print(f"   • {ruta_datos('CONTACTOS_DEFINITIVOS.json')}")
+    print(f"   • {ruta_datos('MUESTRA_50_DEFINITIVOS.json')}")
 
-with open('/workspace/MUESTRA_50_DEFINITIVOS.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_limpios[:50], f, indent=2, ensure_ascii=False)
+    print("\n🎯 MUESTRA DE LOS PRIMEROS 20 CONTACTOS:")
+    print("=" * 70)
 
-print("\n✅ Archivos guardados:")
-print("   • /workspace/CONTACTOS_DEFINITIVOS.json")
-print("   • /workspace/MUESTRA_50_DEFINITIVOS.json")
+    for i, contacto in enumerate(contactos_limpios[:20], 1):
+        print(f"\n{i:2}. Nombre: {contacto['nombre']}")
+        print(f"    Tel: {contacto['telefono']}")
+        if contacto['nota']:
+            print(f"    Nota: {contacto['nota']}")
 
-print("\n🎯 MUESTRA DE LOS PRIMEROS 20 CONTACTOS:")
-print("=" * 70)
 
-for i, contacto in enumerate(contactos_limpios[:20], 1):
-    print(f"\n{i:2}. Nombre: {contacto['nombre']}")
-    print(f"    Tel: {contacto['telefono']}")
-    if contacto['nota']:
-        print(f"    Nota: {contacto['nota']}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,35 @@
 import json
 import re
 
+from capitalizacion import capitalizar_nombre, separar_camelcase, tiene_camelcase
+from contacto import Contacto, a_json, ruta_datos
+from lista_ordenada import ListaOrdenada
+from muestreo import muestra_estratificada
+from normalizacion import Lexico
+
+# Nombres válidos que SÍ empiezan con A; se comparan sin tildes
+NOMBRES_VALIDOS_CON_A = Lexico([
+    'abad', 'abel', 'abraham', 'abril', 'ada', 'adam', 'adán', 'addison',
+    'adelaida', 'adela', 'adelina', 'adolfo', 'adriana', 'adrián', 'adriano',
+    'agatha', 'agnes', 'agustín', 'agustina', 'aida', 'aiden', 'aileen',
+    'aimee', 'aisha', 'alan', 'alana', 'alba', 'albert', 'alberta', 'alberto',
+    'aldo', 'alejandra', 'alejandro', 'alejo', 'alessandra', 'alessandro',
+    'alex', 'alexa', 'alexander', 'alexandra', 'alexis', 'alfonso', 'alfred',
+    'alfredo', 'alice', 'alicia', 'alina', 'alison', 'allan', 'allen',
+    'allison', 'alma', 'alonso', 'altagracia', 'álvaro', 'alyssa',
+    'amada', 'amalia', 'amanda', 'amaya', 'amber', 'amelia', 'america',
+    'amira', 'amparo', 'amy', 'ana', 'anabel', 'anastasia', 'andrea',
+    'andrés', 'andrew', 'andy', 'ángel', 'ángela', 'angélica',
+    'angelina', 'angelo', 'angie', 'aníbal', 'anita', 'anna', 'anne',
+    'annie', 'anthony', 'antonia', 'antonio', 'antony', 'anuar', 'anyela',
+    'apollo', 'aquiles', 'arabella', 'araceli', 'aracely', 'aranza',
+    'arcadio', 'ariadna', 'ariana', 'ariel', 'ariela', 'arlene', 'arleth',
+    'armando', 'arnaldo', 'arnold', 'arnulfo', 'arquímedes', 'arsenio',
+    'artemio', 'arthur', 'arturo', 'ashley', 'astrid', 'asunción', 'atanasio',
+    'athena', 'aubrey', 'audrey', 'augusto', 'aurelia', 'aurelio', 'aurora',
+    'austin', 'ava', 'avelino', 'avery', 'axel', 'ayla', 'azucena', 'azul'
+])
+
 def limpiar_nombre_definitivo(nombre):
     """Limpia el nombre de forma definitiva"""
     
@@ -17,39 +46,10 @@ def limpiar_nombre_definitivo(nombre):
             nombre = 'A' + nombre[2:]
     
     # PASO 2: Detectar A pegada a nombres (Acesarmontoya, Acarlos, etc.)
-    # Lista de nombres válidos que SÍ empiezan con A
-    nombres_validos_con_a = {
-        'abad', 'abel', 'abraham', 'abril', 'ada', 'adam', 'adán', 'addison',
-        'adelaida', 'adela', 'adelina', 'adolfo', 'adriana', 'adrián', 'adriano',
-        'agatha', 'agnes', 'agustín', 'agustina', 'aida', 'aiden', 'aileen',
-        'aimee', 'aisha', 'alan', 'alana', 'alba', 'albert', 'alberta', 'alberto',
-        'aldo', 'alejandra', 'alejandro', 'alejo', 'alessandra', 'alessandro',
-        'alex', 'alexa', 'alexander', 'alexandra', 'alexis', 'alfonso', 'alfred',
-        'alfredo', 'alice', 'alicia', 'alina', 'alison', 'allan', 'allen',
-        'allison', 'alma', 'alonso', 'altagracia', 'alvaro', 'álvaro', 'alyssa',
-        'amada', 'amalia', 'amanda', 'amaya', 'amber', 'amelia', 'america',
-        'amira', 'amparo', 'amy', 'ana', 'anabel', 'anastasia', 'andrea',
-        'andrés', 'andrew', 'andy', 'ángel', 'angela', 'ángela', 'angélica',
-        'angelina', 'angelo', 'angie', 'aníbal', 'anita', 'anna', 'anne',
-        'annie', 'anthony', 'antonia', 'antonio', 'antony', 'anuar', 'anyela',
-        'abril', 'apollo', 'aquiles', 'arabella', 'araceli', 'aracely', 'aranza',
-        'arcadio', 'ariadna', 'ariana', 'ariel', 'ariela', 'arlene', 'arleth',
-        'armando', 'arnaldo', 'arnold', 'arnulfo', 'arquímedes', 'arsenio',
-        'artemio', 'arthur', 'arturo', 'ashley', 'astrid', 'asunción', 'atanasio',
-        'athena', 'aubrey', 'audrey', 'augusto', 'aurelia', 'aurelio', 'aurora',
-        'austin', 'ava', 'avelino', 'avery', 'axel', 'ayla', 'azucena', 'azul'
-    }
-    
     # Si empieza con A seguida de minúscula
     if len(nombre) > 2 and nombre[0] == 'A' and nombre[1].islower():
         # Verificar si es un nombre válido con A
-        nombre_lower = nombre.lower()
-        es_valido = False
-        
-        for nombre_valido in nombres_validos_con_a:
-            if nombre_lower.startswith(nombre_valido):
-                es_valido = True
-                break
+        es_valido = NOMBRES_VALIDOS_CON_A.tiene_prefijo(nombre)
         
         # Si no es válido, probablemente la A está pegada
         if not es_valido:
@@ -61,9 +61,9 @@ def limpiar_nombre_definitivo(nombre):
     
     # PASO 3: Separar nombres pegados (cesarmontoya -> Cesar Montoya)
     # Detectar CamelCase
-    if re.search(r'[a-z][A-Z]', nombre):
+    if tiene_camelcase(nombre):
         # Separar en los cambios de mayúscula
-        nombre = re.sub(r'([a-z])([A-Z])', r'\1 \2', nombre)
+        nombre = separar_camelcase(nombre)
     
     # Detectar nombres comunes pegados
     patrones_separacion = [
@@ -84,18 +84,7 @@ def limpiar_nombre_definitivo(nombre):
     
     # Capitalizar correctamente
     if nombre:
-        palabras = nombre.split()
-        palabras_capitalizadas = []
-        palabras_minusculas = ['de', 'del', 'la', 'el', 'los', 'las', 'y', 'da', 'do', 'dos']
-        
-        for i, palabra in enumerate(palabras):
-            if i == 0 or palabra.lower() not in palabras_minusculas:
-                # Capitalizar primera letra, resto en minúsculas
-                palabras_capitalizadas.append(palabra[0].upper() + palabra[1:].lower() if len(palabra) > 1 else palabra.upper())
-            else:
-                palabras_capitalizadas.append(palabra.lower())
-        
-        nombre = ' '.join(palabras_capitalizadas)
+        nombre = capitalizar_nombre(nombre)
     
     # Validación final
     if not nombre or len(nombre) < 2 or nombre.isdigit():
@@ -103,64 +92,69 @@ def limpiar_nombre_definitivo(nombre):
     
     return nombre
 
-# Cargar contactos
-print("📖 Leyendo archivo CONTACTOS_DEFINITIVOS.json...")
-with open('/workspace/CONTACTOS_DEFINITIVOS.json', 'r') as f:
-    contactos = json.load(f)
+def main():
+    """Ejecuta la etapa completa: lee, limpia y guarda los archivos"""
+    # Cargar contactos
+    print("📖 Leyendo archivo CONTACTOS_DEFINITIVOS.json...")
+    with open(ruta_datos('CONTACTOS_DEFINITIVOS.json'), 'r') as f:
+        contactos = json.load(f, object_hook=Contacto.desde_dict)
 
-print(f"📊 Total de contactos: {len(contactos)}")
+    print(f"📊 Total de contactos: {len(contactos)}")
 
-# Procesar cada contacto
-contactos_limpios = []
-cambios_realizados = []
+    # Procesar cada contacto (la entrada ya viene en orden alfabético)
+    orden = ListaOrdenada(contactos)
+    cambios_realizados = []
 
-for contacto in contactos:
-    nombre_original = contacto.get('nombre', '')
-    nombre_limpio = limpiar_nombre_definitivo(nombre_original)
-    
-    if nombre_limpio and nombre_limpio != nombre_original:
-        cambios_realizados.append({
-            'original': nombre_original,
-            'limpio': nombre_limpio
-        })
-    
-    if nombre_limpio:
-        contactos_limpios.append({
-            'nombre': nombre_limpio,
-            'telefono': contacto['telefono'],
-            'nota': contacto.get('nota')
-        })
-
-# Ordenar alfabéticamente
-contactos_limpios.sort(key=lambda x: (x['nombre'] or '').lower())
-
-print(f"\n✅ Contactos procesados: {len(contactos_limpios)}")
-print(f"🔄 Nombres corregidos: {len(cambios_realizados)}")
-
-# Guardar archivos finales
-with open('/workspace/CONTACTOS_ULTRA_LIMPIOS.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_limpios, f, indent=2, ensure_ascii=False)
-
-with open('/workspace/MUESTRA_50_ULTRA_LIMPIOS.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_limpios[:50], f, indent=2, ensure_ascii=False)
-
-print("\n📁 Archivos guardados:")
-print("   • /workspace/CONTACTOS_ULTRA_LIMPIOS.json")
-print("   • /workspace/MUESTRA_50_ULTRA_LIMPIOS.json")
-
-# Mostrar ejemplos de cambios
-print("\n🔍 EJEMPLOS DE CORRECCIONES (primeros 20):")
-print("="*80)
-for i, cambio in enumerate(cambios_realizados[:20], 1):
-    print(f"{i:2}. Antes:   \"{cambio['original']}\"")
-    print(f"    Después: \"{cambio['limpio']}\"")
-    print("-"*80)
-
-# Mostrar muestra final
-print("\n🎯 MUESTRA DE 20 CONTACTOS FINALES:")
-print("="*80)
-for i, c in enumerate(contactos_limpios[:20], 1):
-    print(f"\n{i:2}. {c['nombre']}")
-    print(f"    📱 {c['telefono']}")
-    if c.get('nota'):
-        print(f"    📝 {c['nota']}")
\ No newline at end of file
+    for contacto in contactos:
+        nombre_original = contacto.get('nombre', '')
+        nombre_limpio = limpiar_nombre_definitivo(nombre_original)
+
+        if nombre_limpio and nombre_limpio != nombre_original:
+            cambios_realizados.append({
+                'original': nombre_original,
+                'limpio': nombre_limpio
+            })
+
+        if not nombre_limpio:
+            orden.quitar(contacto)
+        elif nombre_limpio != nombre_original:
+            # Se actualiza el mismo registro (conserva las columnas de la nota)
+            orden.renombrar(contacto, nombre_limpio)
+
+    # Orden alfabético (mantenido al renombrar)
+    contactos_limpios = list(orden)
+
+    print(f"\n✅ Contactos procesados: {len(contactos_limpios)}")
+    print(f"🔄 Nombres corregidos: {len(cambios_realizados)}")
+
+    # Guardar archivos finales
+    with open(ruta_datos('CONTACTOS_ULTRA_LIMPIOS.json'), 'w', encoding='utf-8') as f:
+        json.dump(contactos_limpios, f, indent=2, ensure_ascii=False, default=a_json)
+
+    with open(ruta_datos('MUESTRA_50_ULTRA_LIMPIOS.json'), 'w', encoding='utf-8') as f:
+        json.dump(muestra_estratificada(contactos_limpios), f, indent=2, ensure_ascii=False, default=a_json)
+
+    print("\n📁 Archivos guardados:")
+    print(f"   • {ruta_datos('CONTACTOS_ULTRA_LIMPIOS.json')}")
+    print(f"   • {ruta_datos('MUESTRA_50_ULTRA_LIMPIOS.json')}")
+
+    # Mostrar ejemplos de cambios
+    print("\n🔍 EJEMPLOS DE CORRECCIONES (primeros 20):")
+    print("="*80)
+    for i, cambio in enumerate(cambios_realizados[:20], 1):
+        print(f"{i:2}. Antes:   \"{cambio['original']}\"")
+        print(f"    Después: \"{cambio['limpio']}\"")
+        print("-"*80)
+
+    # Mostrar muestra final
+    print("\n🎯 MUESTRA DE 20 CONTACTOS FINALES:")
+    print("="*80)
+    for i, c in enumerate(contactos_limpios[:20], 1):
+        print(f"\n{i:2}. {c['nombre']}")
+        print(f"    📱 {c['telefono']}")
+        if c.get('nota'):
+            print(f"    📝 {c['nota']}")
+
+
+if __name__ == "__main__":
+    main()
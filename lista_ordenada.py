@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Lista de contactos en orden alfabético mantenido de forma incremental.
+
+Cada contacto se guarda junto a su clave de orden (normalizacion.clave_orden),
+calculada una sola vez. Agregar, renombrar o quitar un contacto cuesta una
+búsqueda binaria sobre bloques de tamaño acotado, así que las etapas que solo
+corrigen algunos nombres no reordenan la lista completa. Si los contactos de
+entrada ya vienen ordenados (salida de la etapa anterior) la lista se arma
+en tiempo lineal.
+
+Uso:
+    orden = ListaOrdenada(contactos)
+    orden.renombrar(contacto, 'Andrea')
+    orden.quitar(otro)
+    json.dump(list(orden), f, ...)
+"""
+from bisect import bisect_left, insort
+from itertools import count
+
+from normalizacion import clave_orden
+
+
+class ListaOrdenada:
+    """Contactos ordenados por nombre; cada contacto puede estar una sola vez"""
+
+    def __init__(self, contactos=(), carga=1000):
+        self._carga = carga
+        self._secuencia = count()
+        self._entradas = {}  # id(contacto) -> (clave, secuencia, contacto)
+
+        # La secuencia desempata nombres iguales y conserva el orden de llegada
+        entradas = [self._nueva_entrada(c) for c in contactos]
+        if any(a > b for a, b in zip(entradas, entradas[1:])):
+            entradas.sort()
+
+        self._bloques = [entradas[i:i + carga] for i in range(0, len(entradas), carga)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(entradas)
+
+    def _nueva_entrada(self, contacto, secuencia=None):
+        if secuencia is None:
+            secuencia = next(self._secuencia)
+        entrada = (clave_orden(contacto['nombre'] or ''), secuencia, contacto)
+        self._entradas[id(contacto)] = entrada
+        return entrada
+
+    def _insertar(self, entrada):
+        self._largo += 1
+        if not self._bloques:
+            self._bloques.append([entrada])
+            self._maximos.append(entrada)
+            return
+
+        i = min(bisect_left(self._maximos, entrada), len(self._bloques) - 1)
+        bloque = self._bloques[i]
+        insort(bloque, entrada)
+        self._maximos[i] = bloque[-1]
+
+        if len(bloque) > 2 * self._carga:
+            self._bloques[i:i + 1] = [bloque[:self._carga], bloque[self._carga:]]
+            self._maximos[i:i + 1] = [bloque[self._carga - 1], bloque[-1]]
+
+    def _extraer(self, contacto):
+        entrada = self._entradas.pop(id(contacto))
+        i = bisect_left(self._maximos, entrada)
+        bloque = self._bloques[i]
+        del bloque[bisect_left(bloque, entrada)]
+
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+        self._largo -= 1
+        return entrada
+
+    def agregar(self, contacto):
+        self._insertar(self._nueva_entrada(contacto))
+
+    def quitar(self, contacto):
+        self._extraer(contacto)
+
+    def renombrar(self, contacto, nombre):
+        """Cambia el nombre del contacto y lo mueve a su nueva posición"""
+        secuencia = self._extraer(contacto)[1]
+        contacto['nombre'] = nombre
+        self._insertar(self._nueva_entrada(contacto, secuencia))
+
+    def __contains__(self, contacto):
+        return id(contacto) in self._entradas
+
+    def __len__(self):
+        return self._largo
+
+    def __iter__(self):
+        for bloque in self._bloques:
+            for entrada in bloque:
+                yield entrada[2]
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Métricas del motor de limpieza en formato de texto de Prometheus.
+
+Contadores, medidores e histogramas con etiquetas, sin dependencias. El
+motor los actualiza por contacto y por etapa; los scripts que lo usan
+pueden exponerlos en un puerto local (GET /metrics o /metricas) y
+volcarlos al terminar, así una regla que vuelve lenta la limpieza se ve en
+la corrida misma y no al final.
+
+Uso:
+    from metricas import contador, histograma, tasa
+    PROCESADOS = contador('limpieza_registros_total', 'Contactos procesados', ('resultado',))
+    PROCESADOS.inc(resultado='limpio')
+    tasa('limpieza_registros_por_segundo', 'Contactos por segundo', PROCESADOS)
+
+    exponer(9108)                        # http://127.0.0.1:9108/metrics
+    volcar_al_salir('metricas.prom')     # texto final al terminar el proceso
+"""
+import atexit
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Un solo candado para todas las métricas: las escrituras son mínimas y así
+# MetricasEtapas actualiza todas las series de un contacto con un bloqueo
+BLOQUEO = threading.Lock()
+
+# Segundos: de 10 µs (una regla simple) a 1 s (un contacto atascado)
+CUBETAS_LATENCIA = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Segundos que promedian las tasas: cubre varios scrapes de 15 s
+VENTANA_TASA = 60.0
+
+
+def _formato_valor(valor):
+    if valor == float('inf'):
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formato_etiquetas(nombres, valores, extra=()):
+    pares = list(zip(nombres, valores)) + list(extra)
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{n}="{_escapar(v)}"' for n, v in pares) + '}'
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series = {}  # valores de etiquetas -> celda mutable con el valor
+
+    def _nueva_celda(self):
+        return [0]
+
+    def _celda(self, etiquetas):
+        if set(etiquetas) != set(self.etiquetas):
+            raise ValueError(f"{self.nombre} espera las etiquetas {self.etiquetas}, no {tuple(etiquetas)}")
+        clave = tuple(str(etiquetas[e]) for e in self.etiquetas)
+        with BLOQUEO:
+            celda = self._series.get(clave)
+            if celda is None:
+                celda = self._series[clave] = self._nueva_celda()
+        return celda
+
+    def serie(self, **etiquetas):
+        """
+        La serie de esas etiquetas, para el camino caliente: valida las
+        etiquetas una sola vez y después cada actualización es directa
+        """
+        return type(self)._Serie(self, self._celda(etiquetas))
+
+    def _lineas(self):
+        return [f'{self.nombre}{_formato_etiquetas(self.etiquetas, clave)} {_formato_valor(celda[0])}'
+                for clave, celda in sorted(self._series.items())]
+
+    def texto(self):
+        lineas = [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} {self.tipo}']
+        with BLOQUEO:
+            lineas.extend(self._lineas())
+        return '\n'.join(lineas)
+
+
+class _SerieValor:
+    __slots__ = ('_celda',)
+
+    def __init__(self, metrica, celda):
+        self._celda = celda
+
+    def inc(self, valor=1):
+        with BLOQUEO:
+            self._celda[0] += valor
+
+    def dec(self, valor=1):
+        self.inc(-valor)
+
+    def valor(self):
+        return self._celda[0]
+
+
+class Contador(_Metrica):
+    """Solo sube: contactos procesados, descartes, cambios por etapa"""
+    tipo = 'counter'
+    _Serie = _SerieValor
+
+    def inc(self, valor=1, **etiquetas):
+        celda = self._celda(etiquetas)
+        with BLOQUEO:
+            celda[0] += valor
+
+    def valor(self, **etiquetas):
+        return self._celda(etiquetas)[0]
+
+    def total(self):
+        # Sin candado: se llama desde texto(), que ya lo tiene
+        return sum(celda[0] for celda in self._series.values())
+
+
+class Medidor(_Metrica):
+    """Sube y baja (contactos en proceso); o se calcula al leerlo con `funcion`"""
+    tipo = 'gauge'
+    _Serie = _SerieValor
+
+    def __init__(self, nombre, ayuda, etiquetas=(), funcion=None):
+        super().__init__(nombre, ayuda, etiquetas)
+        self._funcion = funcion
+
+    def fijar(self, valor, **etiquetas):
+        celda = self._celda(etiquetas)
+        with BLOQUEO:
+            celda[0] = valor
+
+    def inc(self, valor=1, **etiquetas):
+        celda = self._celda(etiquetas)
+        with BLOQUEO:
+            celda[0] += valor
+
+    def dec(self, valor=1, **etiquetas):
+        self.inc(-valor, **etiquetas)
+
+    def _lineas(self):
+        if self._funcion is not None:
+            return [f'{self.nombre} {_formato_valor(self._funcion())}']
+        return super()._lineas()
+
+
+class _SerieHistograma:
+    __slots__ = ('_celda', '_cubetas')
+
+    def __init__(self, metrica, celda):
+        self._celda = celda
+        self._cubetas = metrica.cubetas
+
+    def observar(self, valor):
+        i = bisect_left(self._cubetas, valor)
+        with BLOQUEO:
+            self._celda[0][i] += 1
+            self._celda[1] += valor
+
+
+class Histograma(_Metrica):
+    """Distribución de latencias: cubetas acumuladas, suma y cantidad"""
+    tipo = 'histogram'
+    _Serie = _SerieHistograma
+
+    def __init__(self, nombre, ayuda, etiquetas=(), cubetas=CUBETAS_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.cubetas = tuple(sorted(cubetas))
+
+    def _nueva_celda(self):
+        # Conteos por cubeta (sin acumular, la última es +Inf) y suma
+        return [[0] * (len(self.cubetas) + 1), 0.0]
+
+    def observar(self, valor, **etiquetas):
+        self.serie(**etiquetas).observar(valor)
+
+    def _lineas(self):
+        lineas = []
+        for clave, (conteos, suma) in sorted(self._series.items()):
+            acumulado = 0
+            for limite, conteo in zip(self.cubetas + (float('inf'),), conteos):
+                acumulado += conteo
+                etiquetas = _formato_etiquetas(self.etiquetas, clave, [('le', _formato_valor(limite))])
+                lineas.append(f'{self.nombre}_bucket{etiquetas} {acumulado}')
+            etiquetas = _formato_etiquetas(self.etiquetas, clave)
+            lineas.append(f'{self.nombre}_sum{etiquetas} {_formato_valor(suma)}')
+            lineas.append(f'{self.nombre}_count{etiquetas} {acumulado}')
+        return lineas
+
+
+class Registro:
+    """Todas las métricas del proceso; texto() es lo que se expone"""
+
+    def __init__(self):
+        self._metricas = {}
+
+    def registrar(self, metrica):
+        with BLOQUEO:
+            existente = self._metricas.get(metrica.nombre)
+            if existente is not None:
+                # Importar dos veces un módulo no debe duplicar la métrica
+                if type(existente) is not type(metrica) or existente.etiquetas != metrica.etiquetas:
+                    raise ValueError(f"La métrica {metrica.nombre} ya existe con otra definición")
+                return existente
+            self._metricas[metrica.nombre] = metrica
+            return metrica
+
+    def texto(self):
+        with BLOQUEO:
+            metricas = list(self._metricas.values())
+        return '\n'.join(m.texto() for m in metricas) + '\n'
+
+
+REGISTRO = Registro()
+INICIO = time.time()
+
+
+def contador(nombre, ayuda, etiquetas=()):
+    return REGISTRO.registrar(Contador(nombre, ayuda, etiquetas))
+
+
+def medidor(nombre, ayuda, etiquetas=(), funcion=None):
+    return REGISTRO.registrar(Medidor(nombre, ayuda, etiquetas, funcion))
+
+
+def histograma(nombre, ayuda, etiquetas=(), cubetas=CUBETAS_LATENCIA):
+    return REGISTRO.registrar(Histograma(nombre, ayuda, etiquetas, cubetas))
+
+
+class _Tasa:
+    """
+    Por segundo de un contador en una ventana deslizante. Cada lectura del
+    medidor guarda (hora, total); la tasa se mide desde la lectura más nueva
+    que tenga al menos `ventana` segundos, o desde la más vieja si todavía
+    no hay ninguna así (al principio, desde que se creó)
+    """
+
+    def __init__(self, contador, ventana):
+        self._contador = contador
+        self._ventana = ventana
+        self._lecturas = deque([(time.monotonic(), contador.total())])
+
+    def __call__(self):
+        # Sin candado: se llama desde texto(), que ya lo tiene
+        ahora, total = time.monotonic(), self._contador.total()
+        lecturas = self._lecturas
+        lecturas.append((ahora, total))
+        while len(lecturas) > 2 and lecturas[1][0] <= ahora - self._ventana:
+            lecturas.popleft()
+        desde, base = lecturas[0]
+        return (total - base) / max(ahora - desde, 1e-9)
+
+
+def tasa(nombre, ayuda, contador, ventana=VENTANA_TASA):
+    """Medidor con el ritmo de `contador` (por segundo) en los últimos `ventana` segundos"""
+    return medidor(nombre, ayuda, funcion=_Tasa(contador, ventana))
+
+
+class MetricasEtapas:
+    """
+    Resultado y latencia de cada etapa de una cadena (el motor de limpieza).
+    Publica un registro completo con un solo bloqueo y tocando las celdas
+    directamente: el motor lo llama una vez por contacto
+    """
+
+    def __init__(self, prefijo, etapas, cubetas=CUBETAS_LATENCIA):
+        self.registros = contador(
+            f'{prefijo}_registros_total', 'Registros procesados por resultado', ('resultado',))
+        self.resultados = contador(
+            f'{prefijo}_etapa_resultados_total', 'Resultado de cada etapa por registro', ('etapa', 'resultado'))
+        self.latencia = histograma(
+            f'{prefijo}_etapa_segundos', 'Latencia de cada etapa por registro', ('etapa',), cubetas)
+        self.latencia_total = histograma(
+            f'{prefijo}_registro_segundos', 'Latencia de la cadena completa por registro', (), cubetas)
+
+        self._cubetas = self.latencia.cubetas
+        # (etapa, celda intacto, celda cambiado, celda descartado, celda latencia)
+        self._etapas = tuple(
+            (etapa,
+             self.resultados._celda({'etapa': etapa, 'resultado': 'intacto'}),
+             self.resultados._celda({'etapa': etapa, 'resultado': 'cambiado'}),
+             self.resultados._celda({'etapa': etapa, 'resultado': 'descartado'}),
+             self.latencia._celda({'etapa': etapa}))
+            for etapa in etapas)
+        self._completos = self.registros._celda({'resultado': 'limpio'})
+        self._descartados = self.registros._celda({'resultado': 'descartado'})
+        self._total = self.latencia_total._celda({})
+
+    def registrar(self, tiempos, cambios, descarte, total):
+        """
+        tiempos: segundos de cada etapa que corrió, en orden; cambios: etapas
+        que cambiaron algo; descarte: etapa que descartó el registro o None
+        """
+        cubetas = self._cubetas
+        with BLOQUEO:
+            for (etapa, intacto, cambiado, descartado, latencia), segundos in zip(self._etapas, tiempos):
+                latencia[0][bisect_left(cubetas, segundos)] += 1
+                latencia[1] += segundos
+                if etapa == descarte:
+                    descartado[0] += 1
+                elif etapa in cambios:
+                    cambiado[0] += 1
+                else:
+                    intacto[0] += 1
+            (self._descartados if descarte else self._completos)[0] += 1
+            self._total[0][bisect_left(cubetas, total)] += 1
+            self._total[1] += total
+
+    def registrar_sin_etapas(self, limpios, descartados, segundos):
+        """
+        Registros resueltos de una vez, sin correr las etapas (motor por
+        columnas): `segundos` es la latencia de cada uno
+        """
+        cantidad = limpios + descartados
+        with BLOQUEO:
+            self._completos[0] += limpios
+            self._descartados[0] += descartados
+            self._total[0][bisect_left(self._cubetas, segundos)] += cantidad
+            self._total[1] += segundos * cantidad
+
+
+medidor('proceso_inicio_segundos', 'Hora de inicio del proceso (epoch)', funcion=lambda: INICIO)
+
+
+class ManejadorMetricas(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path not in ('/metrics', '/metricas'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        contenido = REGISTRO.texto().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def exponer(puerto, host='127.0.0.1'):
+    """Sirve las métricas en un hilo aparte (no bloquea la limpieza)"""
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorMetricas)
+    hilo = threading.Thread(target=servidor.serve_forever, name='metricas', daemon=True)
+    hilo.start()
+    print(f"📈 Métricas en http://{host}:{servidor.server_address[1]}/metrics", file=sys.stderr)
+    return servidor
+
+
+def volcar(ruta=None):
+    """Escribe el texto de las métricas en `ruta` (o stderr si no hay ruta)"""
+    if ruta:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(REGISTRO.texto())
+    else:
+        sys.stderr.write(REGISTRO.texto())
+
+
+def volcar_al_salir(ruta=None):
+    atexit.register(volcar, ruta)
+
+
+if __name__ == "__main__":
+    # Métricas de una corrida del motor sobre un archivo, para comparar reglas
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Métricas del motor sobre un archivo de contactos")
+    parser.add_argument('entrada')
+    parser.add_argument('--salida', default=None, help="Archivo .prom (por defecto stderr)")
+    args = parser.parse_args()
+
+    # Import diferido: el motor importa este módulo. Como script, este
+    # archivo es __main__ y tiene su propio REGISTRO; el motor registra en
+    # el del módulo metricas, que es el que hay que volcar
+    import metricas
+    from contacto import iterar_contactos
+    from motor_limpieza import limpiar
+
+    for contacto in iterar_contactos(args.entrada):
+        limpiar(contacto)
+    metricas.volcar(args.salida)
+    if args.salida:
+        print(f"✅ Métricas en {args.salida}")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Modo vigilancia del pipeline: re-ejecuta las etapas cuando cambian sus entradas.
+
+Vigila las entradas externas del pipeline (las que ninguna etapa produce:
+el volcado contactos_ultra_limpios.json, invalid.csv y result.csv de Whapi)
+en el directorio de datos. Cuando llega un archivo nuevo, espera a que pase
+la ráfaga de escrituras (nada durante --espera segundos: una copia grande o
+varios archivos seguidos disparan una sola corrida) y ejecuta solo las
+etapas afectadas, es decir, las que leen esos archivos y las que dependen
+de ellas. pipeline.ejecutar sigue saltando por hash lo que no cambió: tocar
+un archivo sin cambiar su contenido no re-ejecuta nada.
+
+En Linux usa inotify (vía ctypes, sin dependencias): el proceso duerme
+hasta que el kernel avisa que un archivo se cerró después de escribirlo o
+se movió al directorio. En otros sistemas, o si inotify no está disponible,
+revisa cada --intervalo segundos el tamaño y la fecha de modificación.
+
+Uso:
+    python3 modo_vigilancia.py --dir /ruta/datos
+    python3 modo_vigilancia.py --dir /ruta/datos --espera 5 --sondeo --intervalo 2
+    python3 modo_vigilancia.py --sin-inicial     # no ponerse al día al arrancar
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import signal
+import struct
+import sys
+import time
+
+from pipeline import ETAPAS, ejecutar
+
+ESPERA = 2.0  # segundos sin cambios antes de ejecutar
+INTERVALO = 1.0  # segundos entre revisiones en modo sondeo
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_EVENTO = struct.Struct('iIII')  # wd, mask, cookie, len (y luego el nombre)
+
+
+def entradas_externas(etapas=ETAPAS):
+    """Entradas que ninguna etapa produce: las que llegan de afuera"""
+    producidas = {salida for etapa in etapas for salida in etapa.salidas}
+    return sorted({entrada for etapa in etapas for entrada in etapa.entradas} - producidas)
+
+
+def etapas_afectadas(archivos, etapas=ETAPAS):
+    """Nombres de las etapas que leen esos archivos y de todas las que dependen de ellas"""
+    afectadas = set()
+    pendientes = set(archivos)
+    while pendientes:
+        archivo = pendientes.pop()
+        for etapa in etapas:
+            if archivo in etapa.entradas and etapa.nombre not in afectadas:
+                afectadas.add(etapa.nombre)
+                pendientes.update(etapa.salidas)
+    return [etapa.nombre for etapa in etapas if etapa.nombre in afectadas]
+
+
+class VigilanteInotify:
+    """Archivos de un directorio vigilados con inotify"""
+
+    def __init__(self, directorio, archivos):
+        nombre_libc = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(nombre_libc, use_errno=True) if nombre_libc else None
+        if libc is None or not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify no disponible")
+        self._archivos = set(archivos)
+        self._fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directorio), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch {directorio}")
+
+    def esperar(self, segundos=None):
+        """Archivos vigilados que cambiaron; vacío si pasan `segundos` sin cambios"""
+        limite = None if segundos is None else time.monotonic() + segundos
+        while True:
+            restante = None if limite is None else max(limite - time.monotonic(), 0)
+            listos, _, _ = select.select([self._fd], [], [], restante)
+            if not listos:
+                return set()
+            cambiados = self._leer()
+            if cambiados:
+                return cambiados
+
+    def _leer(self):
+        datos = os.read(self._fd, 64 * 1024)
+        cambiados = set()
+        posicion = 0
+        while posicion < len(datos):
+            _, mascara, _, largo = _EVENTO.unpack_from(datos, posicion)
+            posicion += _EVENTO.size
+            nombre = os.fsdecode(datos[posicion:posicion + largo].rstrip(b'\0'))
+            posicion += largo
+            if mascara & IN_Q_OVERFLOW:
+                # Se perdieron eventos: se supone que cambió todo
+                cambiados |= self._archivos
+            elif nombre in self._archivos:
+                cambiados.add(nombre)
+        return cambiados
+
+    def cerrar(self):
+        os.close(self._fd)
+
+
+class VigilanteSondeo:
+    """Archivos de un directorio revisados cada `intervalo` segundos (tamaño y fecha)"""
+
+    def __init__(self, directorio, archivos, intervalo=INTERVALO):
+        self._rutas = {archivo: os.path.join(directorio, archivo) for archivo in archivos}
+        self._intervalo = intervalo
+        self._firmas = self._leer_firmas()
+
+    def _leer_firmas(self):
+        firmas = {}
+        for archivo, ruta in self._rutas.items():
+            try:
+                info = os.stat(ruta)
+                firmas[archivo] = (info.st_size, info.st_mtime_ns)
+            except FileNotFoundError:
+                firmas[archivo] = None
+        return firmas
+
+    def esperar(self, segundos=None):
+        """Archivos vigilados que cambiaron; vacío si pasan `segundos` sin cambios"""
+        limite = None if segundos is None else time.monotonic() + segundos
+        while True:
+            firmas = self._leer_firmas()
+            # Un archivo que desaparece no dispara nada: falta una entrada
+            cambiados = {archivo for archivo, firma in firmas.items()
+                         if firma is not None and firma != self._firmas[archivo]}
+            self._firmas = firmas
+            if cambiados:
+                return cambiados
+            if limite is not None and time.monotonic() >= limite:
+                return set()
+            espera = self._intervalo if limite is None else min(self._intervalo, limite - time.monotonic())
+            time.sleep(max(espera, 0))
+
+    def cerrar(self):
+        pass
+
+
+def crear_vigilante(directorio, archivos, sondeo=False, intervalo=INTERVALO):
+    """inotify si se puede; si no, sondeo"""
+    if not sondeo and sys.platform.startswith('linux'):
+        try:
+            return VigilanteInotify(directorio, archivos)
+        except OSError as e:
+            print(f"⚠️  {e}; se revisan los archivos cada {intervalo:g}s")
+    return VigilanteSondeo(directorio, archivos, intervalo)
+
+
+def esperar_rafaga(vigilante, espera=ESPERA):
+    """Bloquea hasta el primer cambio y junta los que siguen hasta `espera` segundos de calma"""
+    cambiados = vigilante.esperar()
+    while True:
+        mas = vigilante.esperar(espera)
+        if not mas:
+            return cambiados
+        cambiados |= mas
+
+
+def vigilar(directorio, etapas=ETAPAS, espera=ESPERA, sondeo=False, intervalo=INTERVALO,
+            trabajadores=4, inicial=True):
+    """Ejecuta las etapas afectadas cada vez que cambian las entradas externas (hasta Ctrl+C)"""
+    directorio = os.path.abspath(directorio)
+    archivos = entradas_externas(etapas)
+    # El vigilante se crea antes de la corrida inicial: lo que llegue mientras
+    # tanto dispara la siguiente
+    vigilante = crear_vigilante(directorio, archivos, sondeo, intervalo)
+    print(f"👀 Vigilando {', '.join(archivos)} en {directorio} "
+          f"({'sondeo' if isinstance(vigilante, VigilanteSondeo) else 'inotify'})")
+    try:
+        if inicial:
+            print("\n🚀 Poniéndose al día...")
+            ejecutar(directorio, None, False, trabajadores, etapas)
+
+        while True:
+            cambiados = esperar_rafaga(vigilante, espera)
+            objetivos = etapas_afectadas(cambiados, etapas)
+            print(f"\n📥 {time.strftime('%H:%M:%S')} cambió {', '.join(sorted(cambiados))} "
+                  f"→ {', '.join(objetivos)}")
+            inicio = time.perf_counter()
+            resultados = ejecutar(directorio, objetivos, False, trabajadores, etapas)
+            ejecutadas = sum(1 for r in resultados.values() if r == 'ejecutada')
+            fallidas = [nombre for nombre, r in resultados.items() if r in ('fallida', 'bloqueada')]
+            print(f"{'❌' if fallidas else '✅'} {ejecutadas} etapas ejecutadas en "
+                  f"{time.perf_counter() - inicio:.1f}s")
+            if fallidas:
+                print(f"   Con problemas: {', '.join(fallidas)}")
+    except KeyboardInterrupt:
+        print("\n👋 Vigilancia detenida")
+    finally:
+        vigilante.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-ejecuta el pipeline cuando cambian sus entradas")
+    parser.add_argument('--dir', default=os.environ.get('CONTACTOS_DIR', '/workspace'))
+    parser.add_argument('--espera', type=float, default=ESPERA,
+                        help="Segundos sin cambios antes de ejecutar")
+    parser.add_argument('--sondeo', action='store_true', help="Revisar los archivos en vez de usar inotify")
+    parser.add_argument('--intervalo', type=float, default=INTERVALO,
+                        help="Segundos entre revisiones en modo sondeo")
+    parser.add_argument('--trabajadores', type=int, default=4)
+    parser.add_argument('--sin-inicial', action='store_true',
+                        help="No ejecutar lo desactualizado al arrancar; esperar el primer cambio")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"❌ No existe el directorio {args.dir}")
+        sys.exit(1)
+    # docker stop / systemctl stop: terminar igual que con Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    vigilar(args.dir, espera=args.espera, sondeo=args.sondeo, intervalo=args.intervalo,
+            trabajadores=args.trabajadores, inicial=not args.sin_inicial)
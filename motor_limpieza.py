@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Motor de limpieza de contactos como librería.
+
+Encadena, para un solo contacto, las mismas etapas de la cadena principal
+del pipeline (limpieza_definitiva -> limpieza_total_final ->
+limpieza_final_precisa -> eliminar_a_inicial). Las reglas compiladas y la
+tabla de correcciones se cargan una vez al importar este módulo, así que
+cada contacto cuesta solo sus reglas.
+
+La mayoría de los contactos de una corrida repetida ya están limpios. Antes
+de la cadena, ya_limpio() los reconoce con un solo regex compilado (palabras
+capitalizadas separadas por un espacio, partículas en minúscula, sin meses
+ni días sueltos) más detectar_nombres_pegados y la tabla de correcciones;
+esos contactos salen sin pasar por las etapas, con el mismo resultado.
+
+Para lotes grandes hay un segundo motor, por columnas (motor_vectorizado,
+con pandas): limpiar_detallado_lote(contactos, motor='columnas') da los
+mismos resultados que el motor por registro.
+
+Uso:
+    from motor_limpieza import limpiar, limpiar_lote
+    limpiar({'nombre': '03 04 2025erika Sotelo', 'telefono': '+57300...', 'nota': None})
+    limpiar_lote(contactos, descartar_basura=True)   # sin '?? Kk', '01 19'...
+    limpiar_lote(contactos, filtro=cargar_filtro())  # sin los números ya inválidos
+    limpiar_lote(contactos, motor='columnas')        # lotes grandes, con pandas
+"""
+import re
+import time
+from functools import lru_cache
+
+import metricas
+from capitalizacion import PARTICULAS
+from clasificador_basura import UMBRAL_BASURA, cargar_clasificador
+from contacto import Contacto
+from corregir_nombres_pegados import detectar_nombres_pegados
+from eliminar_a_inicial import eliminar_a_inicial
+from lexer_nombres import DIAS_SEMANA, MESES
+from limpieza_definitiva import limpiar_contacto_definitivo
+from limpieza_final_precisa import limpiar_nombre_preciso
+from limpieza_total_final import limpiar_contacto
+from parser_notas import parsear_nota
+
+
+def _etapa_precisa(contacto):
+    nombre = limpiar_nombre_preciso(contacto.nombre)
+    if not nombre:
+        return None
+    contacto.nombre = nombre
+    return contacto
+
+
+def _etapa_a_inicial(contacto):
+    contacto.nombre = eliminar_a_inicial(contacto.nombre)
+    return contacto
+
+
+# (nombre, función Contacto -> Contacto | None), en orden
+ETAPAS_MOTOR = (
+    ('definitiva', limpiar_contacto_definitivo),
+    ('total', limpiar_contacto),
+    ('precisa', _etapa_precisa),
+    ('a_inicial', _etapa_a_inicial),
+)
+
+
+# Forma canónica de un nombre: palabras de letras separadas por un espacio,
+# cada una con mayúscula inicial y el resto en minúscula, o una partícula en
+# minúscula después de la primera. Ninguna es un mes o un día (la limpieza
+# los quita), una partícula capitalizada ni un 'Mc...' (se capitalizan
+# distinto). Letras fuera de estas clases van por la cadena completa
+MAYUSCULAS = 'A-ZÁÉÍÓÚÜÑÀÂÃÇÊÔÕ'
+MINUSCULAS = 'a-záéíóúüñàâãçêôõ'
+_FECHAS = '|'.join(sorted(MESES | DIAS_SEMANA))
+_PARTICULAS = '|'.join(sorted(PARTICULAS))
+_PALABRA = f"(?!(?i:{_FECHAS})\\b)(?!Mc[{MINUSCULAS}]{{3}})[{MAYUSCULAS}][{MINUSCULAS}]*"
+_NOMBRE_CANONICO = re.compile(
+    f"(?=..){_PALABRA}(?: (?:(?:{_PARTICULAS})\\b|(?!(?i:{_PARTICULAS})\\b){_PALABRA}))*")
+# Lo que la limpieza de notas cambiaría: espacios de más o distintos de ' ',
+# guiones o espacios en los bordes, '- -'
+NOTA_CAMBIARIA = re.compile(r'^[\s-]|[\s-]$|[^\S ]|  |-\s*-')
+
+
+@lru_cache(maxsize=65536)
+def nombre_canonico(nombre):
+    """
+    True si ninguna etapa cambiaría el nombre. Los chequeos van del más
+    barato al más caro; ante cualquier duda el contacto va por la cadena
+    """
+    return bool(
+        _NOMBRE_CANONICO.fullmatch(nombre)
+        and not detectar_nombres_pegados(nombre)
+        and eliminar_a_inicial(nombre) == nombre  # 'Al' (detectar_nombres_pegados pide 3 letras)
+        and limpiar_nombre_preciso(nombre) == nombre  # tabla de correcciones y apellidos pegados
+    )
+
+
+def ya_limpio(contacto):
+    """True si la cadena devolvería el contacto sin cambios"""
+    nombre, nota = contacto.nombre, contacto.nota
+    return bool(nombre and (nota is None or (nota and not NOTA_CAMBIARIA.search(nota)))
+                and nombre_canonico(nombre))
+
+
+# Métricas (ver metricas.py): resultado y latencia por contacto y por etapa
+METRICAS = metricas.MetricasEtapas('limpieza', [nombre for nombre, _ in ETAPAS_MOTOR])
+metricas.tasa('limpieza_registros_por_segundo', 'Contactos por segundo en el último minuto', METRICAS.registros)
+_VIA_RAPIDA = metricas.contador(
+    'limpieza_via_rapida_total', 'Contactos que ya estaban limpios y no pasaron por las etapas')
+
+
+def limpiar_detallado(contacto, registrar=True):
+    """
+    Limpia un contacto (dict o Contacto). Con registrar=False no suma a las
+    métricas (etiquetado para entrenar, verificaciones internas)
+
+    Devuelve (Contacto | None, etapas que cambiaron algo, etapa que lo descartó)
+    """
+    if not isinstance(contacto, Contacto):
+        contacto = Contacto.desde_dict(contacto)
+
+    inicio = reloj = time.perf_counter()
+    if ya_limpio(contacto):
+        # Mismo resultado que la cadena: un Contacto nuevo con las columnas de la nota
+        limpio = Contacto(contacto.nombre, contacto['telefono'], contacto.nota, **parsear_nota(contacto.nota))
+        if registrar:
+            _VIA_RAPIDA.inc()
+            METRICAS.registrar((), (), None, time.perf_counter() - inicio)
+        return limpio, [], None
+
+    tiempos = []
+    cambios = []
+    descarte = None
+    for nombre, etapa in ETAPAS_MOTOR:
+        antes = (contacto.nombre, contacto.nota)
+        contacto = etapa(contacto)
+        ahora = time.perf_counter()
+        tiempos.append(ahora - reloj)
+        reloj = ahora
+
+        if contacto is None:
+            descarte = nombre
+            break
+        if (contacto.nombre, contacto.nota) != antes:
+            cambios.append(nombre)
+
+    if registrar:
+        METRICAS.registrar(tiempos, cambios, descarte, reloj - inicio)
+    return contacto, cambios, descarte
+
+
+def limpiar(contacto):
+    """Contacto limpio, o None si no queda un nombre válido"""
+    return limpiar_detallado(contacto)[0]
+
+
+MOTORES = ('registros', 'columnas')
+
+
+def limpiar_detallado_lote(contactos, motor='registros'):
+    """
+    limpiar_detallado para cada contacto del lote, en el mismo orden. Con
+    motor='columnas' el lote se limpia por columnas (motor_vectorizado);
+    sin pandas, o con motor='registros', contacto por contacto
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor!r} (opciones: {', '.join(MOTORES)})")
+    if motor == 'columnas':
+        from motor_vectorizado import limpiar_columnas
+        return limpiar_columnas(contactos)
+    return [limpiar_detallado(c) for c in contactos]
+
+
+def limpiar_lote(contactos, descartar_basura=False, umbral=UMBRAL_BASURA, filtro=None, motor='registros'):
+    """
+    Limpia varios contactos; conserva el orden (None para los descartados).
+    Con descartar_basura, el clasificador evalúa todo el lote de una vez y
+    los nombres basura ('?? Kk', '01 19') salen sin pasar por las reglas.
+    Con `filtro` (filtro_bloom), también salen antes los teléfonos que ya se
+    sabe que no tienen WhatsApp. `motor` como en limpiar_detallado_lote
+    """
+    if not descartar_basura and filtro is None:
+        return [limpio for limpio, _, _ in limpiar_detallado_lote(contactos, motor)]
+
+    contactos = list(contactos)
+    descartar = [False] * len(contactos)
+    if filtro is not None:
+        descartar = [filtro.contiene_telefono(c.get('telefono')) for c in contactos]
+    if descartar_basura:
+        basura = cargar_clasificador().es_basura_lote([c.get('nombre') for c in contactos], umbral)
+        descartar = [d or b for d, b in zip(descartar, basura)]
+    resultados = iter(limpiar_detallado_lote([c for c, d in zip(contactos, descartar) if not d], motor))
+    return [None if d else next(resultados)[0] for d in descartar]
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Motor de limpieza por columnas (pandas), para lotes grandes.
+
+motor_limpieza recorre las etapas contacto por contacto. Aquí un lote se
+arma como columnas y la regla principal (limpieza_definitiva: el primer
+tramo de palabras del nombre, sin meses ni días sueltos, capitalizado) se
+aplica sobre la columna entera con las operaciones de texto de pandas
+(.str): extracción del tramo, reemplazo de las fechas, title() y las
+partículas y los apellidos Mc. Lo que se calcula por valor (fechas dentro del
+nombre, la tabla de correcciones, el parseo de la nota) se hace una vez por
+valor distinto del lote, no por fila.
+
+Una fila se resuelve aquí si el nombre que queda es muy corto (descarte en
+'definitiva') o si es canónico (nombre_canonico): entonces las etapas
+siguientes solo tocan la nota (fechas del nombre que pasan a la nota,
+espacios y guiones), y eso también se hace por columnas. El resultado es
+idéntico al del motor por registro (mismo Contacto, mismas etapas
+cambiadas, misma etapa de descarte); las demás filas (nombres pegados,
+correcciones de la tabla, letras fuera de las clases conocidas, un Mc que
+ya viene con mayúscula como 'McNally', que title() no ve porque trabaja
+sobre el texto en minúscula) pasan por motor_limpieza.limpiar_detallado.
+
+Las columnas son de tipo object para que las expresiones regulares sean las
+de `re`, las mismas de las reglas (las de pyarrow son RE2: otra sintaxis y
+otras clases de caracteres). Sin pandas, todo el lote va por el motor por
+registro.
+
+Uso:
+    from motor_limpieza import limpiar_detallado_lote
+    limpiar_detallado_lote(contactos, motor='columnas')
+    python3 motor_vectorizado.py CONTACTOS_FINALES_SIN_A.json     # compara con el motor por registro
+"""
+import argparse
+import sys
+import time
+
+try:
+    import pandas as pd
+except ImportError:  # todo el lote va por el motor por registro
+    pd = None
+
+from capitalizacion import APELLIDOS_MC, PARTICULAS
+from contacto import Contacto, cargar_contactos
+from lexer_nombres import DIAS_SEMANA, MESES
+from limpieza_definitiva import extraer_info_fecha
+from motor_limpieza import MAYUSCULAS, METRICAS, MINUSCULAS, limpiar_detallado, nombre_canonico
+from parser_notas import parsear_nota
+
+TAMANO_LOTE = 50000
+
+# Primer tramo de palabras y espacios con al menos dos caracteres (lexer_nombres)
+_TRAMO = r'([^\W\d_](?:[^\W\d_]|\s)+)'
+# Letras para las que title() capitaliza igual que capitalizar_palabra
+_LETRAS = f'[{MAYUSCULAS}{MINUSCULAS}\\s]+'
+_FECHA = '(?<!\\S)(?:' + '|'.join(sorted(MESES | DIAS_SEMANA)) + ')(?!\\S)'
+_PARTICULA = '(?<= )(?:' + '|'.join(p.capitalize() for p in sorted(PARTICULAS)) + ')(?= |$)'
+_APELLIDO_MC = '(?<![^ ])Mc(' + '|'.join(a[2:] for a in sorted(APELLIDOS_MC)) + ')(?= |$)'
+# Mc con mayúscula en el original (capitalizacion lo respeta): va por registro
+_MC_ORIGINAL = f'(?<!\\S)M[cC][{MAYUSCULAS}]'
+_GUIONES = r'\s*-\s*-\s*'
+
+
+def _por_valor(columna, funcion):
+    """funcion aplicada una vez por valor distinto de la columna"""
+    codigos, valores = pd.factorize(columna, use_na_sentinel=False)
+    # factorize devuelve los None como NaN
+    resultados = pd.Series([funcion(None if pd.isna(valor) else valor) for valor in valores], dtype=object)
+    return pd.Series(resultados.to_numpy()[codigos], index=columna.index, dtype=object)
+
+
+def _con_none(columna):
+    """Lista de valores con None en lugar de NaN"""
+    return columna.where(columna.notna(), None).tolist()
+
+
+def nombres_definitivos(nombres):
+    """
+    Columna de nombres -> (nombre que deja limpieza_definitiva, filas donde
+    el cálculo por columnas vale). Sin tramo de palabras el nombre es ''; un
+    tramo con letras fuera de las clases conocidas no se calcula
+    """
+    tramos = nombres.str.extract(_TRAMO, expand=False)
+    validos = (tramos.str.fullmatch(_LETRAS).fillna(False).astype(bool)
+               & ~tramos.str.contains(_MC_ORIGINAL, regex=True).fillna(False).astype(bool))
+    palabras = tramos[validos].str.lower().str.replace(_FECHA, '', regex=True).str.split().str.join(' ')
+    limpios = (palabras.str.title()
+               .str.replace(_PARTICULA, lambda m: m.group().lower(), regex=True)
+               .str.replace(_APELLIDO_MC, lambda m: 'Mc' + m.group(1).capitalize(), regex=True))
+    return limpios.reindex(nombres.index).where(tramos.notna(), ''), validos | tramos.isna()
+
+
+def notas_limpias(notas, fechas):
+    """
+    Columnas de notas y de fechas sacadas del nombre -> (nota después de
+    limpieza_definitiva, nota después de limpieza_total); NaN donde no queda nota
+    """
+    texto = notas.fillna('')
+    agregar = pd.Series([bool(fecha) and fecha not in nota for fecha, nota in zip(fechas.fillna(''), texto)],
+                        index=notas.index, dtype=bool)
+    con_fecha = fechas.str.cat(texto, sep=' - ').where(texto != '', fechas)
+    definitiva = (texto.where(~agregar, con_fecha)
+                  .str.replace(_GUIONES, ' - ', regex=True).str.strip(' -'))
+    total = (definitiva.str.replace(r'\s+', ' ', regex=True).str.strip()
+             .str.replace(_GUIONES, ' - ', regex=True))
+    return definitiva.where(definitiva != ''), total.where(total != '')
+
+
+def limpiar_columnas(contactos):
+    """
+    Limpia un lote (dicts o Contacto); misma salida que limpiar_detallado
+    para cada contacto, en el mismo orden
+    """
+    contactos = [c if isinstance(c, Contacto) else Contacto.desde_dict(c) for c in contactos]
+    if pd is None or not contactos:
+        return [limpiar_detallado(c) for c in contactos]
+
+    inicio = time.perf_counter()
+    originales = pd.Series([c.nombre for c in contactos], dtype=object)
+    notas = pd.Series([c.nota for c in contactos], dtype=object)
+
+    nombres, calculables = nombres_definitivos(originales.fillna(''))
+    descartados = calculables & (nombres.str.len().fillna(0) < 2)
+
+    # Las etapas siguientes no cambian un nombre canónico
+    limpios = nombres[calculables & ~descartados]
+    limpios = limpios[_por_valor(limpios, nombre_canonico).astype(bool)]
+
+    # Fechas del nombre que pasan a la nota (solo puede haberlas si hay dígitos)
+    originales = originales[limpios.index]
+    fechas = pd.Series(float('nan'), index=limpios.index, dtype=object)
+    con_digitos = originales.str.contains(r'\d', na=False).astype(bool)
+    fechas[con_digitos] = _por_valor(originales[con_digitos], extraer_info_fecha)
+    notas = notas[limpios.index]
+    notas_definitiva, notas_total = notas_limpias(notas, fechas)
+    campos = _por_valor(notas_total, parsear_nota)
+
+    resultados = [None] * len(contactos)
+    for i in descartados[descartados].index:
+        resultados[i] = (None, [], 'definitiva')
+    filas = zip(limpios.index, limpios, originales, _con_none(notas), _con_none(notas_definitiva),
+                _con_none(notas_total), campos)
+    for i, nombre, nombre_original, nota, nota_definitiva, nota_total, campos_nota in filas:
+        cambios = []
+        if (nombre, nota_definitiva) != (nombre_original, nota):
+            cambios.append('definitiva')
+        if nota_total != nota_definitiva:
+            cambios.append('total')
+        limpio = Contacto(nombre, contactos[i]['telefono'], nota_total, **campos_nota)
+        resultados[i] = (limpio, cambios, None)
+
+    cantidad_descartados = int(descartados.sum())
+    if len(limpios) or cantidad_descartados:
+        # Latencia repartida: esas filas se resolvieron de una vez
+        segundos = (time.perf_counter() - inicio) / (len(limpios) + cantidad_descartados)
+        METRICAS.registrar_sin_etapas(len(limpios), cantidad_descartados, segundos)
+
+    for i, resultado in enumerate(resultados):
+        if resultado is None:
+            resultados[i] = limpiar_detallado(contactos[i])
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el motor por columnas con el motor por registro")
+    parser.add_argument('archivo')
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE)
+    args = parser.parse_args()
+
+    if pd is None:
+        print("❌ Hace falta pandas: pip install pandas")
+        sys.exit(1)
+
+    contactos = cargar_contactos(args.archivo)
+
+    inicio = time.perf_counter()
+    por_columnas = []
+    for desde in range(0, len(contactos), args.lote):
+        por_columnas.extend(limpiar_columnas(contactos[desde:desde + args.lote]))
+    segundos_columnas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    por_registro = [limpiar_detallado(c) for c in contactos]
+    segundos_registro = time.perf_counter() - inicio
+
+    def comparable(resultado):
+        limpio, cambios, descarte = resultado
+        return (limpio.a_dict() if limpio else None, cambios, descarte)
+
+    diferentes = [(c, a, b) for c, a, b in zip(contactos, por_columnas, por_registro)
+                  if comparable(a) != comparable(b)]
+    print(f"📊 {len(contactos):,} contactos")
+    print(f"   Por columnas: {segundos_columnas:.2f}s")
+    print(f"   Por registro: {segundos_registro:.2f}s (con las cachés ya llenas)")
+    if diferentes:
+        print(f"❌ {len(diferentes):,} resultados distintos:")
+        for contacto, a, b in diferentes[:10]:
+            print(f"   {contacto.nombre!r}: {comparable(a)} ≠ {comparable(b)}")
+        sys.exit(1)
+    print("✅ Resultados idénticos")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Muestras estratificadas para revisión (MUESTRA_50_*.json).
+
+Las muestras eran los primeros 50 contactos en orden alfabético, o sea casi
+solo nombres con "A". Aquí cada estrato (país, regla que cambió el contacto,
+cambiado o intacto) tiene su propio reservorio (algoritmo R) con semilla
+fija, y al final los cupos se reparten por igual entre estratos. La memoria
+depende del tamaño de la muestra y del número de estratos, no del número
+de contactos.
+
+Uso como etapa (recorre la entrada con el motor de limpieza, en streaming):
+    python3 muestreo.py
+    python3 muestreo.py contactos_ultra_limpios.json MUESTRA_50_ESTRATIFICADA.json --semilla 7
+"""
+import argparse
+import json
+import random
+from collections import Counter
+
+from contacto import a_json, iterar_contactos, ruta_datos
+from paises import pais_de_telefono
+
+TAMANO_MUESTRA = 50
+SEMILLA = 50
+
+
+class MuestraEstratificada:
+    """Un reservorio por estrato; muestra() reparte los cupos entre estratos"""
+
+    def __init__(self, tamano=TAMANO_MUESTRA, semilla=SEMILLA):
+        self.tamano = tamano
+        self.vistos = Counter()  # estrato -> elementos vistos
+        self._azar = random.Random(semilla)
+        self._reservorios = {}
+
+    def agregar(self, estrato, elemento):
+        self.vistos[estrato] += 1
+        reservorio = self._reservorios.setdefault(estrato, [])
+        if len(reservorio) < self.tamano:
+            reservorio.append(elemento)
+        else:
+            j = self._azar.randrange(self.vistos[estrato])
+            if j < self.tamano:
+                reservorio[j] = elemento
+
+    def estado(self):
+        """Estado serializable a JSON (para checkpoints): vistos, reservorios y azar"""
+        version, interno, gauss = self._azar.getstate()
+        return {
+            'tamano': self.tamano,
+            'vistos': [[estrato, n] for estrato, n in self.vistos.items()],
+            'reservorios': [[estrato, r] for estrato, r in self._reservorios.items()],
+            'azar': [version, list(interno), gauss],
+        }
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Reconstruye la muestra guardada con estado(); sigue igual que la original"""
+        muestra = cls(estado['tamano'])
+        # JSON devuelve los estratos tupla como listas
+        clave = lambda estrato: tuple(estrato) if isinstance(estrato, list) else estrato
+        muestra.vistos = Counter({clave(e): n for e, n in estado['vistos']})
+        muestra._reservorios = {clave(e): r for e, r in estado['reservorios']}
+        version, interno, gauss = estado['azar']
+        muestra._azar.setstate((version, tuple(interno), gauss))
+        return muestra
+
+    def muestra(self):
+        """Lista de (estrato, elemento): un elemento por estrato en cada ronda"""
+        estratos = sorted(self._reservorios, key=repr)
+        pendientes = {e: self._azar.sample(r, len(r)) for e, r in self._reservorios.items()}
+        elegidos = []
+        while len(elegidos) < self.tamano and estratos:
+            # Orden aleatorio por ronda: si hay más estratos que cupos, no
+            # ganan siempre los primeros en orden alfabético
+            self._azar.shuffle(estratos)
+            for estrato in estratos:
+                if len(elegidos) == self.tamano:
+                    break
+                elegidos.append((estrato, pendientes[estrato].pop()))
+            estratos = [e for e in estratos if pendientes[e]]
+        elegidos.sort(key=lambda x: repr(x[0]))
+        return elegidos
+
+
+def estrato_pais(contacto):
+    return pais_de_telefono(contacto['telefono']) or 'Sin código'
+
+
+def muestra_estratificada(contactos, estrato=estrato_pais, tamano=TAMANO_MUESTRA, semilla=SEMILLA):
+    """Muestra de contactos estratificada (por país si no se indica otro estrato)"""
+    muestra = MuestraEstratificada(tamano, semilla)
+    for contacto in contactos:
+        muestra.agregar(estrato(contacto), contacto)
+    return [contacto for _, contacto in muestra.muestra()]
+
+
+def elemento_de_limpieza(original, limpio, cambios, descarte):
+    """
+    (estrato, elemento) de un contacto ya pasado por el motor de limpieza:
+    estrato = (país, reglas que lo cambiaron, cambiado/intacto)
+    """
+    if descarte:
+        reglas = f'descartado:{descarte}'
+    else:
+        reglas = '+'.join(cambios) or 'ninguna'
+    estado = 'intacto' if reglas == 'ninguna' else 'cambiado'
+    estrato = (estrato_pais(original), reglas, estado)
+    return estrato, {
+        'estrato': {'pais': estrato[0], 'reglas': reglas, 'estado': estado},
+        'original': original,
+        'limpio': limpio,
+    }
+
+
+def muestrear_limpieza(contactos, tamano=TAMANO_MUESTRA, semilla=SEMILLA):
+    """
+    Pasa cada contacto por el motor de limpieza y muestrea por
+    (país, reglas que lo cambiaron, cambiado/intacto)
+    """
+    # Import diferido: las etapas que importa el motor usan este módulo
+    from motor_limpieza import limpiar_detallado
+
+    muestra = MuestraEstratificada(tamano, semilla)
+    for contacto in contactos:
+        original = contacto.a_dict()
+        muestra.agregar(*elemento_de_limpieza(original, *limpiar_detallado(contacto)))
+    return muestra
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Muestra estratificada de la limpieza")
+    parser.add_argument('entrada', nargs='?', default='contactos_ultra_limpios.json')
+    parser.add_argument('salida', nargs='?', default='MUESTRA_50_ESTRATIFICADA.json')
+    parser.add_argument('--tamano', type=int, default=TAMANO_MUESTRA)
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    args = parser.parse_args()
+
+    print(f"📖 Leyendo {ruta_datos(args.entrada)} en streaming...")
+    muestra = muestrear_limpieza(iterar_contactos(ruta_datos(args.entrada)),
+                                 tamano=args.tamano, semilla=args.semilla)
+    elegidos = [elemento for _, elemento in muestra.muestra()]
+
+    with open(ruta_datos(args.salida), 'w', encoding='utf-8') as f:
+        json.dump(elegidos, f, indent=2, ensure_ascii=False, default=a_json)
+
+    print(f"📊 {sum(muestra.vistos.values()):,} contactos en {len(muestra.vistos)} estratos")
+    for (pais, reglas, estado), cantidad in muestra.vistos.most_common(15):
+        print(f"   {pais:<16} {reglas:<32} {estado:<9} {cantidad:6,}")
+    print(f"\n✅ {len(elegidos)} contactos en {ruta_datos(args.salida)}")
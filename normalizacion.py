@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Clave normalizada para comparar nombres.
+
+Todas las comparaciones de nombres (léxicos, tabla de correcciones, índices)
+se hacen sobre la misma clave: NFKD, sin marcas de acento y en casefold,
+así 'Álvaro', 'alvaro' y 'ÁLVARO' son la misma entrada y los léxicos no
+necesitan repetir cada nombre con y sin tilde. La clave se calcula una vez
+por texto distinto (caché LRU acotada).
+
+Uso:
+    from normalizacion import clave_normalizada, clave_orden, Lexico
+    clave_normalizada('César')              # 'cesar'
+    sorted(nombres, key=clave_orden)        # orden alfabético en español
+    NOMBRES = Lexico(['Ana', 'Álvaro'])
+    'ALVARO' in NOMBRES                     # True
+    NOMBRES.tiene_prefijo('Anamaria')       # True
+"""
+import unicodedata
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def clave_normalizada(texto):
+    """Minúsculas sin tildes: 'César' -> 'cesar'"""
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=65536)
+def clave_orden(texto):
+    """
+    Clave de orden alfabético: sin tildes ni mayúsculas, con la ñ entre la n
+    y la o ('Álvaro' junto a 'Alvaro', no después de 'Zoe'). El texto
+    original desempata para que el orden sea total y estable
+    """
+    primaria = []
+    for c in unicodedata.normalize('NFKD', texto):
+        if not unicodedata.combining(c):
+            primaria.append(c)
+        elif c == '\u0303' and primaria and primaria[-1] in 'nN':
+            primaria.append('\x7f')  # ñ: justo después de cualquier 'n...'
+    return ''.join(primaria).casefold(), texto
+
+
+class Lexico:
+    """Conjunto inmutable de palabras comparadas por su clave normalizada"""
+
+    __slots__ = ('_claves', '_largos')
+
+    def __init__(self, palabras):
+        self._claves = frozenset(clave_normalizada(p) for p in palabras)
+        # Largos distintos, para probar prefijos sin recorrer el léxico
+        self._largos = sorted({len(c) for c in self._claves})
+
+    def __contains__(self, texto):
+        return clave_normalizada(texto) in self._claves
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __iter__(self):
+        return iter(self._claves)
+
+    def tiene_prefijo(self, texto):
+        """True si el texto empieza por alguna palabra del léxico"""
+        clave = clave_normalizada(texto)
+        for largo in self._largos:
+            if largo > len(clave):
+                break
+            if clave[:largo] in self._claves:
+                return True
+        return False
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Ordenamiento externo de contactos (libretas más grandes que la memoria).
+
+Los contactos se leen en streaming y se ordenan por corridas de tamaño fijo;
+cada corrida se escribe a un archivo temporal (JSONL) y al final se mezclan
+todas con heapq.merge. En memoria solo hay una corrida a la vez, o una línea
+por corrida durante la mezcla. Si hay demasiadas corridas se mezclan por
+grupos antes de la pasada final.
+
+Consolidar varias exportaciones (JSON, JSONL o CSV de Google/WhatsApp) en una
+sola libreta sin teléfonos repetidos y en orden alfabético:
+    python3 orden_externo.py LIBRETA.json contactos_google.csv whatsapp.json otro.jsonl
+    python3 orden_externo.py LIBRETA.json *.json --por telefono --corrida 20000
+
+Los teléfonos del filtro de números sin WhatsApp (filtro_bloom) se
+descartan al leer, antes de ordenar y deduplicar (--sin-filtro para no
+hacerlo).
+"""
+import argparse
+import csv
+import heapq
+import json
+import os
+import re
+import tempfile
+from itertools import groupby
+
+from contacto import Contacto, a_json, escribir_contactos, iterar_contactos
+from filtro_bloom import cargar_filtro
+from normalizacion import clave_orden
+
+TAMANO_CORRIDA = 50000
+MAX_CORRIDAS = 64  # archivos abiertos a la vez durante una mezcla
+
+
+def clave_nombre(contacto):
+    return clave_orden(contacto['nombre'] or '')
+
+
+def clave_telefono(contacto):
+    """Solo los dígitos: '+57 300-123' y '+57300123' son el mismo teléfono"""
+    return re.sub(r'\D', '', contacto['telefono'] or '')
+
+
+CLAVES = {'nombre': clave_nombre, 'telefono': clave_telefono}
+
+
+def _escribir_corrida(entradas, directorio):
+    descriptor, ruta = tempfile.mkstemp(prefix='corrida_', suffix='.jsonl', dir=directorio)
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        for clave, contacto in entradas:
+            f.write(json.dumps([clave, contacto], ensure_ascii=False, default=a_json))
+            f.write('\n')
+    return ruta
+
+
+def _leer_corrida(ruta):
+    """(clave, contacto) de una corrida; JSON devuelve las tuplas como listas"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            clave, datos = json.loads(linea)
+            yield (tuple(clave) if isinstance(clave, list) else clave), datos
+
+
+def _mezclar(rutas):
+    # heapq.merge es estable: a igual clave, primero la corrida anterior
+    return heapq.merge(*(_leer_corrida(r) for r in rutas), key=lambda entrada: entrada[0])
+
+
+def ordenar_externo(contactos, clave=clave_nombre, tamano_corrida=TAMANO_CORRIDA, directorio=None):
+    """
+    Ordena un iterable de contactos (dicts u objetos Contacto) sin cargarlo
+    completo. Devuelve un generador de Contacto en orden y estable
+    """
+    with tempfile.TemporaryDirectory(prefix='orden_externo_', dir=directorio) as temporal:
+        corridas = []
+        actual = []
+        for contacto in contactos:
+            actual.append((clave(contacto), contacto))
+            if len(actual) >= tamano_corrida:
+                actual.sort(key=lambda entrada: entrada[0])
+                corridas.append(_escribir_corrida(actual, temporal))
+                actual = []
+
+        if not corridas:
+            # Cabe en una sola corrida: no hace falta tocar el disco
+            actual.sort(key=lambda entrada: entrada[0])
+            for _, contacto in actual:
+                yield contacto if isinstance(contacto, Contacto) else Contacto.desde_dict(contacto)
+            return
+
+        if actual:
+            actual.sort(key=lambda entrada: entrada[0])
+            corridas.append(_escribir_corrida(actual, temporal))
+            actual = []
+
+        # Pasadas intermedias para no abrir más de MAX_CORRIDAS archivos a la
+        # vez; cada grupo conserva su posición para que el orden siga estable
+        while len(corridas) > MAX_CORRIDAS:
+            mezcladas = []
+            for i in range(0, len(corridas), MAX_CORRIDAS):
+                grupo = corridas[i:i + MAX_CORRIDAS]
+                mezcladas.append(_escribir_corrida(_mezclar(grupo), temporal))
+                for ruta in grupo:
+                    os.remove(ruta)
+            corridas = mezcladas
+
+        for _, datos in _mezclar(corridas):
+            yield Contacto.desde_dict(datos)
+
+
+def deduplicar_por_telefono(contactos):
+    """
+    Contactos ya ordenados por teléfono -> uno por teléfono. Gana el primero;
+    si le falta nombre o nota se completan con los de sus duplicados
+    """
+    for _, grupo in groupby(contactos, key=clave_telefono):
+        elegido = next(grupo)
+        for duplicado in grupo:
+            if not elegido['nombre'] and duplicado['nombre']:
+                elegido['nombre'] = duplicado['nombre']
+            if not elegido['nota'] and duplicado['nota']:
+                elegido['nota'] = duplicado['nota']
+        yield elegido
+
+
+def _columna(encabezados, candidatos, excluir=('type', 'label', 'tipo')):
+    """Primera columna cuyo encabezado contiene un candidato ('Phone 1 - Value', no 'Phone 1 - Type')"""
+    for i, encabezado in enumerate(encabezados):
+        encabezado = encabezado.lower()
+        if any(c in encabezado for c in candidatos) and not any(e in encabezado for e in excluir):
+            return i
+    return None
+
+
+def _columna_exacta(encabezados, candidatos):
+    """Primera columna cuyo encabezado es uno de los candidatos (sin mayúsculas ni espacios de más)"""
+    for i, encabezado in enumerate(encabezados):
+        if encabezado.strip().lower() in candidatos:
+            return i
+    return None
+
+
+def _columnas_nombre(encabezados):
+    """
+    (columna del nombre completo, columnas de sus partes). Google exporta
+    'Name' junto a 'Given Name' o 'First Name': buscar 'name' dentro del
+    encabezado tomaba solo el nombre de pila. Sin nombre completo se unen
+    nombre de pila, segundo nombre y apellido; sin nada de eso, la primera
+    columna que contenga 'name' o 'nombre'
+    """
+    completo = _columna_exacta(encabezados, ('name', 'nombre', 'full name', 'display name', 'nombre completo'))
+    partes = [i for i in (_columna_exacta(encabezados, ('given name', 'first name')),
+                          _columna_exacta(encabezados, ('additional name', 'middle name')),
+                          _columna_exacta(encabezados, ('family name', 'last name')))
+              if i is not None]
+    if completo is None and not partes:
+        completo = _columna(encabezados, ('name', 'nombre'))
+    return completo, partes
+
+
+def _celda(fila, columna):
+    return fila[columna].strip() if columna is not None and columna < len(fila) else ''
+
+
+def iterar_csv(ruta):
+    """Contactos de una exportación CSV (Google, WhatsApp, etc.)"""
+    with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+        lector = csv.reader(f)
+        encabezados = next(lector, [])
+        col_telefono = _columna(encabezados, ('phone', 'number', 'telefono', 'teléfono', 'celular'))
+        col_nombre, cols_partes = _columnas_nombre(encabezados)
+        col_nota = _columna(encabezados, ('note', 'nota'))
+        if col_telefono is None:
+            raise ValueError(f"{ruta}: no hay columna de teléfono en {encabezados}")
+
+        for fila in lector:
+            if len(fila) <= col_telefono or not fila[col_telefono].strip():
+                continue
+            # Google junta varios teléfonos con ' ::: '; se toma el primero
+            telefono = fila[col_telefono].split(':::')[0].strip()
+            nombre = _celda(fila, col_nombre) or ' '.join(filter(None, (_celda(fila, i) for i in cols_partes)))
+            nota = _celda(fila, col_nota)
+            yield Contacto(nombre or None, telefono, nota or None)
+
+
+def iterar_jsonl(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                yield Contacto.desde_dict(json.loads(linea))
+
+
+def iterar_exportacion(ruta):
+    """Lee una exportación según su extensión (.csv, .jsonl o lista .json)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        return iterar_csv(ruta)
+    if extension == '.jsonl':
+        return iterar_jsonl(ruta)
+    return iterar_contactos(ruta)
+
+
+def consolidar(rutas, salida, por='nombre', tamano_corrida=TAMANO_CORRIDA, directorio=None,
+               filtro=None):
+    """
+    Une varias exportaciones en una libreta sin teléfonos repetidos, ordenada
+    por `por`. Con `filtro` (filtro_bloom) se descartan primero los teléfonos
+    sin WhatsApp. Devuelve (leídos, escritos, descartados por el filtro)
+    """
+    leidos = 0
+    conocidos = 0
+
+    def todos():
+        nonlocal leidos, conocidos
+        for ruta in rutas:
+            for contacto in iterar_exportacion(ruta):
+                leidos += 1
+                if filtro is not None and filtro.contiene_telefono(contacto['telefono']):
+                    conocidos += 1
+                    continue
+                yield contacto
+
+    unicos = deduplicar_por_telefono(
+        ordenar_externo(todos(), clave_telefono, tamano_corrida, directorio))
+    if por != 'telefono':
+        unicos = ordenar_externo(unicos, CLAVES[por], tamano_corrida, directorio)
+    escritos = escribir_contactos(salida, unicos)
+    return leidos, escritos, conocidos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consolida y ordena libretas de contactos en memoria acotada")
+    parser.add_argument('salida')
+    parser.add_argument('entradas', nargs='+')
+    parser.add_argument('--por', choices=sorted(CLAVES), default='nombre')
+    parser.add_argument('--corrida', type=int, default=TAMANO_CORRIDA,
+                        help="Contactos por corrida en memoria")
+    parser.add_argument('--temporal', default=None, help="Directorio para las corridas")
+    parser.add_argument('--sin-filtro', action='store_true',
+                        help="No descartar los teléfonos que ya se sabe que no tienen WhatsApp")
+    args = parser.parse_args()
+
+    filtro = None if args.sin_filtro else cargar_filtro()
+    print(f"📖 Consolidando {len(args.entradas)} archivos (corridas de {args.corrida:,})...")
+    leidos, escritos, conocidos = consolidar(args.entradas, args.salida, args.por, args.corrida,
+                                             args.temporal, filtro)
+    print(f"📊 Leídos: {leidos:,}")
+    if conocidos:
+        print(f"🚫 Sin WhatsApp (filtro): {conocidos:,}")
+    print(f"🗑️  Teléfonos repetidos: {leidos - conocidos - escritos:,}")
+    print(f"✅ {escritos:,} contactos en {args.salida} (orden por {args.por})")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+País de un teléfono a partir de su código internacional.
+
+Tabla única de códigos (antes repetida como cadenas de if/elif en los scripts
+de validación). Se busca el prefijo más largo, así '+593' es Ecuador y no
+'+59...', y '+1' cubre todo el plan norteamericano.
+"""
+from functools import lru_cache
+
+PREFIJOS_PAIS = {
+    '1': 'USA/Canadá',
+    '34': 'España',
+    '44': 'Reino Unido',
+    '49': 'Alemania',
+    '33': 'Francia',
+    '39': 'Italia',
+    '51': 'Perú',
+    '52': 'México',
+    '53': 'Cuba',
+    '54': 'Argentina',
+    '55': 'Brasil',
+    '56': 'Chile',
+    '57': 'Colombia',
+    '58': 'Venezuela',
+    '502': 'Guatemala',
+    '503': 'El Salvador',
+    '504': 'Honduras',
+    '505': 'Nicaragua',
+    '506': 'Costa Rica',
+    '507': 'Panamá',
+    '591': 'Bolivia',
+    '593': 'Ecuador',
+    '595': 'Paraguay',
+    '598': 'Uruguay',
+}
+
+_LARGO_MAXIMO = max(len(prefijo) for prefijo in PREFIJOS_PAIS)
+
+
+@lru_cache(maxsize=1024)
+def _pais_de_digitos(digitos):
+    for largo in range(min(_LARGO_MAXIMO, len(digitos)), 0, -1):
+        pais = PREFIJOS_PAIS.get(digitos[:largo])
+        if pais:
+            return pais
+    return f'Código +{digitos[:2]}'
+
+
+def pais_de_telefono(telefono):
+    """Nombre del país ('Colombia'), 'Código +XX' si no está en la tabla, o None sin '+'"""
+    if not telefono or not telefono.startswith('+'):
+        return None
+    return _pais_de_digitos(telefono[1:1 + _LARGO_MAXIMO])
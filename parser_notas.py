@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Parser de notas de contactos.
+
+Las notas guardan datos estructurados como texto libre ("Apt 1722",
+"Reservó Apt 1722 en 2023", "1 Dic - en 2023", "3/2026"). Este módulo
+extrae esos datos a columnas tipadas para poder filtrar por apartamento o
+año sin volver a escanear cada nota con regex.
+"""
+import json
+import re
+import sys
+from functools import lru_cache
+
+# Columnas que se agregan a cada contacto durante la limpieza
+CAMPOS_NOTA = ('apartamento', 'mes', 'anio', 'reservo', 'canal')
+
+MESES_NOTA = {
+    'ene': 1, 'enero': 1, 'feb': 2, 'febrero': 2, 'mar': 3, 'marzo': 3,
+    'abr': 4, 'abril': 4, 'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6,
+    'jul': 7, 'julio': 7, 'ago': 8, 'agosto': 8, 'sep': 9, 'septiembre': 9,
+    'oct': 10, 'octubre': 10, 'nov': 11, 'noviembre': 11, 'dic': 12, 'diciembre': 12,
+}
+
+# Patrones precompilados (se compilan una sola vez al importar)
+_PATRON_APARTAMENTO = re.compile(r'\bApt\s+(\d{3,4}[A-Z]?)\b', re.IGNORECASE)
+_PATRON_RESERVO = re.compile(r'\bReserv[óo]\b', re.IGNORECASE)
+# "22/04/2025", "02/2021", "3/2026"
+_PATRON_FECHA_NUMERICA = re.compile(r'(?<![\d/])(?:\d{1,2}/)?(\d{1,2})/(\d{4})(?![\d/])')
+# "1 Dic", "14 de Febrero 2024", "5 de Marzo en 2023"
+_PATRON_FECHA_TEXTO = re.compile(
+    r'\b\d{1,2}\s+(?:de\s+)?(' + '|'.join(sorted(MESES_NOTA, key=len, reverse=True)) + r')\b'
+    r'(?:\s+(?:de\s+|en\s+)?(\d{4})\b)?',
+    re.IGNORECASE
+)
+# Año suelto ("en 2023"), sin confundirlo con un número de apartamento
+_PATRON_ANIO = re.compile(r'(?<![\w/])(?<!Apt\s)(20\d{2})(?![\w/])', re.IGNORECASE)
+_PATRON_CANAL = re.compile(r'\b(airbnb|booking|expedia)\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def _parsear(nota):
+    """Parsea una nota distinta una sola vez (las notas se repiten mucho)"""
+    apartamento = None
+    mes = None
+    anio = None
+
+    match = _PATRON_APARTAMENTO.search(nota)
+    if match:
+        apartamento = match.group(1).upper()
+
+    match = _PATRON_FECHA_NUMERICA.search(nota)
+    if match and 1 <= int(match.group(1)) <= 12:
+        mes = int(match.group(1))
+        anio = int(match.group(2))
+    else:
+        match = _PATRON_FECHA_TEXTO.search(nota)
+        if match:
+            mes = MESES_NOTA[match.group(1).lower()]
+            if match.group(2):
+                anio = int(match.group(2))
+
+    if anio is None:
+        match = _PATRON_ANIO.search(nota)
+        if match:
+            anio = int(match.group(1))
+
+    match = _PATRON_CANAL.search(nota)
+    canal = match.group(1).capitalize() if match else None
+
+    reservo = bool(_PATRON_RESERVO.search(nota))
+
+    return apartamento, mes, anio, reservo, canal
+
+
+def parsear_nota(nota):
+    """
+    Extrae los campos estructurados de una nota
+
+    Ejemplos:
+    - "Apt 1722" -> apartamento '1722'
+    - "Reservó Apt 1722 - en 2023" -> apartamento '1722', anio 2023, reservo True
+    - "1 Dic - en 2023" -> mes 12, anio 2023
+    - "3/2026" -> mes 3, anio 2026
+    """
+    if not nota:
+        return {'apartamento': None, 'mes': None, 'anio': None, 'reservo': False, 'canal': None}
+
+    return dict(zip(CAMPOS_NOTA, _parsear(nota)))
+
+
+def agregar_campos_nota(contacto):
+    """Devuelve el contacto con las columnas de la nota agregadas"""
+    return {
+        'nombre': contacto.get('nombre'),
+        'telefono': contacto['telefono'],
+        'nota': contacto.get('nota'),
+        **parsear_nota(contacto.get('nota')),
+    }
+
+
+if __name__ == "__main__":
+    # Uso: python3 parser_notas.py ENTRADA.json SALIDA.json
+    if len(sys.argv) != 3:
+        print("Uso: python3 parser_notas.py ENTRADA.json SALIDA.json")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        contactos = json.load(f)
+
+    contactos = [agregar_campos_nota(c) for c in contactos]
+
+    with open(sys.argv[2], 'w', encoding='utf-8') as f:
+        json.dump(contactos, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ {len(contactos)} contactos con campos de nota")
+    print(f"   • Con apartamento: {sum(1 for c in contactos if c['apartamento'])}")
+    print(f"   • Con año: {sum(1 for c in contactos if c['anio'])}")
+    print(f"   • Con reserva: {sum(1 for c in contactos if c['reservo'])}")
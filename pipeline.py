@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Pipeline de limpieza de contactos (estilo make).
+
+Cada etapa declara el script que la ejecuta, sus archivos de entrada y sus
+archivos de salida. El orden sale de esas dependencias, no de la memoria de
+quien lo corre. Una etapa se salta si el hash de sus entradas y de su código
+(el script y los módulos locales que importa) no cambió desde la última
+ejecución. Las ramas independientes se ejecutan en paralelo.
+
+Uso:
+    python3 pipeline.py                      # todo lo que esté desactualizado
+    python3 pipeline.py --dir /ruta/datos    # otro directorio de datos
+    python3 pipeline.py validacion_whapi     # solo esa etapa y lo que necesita
+    python3 pipeline.py --forzar             # re-ejecutar aunque no haya cambios
+    python3 pipeline.py --lista              # mostrar las etapas y su estado
+    python3 modo_vigilancia.py --dir /ruta   # re-ejecutar al llegar entradas nuevas
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from contacto import archivo_atomico
+
+DIRECTORIO_CODIGO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_ESTADO = '.pipeline_estado.json'
+DIRECTORIO_LOGS = '.pipeline_logs'
+
+Etapa = namedtuple('Etapa', ['nombre', 'script', 'entradas', 'salidas'])
+
+# La validación (procesar_resultados_whapi.py) también genera el SQL de
+# eliminación y el análisis por país. El parseo del volcado crudo no tiene
+# script en este repositorio: contactos_ultra_limpios.json es la entrada.
+ETAPAS = [
+    Etapa('limpieza_definitiva', 'limpieza_definitiva.py',
+          ['contactos_ultra_limpios.json'],
+          ['CONTACTOS_LIMPIOS_FINAL.json', 'MUESTRA_50_CONTACTOS.json']),
+    Etapa('limpieza_total', 'limpieza_total_final.py',
+          ['CONTACTOS_LIMPIOS_FINAL.json'],
+          ['CONTACTOS_DEFINITIVOS.json', 'MUESTRA_50_DEFINITIVOS.json']),
+    Etapa('correccion_precisa', 'limpieza_final_precisa.py',
+          ['CONTACTOS_DEFINITIVOS.json'],
+          ['CONTACTOS_100_LIMPIOS.json', 'MUESTRA_50_PERFECTOS.json']),
+    Etapa('quitar_a_inicial', 'eliminar_a_inicial.py',
+          ['CONTACTOS_100_LIMPIOS.json'],
+          ['CONTACTOS_FINALES_SIN_A.json', 'MUESTRA_50_SIN_A.json']),
+    Etapa('validacion_whapi', 'procesar_resultados_whapi.py',
+          ['CONTACTOS_FINALES_SIN_A.json', 'invalid.csv', 'result.csv'],
+          ['CONTACTOS_CON_WHATSAPP.json', 'MUESTRA_50_CON_WHATSAPP.json',
+           'CONTACTOS_ELIMINADOS_SIN_WHATSAPP.json', 'eliminar_contactos_sin_whatsapp.sql',
+           'sin_whatsapp.bloom']),
+    Etapa('exportacion', 'exportacion.py',
+          ['CONTACTOS_CON_WHATSAPP.json'],
+          ['CONTACTOS_CON_WHATSAPP.vcf', 'CONTACTOS_GOOGLE.csv']),
+    # Misma persona con otro número (bloques fonéticos)
+    Etapa('resolucion_entidades', 'resolucion_entidades.py',
+          ['CONTACTOS_CON_WHATSAPP.json'],
+          ['POSIBLES_DUPLICADOS.json']),
+    # Ramas alternativas (independientes de la cadena principal)
+    Etapa('nombres_pegados', 'corregir_nombres_pegados.py',
+          ['CONTACTOS_DEFINITIVOS.json'],
+          ['CONTACTOS_FINALES_CORREGIDOS.json', 'MUESTRA_50_FINALES.json']),
+    Etapa('ultra_definitiva', 'limpieza_ultra_definitiva.py',
+          ['CONTACTOS_DEFINITIVOS.json'],
+          ['CONTACTOS_ULTRA_LIMPIOS.json', 'MUESTRA_50_ULTRA_LIMPIOS.json']),
+    Etapa('nombres_minusculas', 'limpiar_nombres_final.py',
+          ['contactos_ultra_limpios.json'],
+          ['contactos_definitivos.json', 'muestra_50_definitivos.json']),
+    # Triaje persona / negocio / basura del volcado (clasificador n-gramas)
+    Etapa('triaje_basura', 'clasificador_basura.py',
+          ['contactos_ultra_limpios.json'],
+          ['CONTACTOS_BASURA.json']),
+    # Muestra estratificada de toda la cadena (país, regla, cambiado/intacto)
+    Etapa('muestreo', 'muestreo.py',
+          ['contactos_ultra_limpios.json'],
+          ['MUESTRA_50_ESTRATIFICADA.json']),
+]
+
+# Archivos de datos que forman parte del "código" de un módulo
+DATOS_DE_MODULOS = {
+    'correcciones.py': ['correcciones_nombres.json'],
+}
+
+_PATRON_IMPORT = re.compile(r'^\s*(?:from\s+(\w+)\s+import|import\s+(\w+))', re.MULTILINE)
+
+
+def hash_archivo(ruta, hasher=None):
+    """SHA-256 del contenido (leído por bloques)"""
+    hasher = hasher or hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(bloque)
+    return hasher
+
+
+def modulos_locales(script, vistos=None):
+    """El script y los módulos del repositorio que importa (recursivo)"""
+    vistos = vistos if vistos is not None else set()
+    if script in vistos:
+        return vistos
+    vistos.add(script)
+
+    with open(os.path.join(DIRECTORIO_CODIGO, script), 'r', encoding='utf-8') as f:
+        codigo = f.read()
+    for match in _PATRON_IMPORT.finditer(codigo):
+        modulo = (match.group(1) or match.group(2)) + '.py'
+        if os.path.exists(os.path.join(DIRECTORIO_CODIGO, modulo)):
+            modulos_locales(modulo, vistos)
+    return vistos
+
+
+def huella_etapa(etapa, directorio):
+    """Hash de las entradas y del código de la etapa"""
+    hasher = hashlib.sha256()
+    for modulo in sorted(modulos_locales(etapa.script)):
+        for archivo in [modulo] + DATOS_DE_MODULOS.get(modulo, []):
+            hasher.update(archivo.encode())
+            hash_archivo(os.path.join(DIRECTORIO_CODIGO, archivo), hasher)
+    for entrada in etapa.entradas:
+        hasher.update(entrada.encode())
+        hash_archivo(os.path.join(directorio, entrada), hasher)
+    return hasher.hexdigest()
+
+
+def dependencias(etapas):
+    """Etapa -> etapas que producen alguna de sus entradas"""
+    productores = {}
+    for etapa in etapas:
+        for salida in etapa.salidas:
+            productores[salida] = etapa.nombre
+    return {
+        etapa.nombre: {productores[e] for e in etapa.entradas if e in productores}
+        for etapa in etapas
+    }
+
+
+def seleccionar(etapas, objetivos):
+    """Las etapas objetivo y todas las que necesitan"""
+    if not objetivos:
+        return list(etapas)
+    deps = dependencias(etapas)
+    necesarias = set()
+    pendientes = list(objetivos)
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in necesarias:
+            necesarias.add(nombre)
+            pendientes.extend(deps[nombre])
+    return [e for e in etapas if e.nombre in necesarias]
+
+
+def cargar_estado(directorio):
+    ruta = os.path.join(directorio, ARCHIVO_ESTADO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_estado(directorio, estado):
+    """Escritura atómica del estado (dos corridas a la vez no comparten el temporal)"""
+    with archivo_atomico(os.path.join(directorio, ARCHIVO_ESTADO)) as f:
+        json.dump(estado, f, indent=2, sort_keys=True)
+
+
+def _correr_script(etapa, directorio):
+    """Ejecuta el script de la etapa con el directorio de datos configurado"""
+    entorno = dict(os.environ, CONTACTOS_DIR=directorio, PYTHONPATH=DIRECTORIO_CODIGO)
+    os.makedirs(os.path.join(directorio, DIRECTORIO_LOGS), exist_ok=True)
+    ruta_log = os.path.join(directorio, DIRECTORIO_LOGS, f'{etapa.nombre}.log')
+
+    inicio = time.perf_counter()
+    with open(ruta_log, 'w', encoding='utf-8') as log:
+        proceso = subprocess.run(
+            [sys.executable, os.path.join(DIRECTORIO_CODIGO, etapa.script)],
+            cwd=directorio, env=entorno, stdout=log, stderr=subprocess.STDOUT
+        )
+    return proceso.returncode, time.perf_counter() - inicio, ruta_log
+
+
+def ejecutar(directorio, objetivos=None, forzar=False, trabajadores=4, etapas=ETAPAS):
+    """
+    Ejecuta las etapas desactualizadas respetando dependencias
+
+    Devuelve {etapa: 'ejecutada' | 'al_dia' | 'fallida' | 'bloqueada'}
+    """
+    directorio = os.path.abspath(directorio)
+    seleccion = seleccionar(etapas, objetivos)
+    deps = dependencias(seleccion)
+    estado = cargar_estado(directorio)
+    resultados = {}
+    en_curso = {}  # futuro -> (etapa, huella)
+
+    def lista(etapa):
+        ocupadas = {nombre for nombre, _ in en_curso.values()}
+        return etapa.nombre not in resultados and etapa.nombre not in ocupadas \
+            and all(d in resultados for d in deps[etapa.nombre])
+
+    with ThreadPoolExecutor(max_workers=trabajadores) as ejecutor:
+        while len(resultados) < len(seleccion):
+            for etapa in seleccion:
+                if not lista(etapa):
+                    continue
+
+                if any(resultados[d] in ('fallida', 'bloqueada') for d in deps[etapa.nombre]):
+                    resultados[etapa.nombre] = 'bloqueada'
+                    print(f"⛔ {etapa.nombre}: bloqueada por una etapa anterior")
+                    continue
+
+                faltantes = [e for e in etapa.entradas
+                             if not os.path.exists(os.path.join(directorio, e))]
+                if faltantes:
+                    resultados[etapa.nombre] = 'fallida'
+                    print(f"❌ {etapa.nombre}: faltan entradas {', '.join(faltantes)}")
+                    continue
+
+                huella = huella_etapa(etapa, directorio)
+                salidas_ok = all(os.path.exists(os.path.join(directorio, s)) for s in etapa.salidas)
+                if not forzar and salidas_ok and estado.get(etapa.nombre) == huella:
+                    resultados[etapa.nombre] = 'al_dia'
+                    print(f"⏭️  {etapa.nombre}: sin cambios")
+                    continue
+
+                print(f"🔄 {etapa.nombre}: ejecutando {etapa.script}...")
+                futuro = ejecutor.submit(_correr_script, etapa, directorio)
+                en_curso[futuro] = (etapa.nombre, huella)
+
+            if not en_curso:
+                continue
+
+            terminados, _ = wait(list(en_curso), return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                nombre, huella = en_curso.pop(futuro)
+                codigo, duracion, ruta_log = futuro.result()
+                if codigo == 0:
+                    resultados[nombre] = 'ejecutada'
+                    estado[nombre] = huella
+                    guardar_estado(directorio, estado)
+                    print(f"✅ {nombre}: {duracion:.1f}s")
+                else:
+                    resultados[nombre] = 'fallida'
+                    estado.pop(nombre, None)
+                    guardar_estado(directorio, estado)
+                    print(f"❌ {nombre}: falló (código {codigo}), ver {ruta_log}")
+
+    return {e.nombre: resultados[e.nombre] for e in seleccion}
+
+
+def mostrar_etapas(directorio, etapas=ETAPAS):
+    directorio = os.path.abspath(directorio)
+    estado = cargar_estado(directorio)
+    deps = dependencias(etapas)
+    for etapa in etapas:
+        try:
+            al_dia = estado.get(etapa.nombre) == huella_etapa(etapa, directorio)
+        except FileNotFoundError:
+            al_dia = False
+        marca = '✅' if al_dia else '🔄'
+        previas = ', '.join(sorted(deps[etapa.nombre])) or '-'
+        print(f"{marca} {etapa.nombre:<20} {etapa.script:<32} depende de: {previas}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline incremental de limpieza de contactos")
+    parser.add_argument('objetivos', nargs='*', help="Etapas a ejecutar (por defecto todas)")
+    parser.add_argument('--dir', default=os.environ.get('CONTACTOS_DIR', '/workspace'))
+    parser.add_argument('--forzar', action='store_true')
+    parser.add_argument('--trabajadores', type=int, default=4)
+    parser.add_argument('--lista', action='store_true')
+    args = parser.parse_args()
+
+    nombres = {e.nombre for e in ETAPAS}
+    desconocidas = [o for o in args.objetivos if o not in nombres]
+    if desconocidas:
+        print(f"❌ Etapas desconocidas: {', '.join(desconocidas)}")
+        print(f"   Disponibles: {', '.join(e.nombre for e in ETAPAS)}")
+        sys.exit(1)
+
+    if args.lista:
+        mostrar_etapas(args.dir)
+        sys.exit(0)
+
+    print(f"🚀 PIPELINE DE CONTACTOS ({os.path.abspath(args.dir)})")
+    print("=" * 80)
+    resultados = ejecutar(args.dir, args.objetivos, args.forzar, args.trabajadores)
+
+    print("\n📊 RESUMEN:")
+    for nombre, resultado in resultados.items():
+        print(f"   {nombre:<20} {resultado}")
+
+    sys.exit(0 if all(r in ('ejecutada', 'al_dia') for r in resultados.values()) else 1)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Planes de numeración por país: qué números vale la pena validar en Whapi.
+
+telefonos_para_validar_whapi.txt lleva números que no pueden tener WhatsApp:
+fijos colombianos ('6056943337', sin el 57), números con dígitos de más o
+de menos ('5813070235': en Venezuela son 10 dígitos después del 58). Se
+mandan a validar y vuelven en invalid.csv. Aquí cada número se clasifica
+contra el plan de su país antes de mandarlo:
+
+- movil:       rango de celulares del país ('+57 3xx', 10 dígitos)
+- fijo:        rango de fijos ('+57 60x'); se rechaza
+- posible:     largo válido, pero el plan no separa fijos de celulares
+               (+1, México con 10 dígitos); se valida
+- imposible:   código de país conocido y ningún rango con ese largo; se rechaza
+- desconocido: país que no está en PLANES; se valida
+
+Los planes se convierten una vez en intervalos de enteros [inicio, fin),
+ordenados y sin solaparse: un prefijo de n dígitos con un largo total L es
+el intervalo [prefijo * 10**(L-n), (prefijo + 1) * 10**(L-n)). Como los
+números de distinto largo caen en rangos de enteros distintos, una sola
+búsqueda binaria (searchsorted sobre el lote con NumPy, bisect sin él)
+clasifica cada número, cualquiera sea su país y su largo.
+
+Uso:
+    python3 planes_numeracion.py telefonos_para_validar_whapi.txt          # solo el resumen
+    python3 planes_numeracion.py telefonos_para_validar_whapi.txt A_VALIDAR.txt \\
+        --rechazados RECHAZADOS.csv
+"""
+import argparse
+import time
+from bisect import bisect_right
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # se clasifica número a número con bisect
+    np = None
+
+from carga_telefonos import MAX_DIGITOS, cargar_telefonos
+
+MOVIL = 'movil'
+FIJO = 'fijo'
+POSIBLE = 'posible'
+IMPOSIBLE = 'imposible'
+DESCONOCIDO = 'desconocido'
+TIPOS = (MOVIL, FIJO, POSIBLE, IMPOSIBLE, DESCONOCIDO)
+RECHAZADOS = (FIJO, IMPOSIBLE)
+
+MAX_E164 = 15  # dígitos, con el código de país
+
+# Brasil: 2 dígitos de área (sin 0); los celulares tienen un 9 delante
+_AREAS_BRASIL = [area for area in range(11, 100) if area % 10]
+
+# código -> (país, [(prefijos del número nacional 'desde-hasta', largos nacionales, tipo)])
+PLANES = {
+    '1': ('USA/Canadá', [('2-9', (10,), POSIBLE)]),
+    '33': ('Francia', [('6-7', (9,), MOVIL), ('1-5', (9,), FIJO), ('9', (9,), POSIBLE)]),
+    '34': ('España', [('6-7', (9,), MOVIL), ('8-9', (9,), FIJO)]),
+    '39': ('Italia', [('3', (9, 10), MOVIL), ('0', tuple(range(6, 12)), FIJO)]),
+    '44': ('Reino Unido', [('7', (10,), MOVIL), ('1-2', (9, 10), FIJO), ('3', (10,), POSIBLE)]),
+    '49': ('Alemania', [('15-17', (10, 11), MOVIL), ('2-9', tuple(range(6, 12)), FIJO)]),
+    '51': ('Perú', [('9', (9,), MOVIL), ('1-8', (8,), FIJO)]),
+    '52': ('México', [('1', (11,), MOVIL), ('2-9', (10,), POSIBLE)]),
+    '53': ('Cuba', [('5', (8,), MOVIL), ('2-4', (6, 7, 8), FIJO), ('7', (7, 8), FIJO)]),
+    # Whapi también reconoce los celulares sin el 9 o con el 15 local
+    '54': ('Argentina', [('9', (11,), MOVIL), ('9', (12, 13), POSIBLE), ('1-3', (10, 11, 12), POSIBLE)]),
+    '55': ('Brasil', [(f'{area}9', (11,), MOVIL) for area in _AREAS_BRASIL]
+                     + [(f'{area}2-{area}5', (10,), FIJO) for area in _AREAS_BRASIL]
+                     # Celulares guardados sin el 9 (antes de 2016)
+                     + [(f'{area}6-{area}9', (10,), POSIBLE) for area in _AREAS_BRASIL]),
+    '56': ('Chile', [('9', (9,), MOVIL), ('2-8', (9,), FIJO)]),
+    '57': ('Colombia', [('3', (10,), MOVIL), ('601-608', (10,), FIJO)]),
+    # Whapi quita el 0 de larga distancia ('58 0414...')
+    '58': ('Venezuela', [('4', (10,), MOVIL), ('04', (11,), POSIBLE), ('2', (10,), FIJO)]),
+    '502': ('Guatemala', [('3-5', (8,), MOVIL), ('2', (8,), FIJO), ('6-7', (8,), FIJO)]),
+    '503': ('El Salvador', [('6-7', (8,), MOVIL), ('2', (8,), FIJO)]),
+    '504': ('Honduras', [('3', (8,), MOVIL), ('7-9', (8,), MOVIL), ('2', (8,), FIJO)]),
+    '505': ('Nicaragua', [('5', (8,), MOVIL), ('7-8', (8,), MOVIL), ('2', (8,), FIJO)]),
+    '506': ('Costa Rica', [('5-8', (8,), MOVIL), ('2', (8,), FIJO), ('4', (8,), FIJO)]),
+    '507': ('Panamá', [('6', (8,), MOVIL), ('2-5', (7,), FIJO), ('7-9', (7,), FIJO)]),
+    '591': ('Bolivia', [('6-7', (8,), MOVIL), ('2-4', (8,), FIJO)]),
+    '593': ('Ecuador', [('9', (9,), MOVIL), ('2-7', (8,), FIJO)]),
+    '595': ('Paraguay', [('9', (9,), MOVIL), ('2-8', (7, 8, 9), FIJO)]),
+    '598': ('Uruguay', [('9', (8,), MOVIL), ('2', (8,), FIJO), ('4', (8,), FIJO)]),
+}
+
+# Fijos colombianos escritos sin el 57 ('6056943337'). Los de Bogotá (601)
+# coinciden con celulares de Malasia (+60 1x) y los celulares sin el 57
+# ('3001234567') con otros países (+39 con 8 dígitos): esos se validan
+SIN_INDICATIVO = [('601', (10,), POSIBLE), ('602-608', (10,), FIJO)]
+
+Rango = namedtuple('Rango', ['inicio', 'fin', 'tipo', 'pais'])
+
+
+def _rangos(codigo, pais, prefijos):
+    """Intervalos de enteros de un plan"""
+    for texto, largos, tipo in prefijos:
+        desde, _, hasta = texto.partition('-')
+        hasta = hasta or desde
+        if len(desde) != len(hasta):
+            raise ValueError(f"{pais}: prefijo {texto!r} con extremos de distinto largo")
+        for largo in largos:
+            resto = largo - len(desde)
+            escala = 10 ** resto
+            yield Rango(int(codigo + desde) * escala, (int(codigo + hasta) + 1) * escala, tipo, pais)
+
+
+def _ordenados(rangos, que):
+    rangos = sorted(rangos)
+    for anterior, siguiente in zip(rangos, rangos[1:]):
+        if siguiente.inicio < anterior.fin:
+            raise ValueError(f"{que} se solapan: {anterior} y {siguiente}")
+    return rangos
+
+
+class PlanesNumeracion:
+    """Tabla de intervalos de los planes, para clasificar números enteros (573001234567)"""
+
+    def __init__(self, planes=PLANES, sin_indicativo=SIN_INDICATIVO):
+        rangos = [rango for codigo, (pais, prefijos) in planes.items()
+                  for rango in _rangos(codigo, pais, prefijos)]
+        rangos += _rangos('', 'Colombia (sin indicativo)', sin_indicativo)
+        self._rangos = _ordenados(rangos, "Rangos de los planes")
+
+        # Todo lo que empieza con un código conocido, de cualquier largo: lo
+        # que cae aquí y no en un rango del plan es imposible
+        paises = [Rango(int(codigo) * 10 ** resto, (int(codigo) + 1) * 10 ** resto, IMPOSIBLE, pais)
+                  for codigo, (pais, _) in planes.items()
+                  for resto in range(1, MAX_DIGITOS - len(codigo) + 1)]
+        self._paises = _ordenados(paises, "Códigos de país")
+
+        self._inicios = [r.inicio for r in self._rangos]
+        self._inicios_paises = [r.inicio for r in self._paises]
+        if np is not None:
+            self._arreglos = (np.array(self._inicios, dtype=np.int64),
+                              np.array([r.fin for r in self._rangos], dtype=np.int64),
+                              np.array([TIPOS.index(r.tipo) for r in self._rangos], dtype=np.int8),
+                              np.array(self._inicios_paises, dtype=np.int64),
+                              np.array([r.fin for r in self._paises], dtype=np.int64))
+
+    def __len__(self):
+        return len(self._rangos)
+
+    @staticmethod
+    def _buscar(rangos, inicios, numero):
+        i = bisect_right(inicios, numero) - 1
+        return rangos[i] if i >= 0 and numero < rangos[i].fin else None
+
+    def rango(self, numero):
+        """El Rango del plan (o del código de país, con tipo imposible) donde cae el número; None si no hay"""
+        if numero is None or numero >= 10 ** MAX_E164:
+            return None
+        return (self._buscar(self._rangos, self._inicios, numero)
+                or self._buscar(self._paises, self._inicios_paises, numero))
+
+    def clasificar(self, numero):
+        """Tipo de un número: movil, fijo, posible, imposible o desconocido"""
+        if numero is not None and numero >= 10 ** MAX_E164:
+            return IMPOSIBLE
+        rango = self.rango(numero)
+        return rango.tipo if rango else DESCONOCIDO
+
+    def clasificar_lote(self, numeros):
+        """
+        Códigos de tipo (índices en TIPOS) de un lote de enteros: ndarray int8
+        con NumPy (dos searchsorted para todo el lote), lista sin él
+        """
+        if np is None:
+            return [TIPOS.index(self.clasificar(n)) for n in numeros]
+        inicios, fines, tipos, inicios_paises, fines_paises = self._arreglos
+        numeros = np.asarray(numeros, dtype=np.int64)
+        codigos = np.full(len(numeros), TIPOS.index(DESCONOCIDO), dtype=np.int8)
+
+        i = np.searchsorted(inicios, numeros, side='right') - 1
+        en_plan = (i >= 0) & (numeros < fines[np.maximum(i, 0)])
+        codigos[en_plan] = tipos[i[en_plan]]
+
+        j = np.searchsorted(inicios_paises, numeros, side='right') - 1
+        en_pais = ~en_plan & (j >= 0) & (numeros < fines_paises[np.maximum(j, 0)])
+        codigos[en_pais | (numeros >= 10 ** MAX_E164)] = TIPOS.index(IMPOSIBLE)
+        return codigos
+
+
+@lru_cache(maxsize=1)
+def cargar_planes():
+    """Los planes de PLANES, construidos una sola vez por proceso"""
+    return PlanesNumeracion()
+
+
+def separar_para_validar(numeros, planes=None):
+    """
+    (números a validar, [(número, tipo) rechazados], Counter por tipo),
+    en el orden de entrada. Se rechazan los fijos y los imposibles
+    """
+    planes = planes or cargar_planes()
+    codigos = planes.clasificar_lote(numeros)
+    rechazar = {TIPOS.index(tipo) for tipo in RECHAZADOS}
+    a_validar, rechazados = [], []
+    conteo = Counter()
+    for numero, codigo in zip(numeros, codigos):
+        numero, codigo = int(numero), int(codigo)
+        conteo[TIPOS[codigo]] += 1
+        if codigo in rechazar:
+            rechazados.append((numero, TIPOS[codigo]))
+        else:
+            a_validar.append(numero)
+    return a_validar, rechazados, conteo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Saca de un lote de validación los fijos y los números imposibles")
+    parser.add_argument('entrada', help="Un número por línea (telefonos_para_validar_whapi.txt)")
+    parser.add_argument('salida', nargs='?', default=None, help="Números que sí vale la pena validar")
+    parser.add_argument('--rechazados', default=None, help="CSV numero,tipo con los rechazados")
+    args = parser.parse_args()
+
+    numeros = cargar_telefonos(args.entrada)
+    inicio = time.perf_counter()
+    planes = cargar_planes()
+    a_validar, rechazados, conteo = separar_para_validar(numeros, planes)
+    segundos = time.perf_counter() - inicio
+
+    print(f"📞 {len(numeros):,} números en {args.entrada}, clasificados en {segundos:.3f}s "
+          f"({len(planes):,} rangos, {'NumPy' if np is not None else 'sin NumPy'})")
+    for tipo in TIPOS:
+        marca = "❌" if tipo in RECHAZADOS else "✅"
+        print(f"   {marca} {tipo:<12} {conteo[tipo]:,}")
+    if len(numeros):
+        print(f"📉 Lote de validación: {len(numeros):,} → {len(a_validar):,} "
+              f"({len(rechazados) / len(numeros):.1%} menos)")
+
+    if rechazados:
+        print("\n🔍 EJEMPLOS DE RECHAZADOS:")
+        for numero, tipo in rechazados[:10]:
+            rango = planes.rango(numero)
+            print(f"   {numero:<16} {tipo:<10} {rango.pais if rango else ''}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.writelines(f"{numero}\n" for numero in a_validar)
+        print(f"\n✅ {args.salida}")
+    if args.rechazados:
+        with open(args.rechazados, 'w', encoding='utf-8') as f:
+            f.write("numero,tipo\n")
+            f.writelines(f"{numero},{tipo}\n" for numero, tipo in rechazados)
+        print(f"✅ {args.rechazados}")
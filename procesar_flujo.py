@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Limpieza en streaming de libretas grandes, con checkpoints.
+
+Lee la libreta (lista JSON) un contacto a la vez, la pasa por el motor de
+limpieza y escribe el resultado a medida que avanza, en el mismo formato
+que guardar_contactos. Cada cierto número de contactos guarda un
+checkpoint: byte de la entrada donde va, bytes ya escritos de la salida,
+contadores por etapa y el estado de la muestra estratificada (reservorios
+y generador aleatorio). Primero se sincroniza la salida parcial al disco y
+después se reemplaza el checkpoint de forma atómica, así el checkpoint
+nunca apunta a datos que no llegaron al disco.
+
+Si el proceso muere (memoria, reinicio del contenedor), --reanudar recorta
+la salida parcial al último checkpoint y sigue desde ese byte de la
+entrada; el resultado es idéntico byte a byte al de una corrida sin
+interrupciones. No se reanuda si cambió la entrada, el filtro de números
+sin WhatsApp o el modelo de basura (tamaño y fecha de cada archivo).
+
+Los teléfonos del filtro de números sin WhatsApp (filtro_bloom) se
+descartan antes que nada, salvo con --sin-filtro.
+
+Con --motor columnas cada lote se limpia por columnas (motor_vectorizado,
+con pandas); la salida es la misma que con el motor por registro.
+
+Archivos mientras corre: SALIDA.parcial y SALIDA.checkpoint (se borran al
+terminar).
+
+Uso:
+    python3 procesar_flujo.py LIBRETA.json LIBRETA_LIMPIA.json
+    python3 procesar_flujo.py LIBRETA.json LIBRETA_LIMPIA.json --reanudar
+    python3 procesar_flujo.py LIBRETA.json LIBRETA_LIMPIA.json --checkpoint-cada 20000 \\
+        --muestra MUESTRA_50_LIBRETA.json --descartar-basura
+    python3 procesar_flujo.py LIBRETA.json LIBRETA_LIMPIA.json --metricas-puerto 9108 \\
+        --metricas-archivo limpieza.prom     # contactos/s y latencias mientras corre
+    python3 procesar_flujo.py LIBRETA.json LIBRETA_LIMPIA.json --motor columnas --lote 50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+import metricas
+from clasificador_basura import RUTA_MODELO, cargar_clasificador
+from contacto import a_json, archivo_atomico, iterar_contactos
+from filtro_bloom import cargar_filtro, ruta_filtro
+from motor_limpieza import MOTORES, limpiar_detallado_lote
+from muestreo import MuestraEstratificada, elemento_de_limpieza
+
+CHECKPOINT_CADA = 50000
+TAMANO_LOTE = 1000  # contactos por lote del clasificador de basura y del motor
+VERSION_CHECKPOINT = 2
+
+
+def firma_entrada(ruta):
+    """Identifica un archivo que lee la corrida: si cambia, el checkpoint no sirve"""
+    info = os.stat(ruta)
+    return {'ruta': os.path.abspath(ruta), 'tamano': info.st_size, 'modificado': info.st_mtime_ns}
+
+
+def escribir_atomico(ruta, datos):
+    """JSON sincronizado al disco que reemplaza a `ruta`: o queda el viejo o el nuevo"""
+    with archivo_atomico(ruta, sincronizar=True) as f:
+        json.dump(datos, f, ensure_ascii=False, default=a_json)
+
+
+class EscritorContactos:
+    """
+    Escribe una lista JSON de contactos de a uno (mismo formato byte a byte
+    que guardar_contactos) sobre un archivo que se puede recortar y retomar
+    """
+
+    def __init__(self, ruta, escritos=0, bytes_escritos=0):
+        self.escritos = escritos
+        if escritos:
+            self._f = open(ruta, 'r+b')
+            self._f.truncate(bytes_escritos)
+            self._f.seek(bytes_escritos)
+        else:
+            self._f = open(ruta, 'wb')
+
+    def agregar(self, contacto):
+        texto = json.dumps(contacto, indent=2, ensure_ascii=False, default=a_json)
+        self._f.write((',\n  ' if self.escritos else '[\n  ').encode('utf-8'))
+        self._f.write(texto.replace('\n', '\n  ').encode('utf-8'))
+        self.escritos += 1
+
+    def sincronizar(self):
+        """Baja lo escrito al disco; devuelve los bytes escritos hasta aquí"""
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def cerrar(self):
+        self._f.write(b'\n]' if self.escritos else b'[]')
+        self.sincronizar()
+        self._f.close()
+
+
+def _estado_inicial(entrada, opciones, semilla_muestra):
+    return {
+        'version': VERSION_CHECKPOINT,
+        'entrada': firma_entrada(entrada),
+        'opciones': opciones,
+        'posicion_entrada': 0,
+        'leidos': 0,
+        'escritos': 0,
+        'bytes_salida': 0,
+        'descartes': {},
+        'cambios': {},
+        'muestra': MuestraEstratificada(semilla=semilla_muestra).estado() if opciones['muestra'] else None,
+    }
+
+
+def cargar_checkpoint(ruta_checkpoint, entrada, opciones):
+    """Estado guardado, validado contra la entrada y las opciones de esta corrida"""
+    with open(ruta_checkpoint, 'r', encoding='utf-8') as f:
+        estado = json.load(f)
+    if estado.get('version') != VERSION_CHECKPOINT:
+        raise ValueError(f"{ruta_checkpoint}: versión de checkpoint desconocida")
+    if estado['entrada'] != firma_entrada(entrada):
+        raise ValueError(f"{entrada} cambió desde el checkpoint; no se puede reanudar")
+    distintas = [clave for clave in opciones if estado['opciones'].get(clave) != opciones[clave]]
+    if distintas:
+        raise ValueError(f"El checkpoint se hizo con otras opciones o archivos: {', '.join(distintas)}")
+    return estado
+
+
+def procesar(entrada, salida, checkpoint_cada=CHECKPOINT_CADA, reanudar=False,
+             descartar_basura=False, ruta_muestra=None, semilla_muestra=50, usar_filtro=True,
+             motor='registros', tamano_lote=TAMANO_LOTE):
+    """
+    Limpia `entrada` hacia `salida` con checkpoints. Devuelve el estado final
+    (leídos, escritos, descartes y cambios por etapa)
+    """
+    ruta_parcial = salida + '.parcial'
+    ruta_checkpoint = salida + '.checkpoint'
+    filtro = cargar_filtro() if usar_filtro else None
+    # Antes de tomar la firma del modelo: cargar_clasificador lo reentrena si está viejo
+    clasificador = cargar_clasificador() if descartar_basura else None
+    opciones = {'descartar_basura': descartar_basura, 'muestra': ruta_muestra is not None,
+                'filtro_sin_whatsapp': firma_entrada(ruta_filtro()) if filtro is not None else None,
+                'modelo_basura': firma_entrada(RUTA_MODELO) if clasificador is not None else None}
+
+    if reanudar and os.path.exists(ruta_checkpoint) and os.path.exists(ruta_parcial):
+        estado = cargar_checkpoint(ruta_checkpoint, entrada, opciones)
+        print(f"♻️  Reanudando en el contacto {estado['leidos']:,} "
+              f"(byte {estado['posicion_entrada']:,} de la entrada)")
+    else:
+        if reanudar:
+            print("⚠️  No hay checkpoint para reanudar; se empieza desde el principio")
+        estado = _estado_inicial(entrada, opciones, semilla_muestra)
+
+    escritor = EscritorContactos(ruta_parcial, estado['escritos'], estado['bytes_salida'])
+    muestra = MuestraEstratificada.desde_estado(estado['muestra']) if estado['muestra'] else None
+    descartes = Counter(estado['descartes'])
+    cambios = Counter(estado['cambios'])
+
+    def guardar_checkpoint():
+        estado['escritos'] = escritor.escritos
+        estado['bytes_salida'] = escritor.sincronizar()
+        estado['descartes'] = dict(descartes)
+        estado['cambios'] = dict(cambios)
+        estado['muestra'] = muestra.estado() if muestra else None
+        escribir_atomico(ruta_checkpoint, estado)
+
+    lector = iterar_contactos(entrada, desde=estado['posicion_entrada'], con_posicion=True)
+    ultimo_checkpoint = estado['leidos']
+    inicio = time.time()
+
+    while True:
+        lote = list(islice(lector, tamano_lote))
+        if not lote:
+            break
+
+        contactos = [contacto for contacto, _ in lote]
+        if clasificador:
+            basura = clasificador.es_basura_lote([c['nombre'] for c in contactos])
+        else:
+            basura = [False] * len(contactos)
+
+        previos = []
+        for contacto, es_basura in zip(contactos, basura):
+            if filtro is not None and filtro.contiene_telefono(contacto['telefono']):
+                previos.append((None, [], 'sin_whatsapp'))
+            elif es_basura:
+                previos.append((None, [], 'basura'))
+            else:
+                previos.append(None)
+        originales = [contacto.a_dict() for contacto in contactos] if muestra else [None] * len(contactos)
+        limpiados = iter(limpiar_detallado_lote(
+            [contacto for contacto, previo in zip(contactos, previos) if previo is None], motor))
+
+        for original, previo in zip(originales, previos):
+            limpio, etapas, descarte = previo or next(limpiados)
+            cambios.update(etapas)
+            if descarte:
+                descartes[descarte] += 1
+            else:
+                escritor.agregar(limpio)
+            if muestra:
+                muestra.agregar(*elemento_de_limpieza(original, limpio, etapas, descarte))
+
+        # El checkpoint solo cae entre lotes: no queda nada a medio procesar
+        estado['leidos'] += len(lote)
+        estado['posicion_entrada'] = lote[-1][1]
+        if estado['leidos'] - ultimo_checkpoint >= checkpoint_cada:
+            guardar_checkpoint()
+            velocidad = (estado['leidos'] - ultimo_checkpoint) / max(time.time() - inicio, 1e-9)
+            ultimo_checkpoint = estado['leidos']
+            inicio = time.time()
+            print(f"   💾 {estado['leidos']:,} leídos, {escritor.escritos:,} escritos "
+                  f"({velocidad:,.0f} contactos/s)")
+
+    escritor.cerrar()
+    os.replace(ruta_parcial, salida)
+    if muestra:
+        with open(ruta_muestra, 'w', encoding='utf-8') as f:
+            json.dump([elemento for _, elemento in muestra.muestra()], f,
+                      indent=2, ensure_ascii=False, default=a_json)
+    if os.path.exists(ruta_checkpoint):
+        os.remove(ruta_checkpoint)
+
+    estado['escritos'] = escritor.escritos
+    estado['descartes'] = dict(descartes)
+    estado['cambios'] = dict(cambios)
+    return estado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Limpieza en streaming con checkpoints")
+    parser.add_argument('entrada')
+    parser.add_argument('salida')
+    parser.add_argument('--reanudar', '--resume', action='store_true',
+                        help="Seguir desde el último checkpoint")
+    parser.add_argument('--checkpoint-cada', type=int, default=CHECKPOINT_CADA,
+                        help="Contactos entre checkpoints")
+    parser.add_argument('--descartar-basura', action='store_true',
+                        help="Sacar antes de las reglas los nombres que el clasificador marca como basura")
+    parser.add_argument('--muestra', default=None, help="Escribir también una muestra estratificada")
+    parser.add_argument('--sin-filtro', action='store_true',
+                        help="No descartar los teléfonos que ya se sabe que no tienen WhatsApp")
+    parser.add_argument('--motor', choices=MOTORES, default='registros',
+                        help="Motor de limpieza: por registro o por columnas (pandas)")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                        help="Contactos por lote (con --motor columnas conviene uno grande)")
+    parser.add_argument('--metricas-puerto', type=int, default=None,
+                        help="Exponer las métricas en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument('--metricas-archivo', default=None,
+                        help="Volcar las métricas a este archivo al terminar")
+    args = parser.parse_args()
+
+    if args.metricas_puerto is not None:
+        metricas.exponer(args.metricas_puerto)
+    if args.metricas_archivo:
+        metricas.volcar_al_salir(args.metricas_archivo)
+
+    print(f"📖 Procesando {args.entrada} en streaming...")
+    try:
+        resultado = procesar(args.entrada, args.salida, args.checkpoint_cada, args.reanudar,
+                             args.descartar_basura, args.muestra, usar_filtro=not args.sin_filtro,
+                             motor=args.motor, tamano_lote=args.lote)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"📊 Leídos: {resultado['leidos']:,}")
+    for etapa, cantidad in sorted(resultado['descartes'].items()):
+        print(f"🗑️  Descartados en {etapa}: {cantidad:,}")
+    for etapa, cantidad in sorted(resultado['cambios'].items()):
+        print(f"✏️  Cambiados en {etapa}: {cantidad:,}")
+    print(f"✅ {resultado['escritos']:,} contactos en {args.salida}")
@@ -1,37 +1,34 @@
 #!/usr/bin/env python3
 import json
-import csv
 from datetime import datetime
 
+from carga_telefonos import ConjuntoTelefonos, cargar_con_estado, cargar_telefonos, telefono_a_entero
+from contacto import Contacto, a_json
+from filtro_bloom import actualizar_filtro, ruta_filtro
+from muestreo import muestra_estratificada
+from paises import pais_de_telefono
+
 print("🔍 PROCESANDO RESULTADOS DE VALIDACIÓN WHAPI")
 print("="*80)
 
-# 1. Leer números inválidos
-numeros_invalidos = set()
-with open('invalid.csv', 'r') as f:
-    for line in f:
-        numero = line.strip()
-        if numero:
-            numeros_invalidos.add(numero)
-            numeros_invalidos.add('+' + numero)  # También con +
+# 1. Leer números inválidos (carga masiva: enteros, con o sin +)
+invalidos = cargar_telefonos('invalid.csv')
+numeros_invalidos = ConjuntoTelefonos(invalidos)
+
+print(f"❌ Números SIN WhatsApp: {len(numeros_invalidos)}")
 
-print(f"❌ Números SIN WhatsApp: {len(numeros_invalidos)//2}")
+# Acumularlos en el filtro que consultan las etapas de ingreso
+filtro, nuevos = actualizar_filtro(invalidos, ruta_filtro())
+print(f"🚫 Filtro sin WhatsApp: {nuevos} nuevos, {len(filtro)} en total")
 
 # 2. Leer números válidos del result.csv
-numeros_validos = set()
-with open('result.csv', 'r') as f:
-    reader = csv.reader(f)
-    for row in reader:
-        if row and len(row) >= 2 and row[1] == 'valid':
-            numero = row[0].strip()
-            numeros_validos.add(numero)
-            numeros_validos.add('+' + numero)
+numeros_validos = ConjuntoTelefonos(cargar_con_estado('result.csv', 'valid'))
 
-print(f"✅ Números CON WhatsApp: {len(numeros_validos)//2}")
+print(f"✅ Números CON WhatsApp: {len(numeros_validos)}")
 
 # 3. Leer contactos originales
 with open('CONTACTOS_FINALES_SIN_A.json', 'r') as f:
-    contactos_originales = json.load(f)
+    contactos_originales = json.load(f, object_hook=Contacto.desde_dict)
 
 print(f"📊 Total contactos originales: {len(contactos_originales)}")
 
@@ -39,12 +36,10 @@ print(f"📊 Total contactos originales: {len(contactos_originales)}")
 contactos_validos = []
 contactos_invalidos = []
 
-for contacto in contactos_originales:
-    telefono = contacto['telefono']
-    telefono_sin_mas = telefono.replace('+', '')
-    
+telefonos = [telefono_a_entero(contacto['telefono']) for contacto in contactos_originales]
+for contacto, invalido in zip(contactos_originales, numeros_invalidos.contiene_lote(telefonos)):
     # Verificar si está en la lista de inválidos
-    if telefono_sin_mas in numeros_invalidos or telefono in numeros_invalidos:
+    if invalido:
         contactos_invalidos.append(contacto)
     else:
         contactos_validos.append(contacto)
@@ -57,15 +52,15 @@ print(f"   Porcentaje válido:         {(len(contactos_validos)/len(contactos_or
 # 5. Guardar archivos
 # Contactos válidos
 with open('CONTACTOS_CON_WHATSAPP.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_validos, f, indent=2, ensure_ascii=False)
+    json.dump(contactos_validos, f, indent=2, ensure_ascii=False, default=a_json)
 
 # Muestra de 50 válidos
 with open('MUESTRA_50_CON_WHATSAPP.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_validos[:50], f, indent=2, ensure_ascii=False)
+    json.dump(muestra_estratificada(contactos_validos), f, indent=2, ensure_ascii=False, default=a_json)
 
 # Contactos inválidos (para referencia)
 with open('CONTACTOS_ELIMINADOS_SIN_WHATSAPP.json', 'w', encoding='utf-8') as f:
-    json.dump(contactos_invalidos, f, indent=2, ensure_ascii=False)
+    json.dump(contactos_invalidos, f, indent=2, ensure_ascii=False, default=a_json)
 
 print("\n📁 ARCHIVOS GENERADOS:")
 print(f"   ✅ CONTACTOS_CON_WHATSAPP.json ({len(contactos_validos)} contactos)")
@@ -125,36 +120,8 @@ print("   ✅ eliminar_contactos_sin_whatsapp.sql")
 print("\n🌍 ANÁLISIS POR PAÍS (contactos válidos):")
 paises = {}
 for contacto in contactos_validos:
-    telefono = contacto['telefono']
-    if telefono.startswith('+'):
-        if telefono.startswith('+57'):
-            pais = 'Colombia'
-        elif telefono.startswith('+1'):
-            pais = 'USA/Canadá'
-        elif telefono.startswith('+52'):
-            pais = 'México'
-        elif telefono.startswith('+54'):
-            pais = 'Argentina'
-        elif telefono.startswith('+34'):
-            pais = 'España'
-        elif telefono.startswith('+44'):
-            pais = 'Reino Unido'
-        elif telefono.startswith('+55'):
-            pais = 'Brasil'
-        elif telefono.startswith('+51'):
-            pais = 'Perú'
-        elif telefono.startswith('+593'):
-            pais = 'Ecuador'
-        elif telefono.startswith('+507'):
-            pais = 'Panamá'
-        elif telefono.startswith('+506'):
-            pais = 'Costa Rica'
-        elif telefono.startswith('+503'):
-            pais = 'El Salvador'
-        else:
-            codigo = telefono[1:3]
-            pais = f'Código +{codigo}'
-        
+    pais = pais_de_telefono(contacto['telefono'])
+    if pais:
         paises[pais] = paises.get(pais, 0) + 1
 
 # Ordenar por cantidad
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Resolución de entidades: la misma persona guardada con dos números.
+
+Un huésped que escribe desde dos teléfonos queda como dos contactos con
+nombres casi iguales ('Andres Idagarra' y 'Andrés Idagarra', 'Vásquez' y
+'Basquez'). Comparar todos contra todos es cuadrático; aquí cada contacto
+cae en unos pocos bloques y solo se comparan los pares dentro de un bloque:
+
+- la firma fonética completa: las palabras del nombre en clave fonética
+  española, ordenadas ('andres idagarra' y 'idagarra andrés' coinciden);
+- el primer y el último nombre en clave fonética (cubre el segundo nombre
+  que falta: 'Juan Carlos Pérez' y 'Juan Pérez').
+
+La clave fonética quita tildes y la h muda y une los sonidos que se
+confunden al escribir: b/v, ll/y, c/s/z ante e/i, c/k/qu, g/j ante e/i
+(la g suave pasa a j antes de que gu ante e/i quede como g dura: 'Guillermo'
+-> 'giyermo', 'Gisela' -> 'jisela'). Las partículas (de, la, del...) no
+cuentan como palabras del nombre.
+Los bloques más grandes que MAX_BLOQUE (nombres muy comunes) no se
+comparan: ahí el nombre no alcanza para decir que es la misma persona.
+Los nombres de una sola palabra tampoco ('Abad' y 'Abad' en dos números
+pueden ser dos personas).
+
+Los pares con puntaje suficiente se unen (unión-búsqueda) en grupos de
+posibles duplicados, cada uno con teléfonos distintos. La entrada se lee en
+streaming y por contacto solo se guardan el teléfono, el nombre y sus claves.
+
+Uso:
+    python3 resolucion_entidades.py                          # etapa del pipeline
+    python3 resolucion_entidades.py LIBRETA.json DUPLICADOS.json --umbral 0.9
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from busqueda_difusa import distancia_edicion
+from capitalizacion import PARTICULAS
+from contacto import iterar_contactos, ruta_datos
+from normalizacion import clave_normalizada
+
+UMBRAL = 0.85
+MAX_BLOQUE = 64  # contactos por bloque; los más grandes se saltan
+PENALIZACION_PALABRA = 0.9  # por cada palabra que uno de los nombres tiene de más
+
+# Se aplican en orden sobre la clave sin tildes
+_REGLAS_FONETICAS = [
+    (re.compile(r'[^a-z]'), ''),
+    (re.compile(r'ch'), '0'),        # la ch se conserva antes de quitar la h
+    (re.compile(r'h'), ''),
+    (re.compile(r'qu(?=[ei])'), 'k'),
+    (re.compile(r'g(?=[ei])'), 'j'),  # antes que gu: esa g ya es dura
+    (re.compile(r'gu(?=[ei])'), 'g'),
+    (re.compile(r'c(?=[ei])'), 's'),
+    (re.compile(r'[cq]'), 'k'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'w'), 'u'),
+    (re.compile(r'v'), 'b'),
+    (re.compile(r'll'), 'y'),
+    (re.compile(r'y(?![aeiou])'), 'i'),
+    (re.compile(r'(.)\1+'), r'\1'),  # letras dobles: rr, ss, ...
+]
+
+
+@lru_cache(maxsize=65536)
+def clave_fonetica(palabra):
+    """Clave fonética española de una palabra: 'Vásquez' -> 'baskes', 'Hidalgo' -> 'idalgo'"""
+    clave = clave_normalizada(palabra)
+    for patron, reemplazo in _REGLAS_FONETICAS:
+        clave = patron.sub(reemplazo, clave)
+    return clave
+
+
+def palabras_foneticas(nombre):
+    """Claves fonéticas de las palabras del nombre (sin partículas ni iniciales sueltas)"""
+    claves = (clave_fonetica(palabra) for palabra in (nombre or '').split()
+              if clave_normalizada(palabra) not in PARTICULAS)
+    return tuple(clave for clave in claves if len(clave) > 1)
+
+
+def claves_bloque(palabras):
+    """Bloques a los que pertenece un nombre; ninguno si tiene una sola palabra"""
+    if len(palabras) < 2:
+        return []
+    return ['=' + ' '.join(sorted(palabras)),
+            '~' + ' '.join(sorted((palabras[0], palabras[-1])))]
+
+
+def similitud_palabras(a, b):
+    """1 - distancia de edición relativa entre dos claves fonéticas"""
+    largo = max(len(a), len(b))
+    maximo = largo // 3
+    distancia = distancia_edicion(a, b, maximo)
+    return 0.0 if distancia > maximo else 1 - distancia / largo
+
+
+def puntaje(a, b):
+    """
+    Parecido entre dos nombres (tuplas de claves fonéticas), de 0 a 1: cada
+    palabra del más corto con su mejor pareja en el otro, y una penalización
+    por cada palabra de diferencia
+    """
+    if sorted(a) == sorted(b):
+        return 1.0
+    corto, largo = (a, b) if len(a) <= len(b) else (b, a)
+    total = 0.0
+    for palabra in corto:
+        total += max(similitud_palabras(palabra, otra) for otra in largo)
+    return total / len(corto) * PENALIZACION_PALABRA ** (len(largo) - len(corto))
+
+
+class UnionBusqueda:
+    """Conjuntos disjuntos sobre 0..n-1 (compresión de caminos y unión por tamaño)"""
+
+    def __init__(self, n):
+        self._padre = list(range(n))
+        self._tamano = [1] * n
+
+    def raiz(self, i):
+        padre = self._padre
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
+    def unir(self, i, j):
+        i, j = self.raiz(i), self.raiz(j)
+        if i == j:
+            return False
+        if self._tamano[i] < self._tamano[j]:
+            i, j = j, i
+        self._padre[j] = i
+        self._tamano[i] += self._tamano[j]
+        return True
+
+
+def agrupar(contactos, umbral=UMBRAL, max_bloque=MAX_BLOQUE, estadisticas=None):
+    """
+    Grupos de posibles duplicados: lista de listas de (telefono, nombre),
+    los grupos más grandes primero. Si se pasa un Counter en `estadisticas`,
+    se cuentan ahí contactos, bloques, bloques saltados y pares comparados
+    """
+    estadisticas = Counter() if estadisticas is None else estadisticas
+    registros = []
+    bloques = defaultdict(list)
+    for contacto in contactos:
+        palabras = palabras_foneticas(contacto.get('nombre'))
+        claves = claves_bloque(palabras)
+        estadisticas['contactos'] += 1
+        if not claves:
+            continue
+        i = len(registros)
+        registros.append((contacto['telefono'], contacto['nombre'], palabras))
+        for clave in claves:
+            bloques[sys.intern(clave)].append(i)
+
+    grupos = UnionBusqueda(len(registros))
+    for clave, miembros in bloques.items():
+        if len(miembros) < 2:
+            continue
+        estadisticas['bloques'] += 1
+        if len(miembros) > max_bloque:
+            estadisticas['bloques_saltados'] += 1
+            continue
+        if clave[0] == '=':
+            # Misma firma fonética: puntaje 1 sin comparar par por par
+            for i, j in zip(miembros, miembros[1:]):
+                if registros[i][0] != registros[j][0]:
+                    grupos.unir(i, j)
+            continue
+        # Dos contactos comparten a lo sumo un bloque '~' sin compartir el '='
+        # (con la misma firma ya quedaron unidos), así que cada par se mide una vez
+        for posicion, i in enumerate(miembros):
+            telefono_i, _, palabras_i = registros[i]
+            for j in miembros[posicion + 1:]:
+                telefono_j, _, palabras_j = registros[j]
+                if telefono_i == telefono_j or grupos.raiz(i) == grupos.raiz(j):
+                    continue
+                estadisticas['pares'] += 1
+                if puntaje(palabras_i, palabras_j) >= umbral:
+                    grupos.unir(i, j)
+
+    por_raiz = defaultdict(list)
+    for i, (telefono, nombre, _) in enumerate(registros):
+        por_raiz[grupos.raiz(i)].append((telefono, nombre))
+    resultado = [miembros for miembros in por_raiz.values() if len(miembros) > 1]
+    resultado.sort(key=lambda miembros: (-len(miembros), miembros[0][1], miembros[0][0]))
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agrupa contactos que parecen la misma persona con otro número")
+    parser.add_argument('entrada', nargs='?', default=None,
+                        help="JSON de contactos (por defecto CONTACTOS_CON_WHATSAPP.json)")
+    parser.add_argument('salida', nargs='?', default=None,
+                        help="JSON de grupos (por defecto POSIBLES_DUPLICADOS.json)")
+    parser.add_argument('--umbral', type=float, default=UMBRAL, help="Puntaje mínimo para unir dos contactos")
+    parser.add_argument('--max-bloque', type=int, default=MAX_BLOQUE,
+                        help="Bloques más grandes que esto no se comparan")
+    args = parser.parse_args()
+
+    entrada = args.entrada or ruta_datos('CONTACTOS_CON_WHATSAPP.json')
+    salida = args.salida or ruta_datos('POSIBLES_DUPLICADOS.json')
+
+    print(f"📖 Buscando personas repetidas en {entrada}...")
+    inicio = time.perf_counter()
+    estadisticas = Counter()
+    grupos = agrupar(iterar_contactos(entrada), args.umbral, args.max_bloque, estadisticas)
+    segundos = time.perf_counter() - inicio
+
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump([{'contactos': [{'nombre': nombre, 'telefono': telefono} for telefono, nombre in miembros]}
+                   for miembros in grupos], f, indent=2, ensure_ascii=False)
+
+    print(f"📊 {estadisticas['contactos']:,} contactos, {estadisticas['bloques']:,} bloques "
+          f"({estadisticas['bloques_saltados']:,} saltados por grandes), "
+          f"{estadisticas['pares']:,} pares comparados en {segundos:.1f}s")
+    print(f"👥 {len(grupos):,} grupos de posibles duplicados "
+          f"({sum(len(g) for g in grupos):,} contactos)")
+    for miembros in grupos[:10]:
+        print("   " + "  ↔  ".join(f"{nombre} ({telefono})" for telefono, nombre in miembros))
+    print(f"✅ {salida}")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Servicio local de limpieza de contactos.
+
+Mantiene el motor cargado (reglas compiladas, léxicos y tabla de
+correcciones) para que el bot y los jobs de sincronización limpien
+contactos nuevos sin arrancar un proceso por cada uno.
+
+Modos:
+    python3 servicio_limpieza.py --puerto 8765
+        POST /limpiar  con un contacto o una lista de contactos (JSON)
+        GET  /salud
+        GET  /metricas  (también /metrics) en formato de Prometheus
+
+    python3 servicio_limpieza.py --stdio
+        Una línea JSON por petición (contacto o lista) en stdin,
+        una línea JSON por respuesta en stdout.
+
+Los contactos descartados (sin nombre válido) se devuelven como null. Con
+--descartar-basura, los nombres que clasificador_basura marca como basura
+('?? Kk', '01 19') se descartan antes de pasar por las reglas. Los
+teléfonos del filtro de números sin WhatsApp (filtro_bloom) también se
+devuelven como null, salvo con --sin-filtro.
+"""
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metricas
+from contacto import a_json
+from filtro_bloom import cargar_filtro
+from motor_limpieza import limpiar, limpiar_lote
+
+
+def procesar_peticion(datos, descartar_basura=False, filtro=None):
+    """Un contacto -> un resultado; una lista -> una lista de resultados"""
+    if isinstance(datos, list):
+        return limpiar_lote(datos, descartar_basura, filtro=filtro)
+    if descartar_basura or filtro is not None:
+        return limpiar_lote([datos], descartar_basura, filtro=filtro)[0]
+    return limpiar(datos)
+
+
+class ManejadorLimpieza(BaseHTTPRequestHandler):
+
+    def _responder(self, estado, cuerpo):
+        contenido = json.dumps(cuerpo, ensure_ascii=False, default=a_json).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def do_GET(self):
+        if self.path == '/salud':
+            self._responder(200, {'estado': 'ok'})
+        elif self.path in ('/metricas', '/metrics'):
+            contenido = metricas.REGISTRO.texto().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+        else:
+            self._responder(404, {'error': 'Ruta no encontrada'})
+
+    def do_POST(self):
+        if self.path != '/limpiar':
+            self._responder(404, {'error': 'Ruta no encontrada'})
+            return
+
+        largo = int(self.headers.get('Content-Length', 0))
+        try:
+            datos = json.loads(self.rfile.read(largo) or b'null')
+        except json.JSONDecodeError as e:
+            self._responder(400, {'error': f'JSON inválido: {e}'})
+            return
+
+        if not isinstance(datos, (dict, list)):
+            self._responder(400, {'error': 'Se espera un contacto o una lista de contactos'})
+            return
+
+        try:
+            self._responder(200, procesar_peticion(datos, self.server.descartar_basura, self.server.filtro))
+        except (KeyError, TypeError, AttributeError) as e:
+            self._responder(400, {'error': f'Contacto inválido: {e}'})
+
+    def log_message(self, formato, *args):
+        # Sin log por petición: el servicio atiende miles de contactos
+        pass
+
+
+def servir_http(host, puerto, descartar_basura=False, filtro=None):
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorLimpieza)
+    servidor.descartar_basura = descartar_basura
+    servidor.filtro = filtro
+    print(f"🚀 Servicio de limpieza en http://{host}:{puerto} (POST /limpiar)", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+def servir_stdio(entrada=sys.stdin, salida=sys.stdout, descartar_basura=False, filtro=None):
+    for linea in entrada:
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            respuesta = procesar_peticion(json.loads(linea), descartar_basura, filtro)
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            respuesta = {'error': str(e)}
+        salida.write(json.dumps(respuesta, ensure_ascii=False, default=a_json) + '\n')
+        salida.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio local de limpieza de contactos")
+    parser.add_argument('--stdio', action='store_true', help="Modo JSONL por stdin/stdout")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--descartar-basura', action='store_true',
+                        help="Descartar de entrada los nombres que el clasificador marca como basura")
+    parser.add_argument('--sin-filtro', action='store_true',
+                        help="No descartar los teléfonos que ya se sabe que no tienen WhatsApp")
+    parser.add_argument('--metricas-puerto', type=int, default=None,
+                        help="Exponer las métricas en otro puerto (en modo --stdio)")
+    parser.add_argument('--metricas-archivo', default=None,
+                        help="Volcar las métricas a este archivo al terminar")
+    args = parser.parse_args()
+
+    if args.metricas_puerto is not None:
+        metricas.exponer(args.metricas_puerto, args.host)
+    if args.metricas_archivo:
+        metricas.volcar_al_salir(args.metricas_archivo)
+
+    filtro = None if args.sin_filtro else cargar_filtro()
+    if args.stdio:
+        servir_stdio(descartar_basura=args.descartar_basura, filtro=filtro)
+    else:
+        servir_http(args.host, args.puerto, args.descartar_basura, filtro)
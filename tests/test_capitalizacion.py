@@ -0,0 +1,50 @@
+"""
+Pruebas de capitalizacion.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from capitalizacion import capitalizar_nombre  # noqa: E402
+from motor_limpieza import limpiar_detallado_lote  # noqa: E402
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+class TestPrefijoMc(unittest.TestCase):
+
+    def test_mc_solo_si_ya_viene_o_es_apellido_conocido(self):
+        self.assertEqual(capitalizar_nombre('Mcarolina'), 'Mcarolina')
+        self.assertEqual(capitalizar_nombre('mcamila ruiz'), 'Mcamila Ruiz')
+        self.assertEqual(capitalizar_nombre('McNally'), 'McNally')
+        self.assertEqual(capitalizar_nombre('MCNALLY'), 'McNally')
+        self.assertEqual(capitalizar_nombre('mcnally'), 'McNally')
+        self.assertEqual(capitalizar_nombre('ana mcdonald'), 'Ana McDonald')
+
+    def test_resto_de_reglas(self):
+        self.assertEqual(capitalizar_nombre('MARIA DE LOS ANGELES'), 'Maria de los Angeles')
+        self.assertEqual(capitalizar_nombre("maría-josé o'brien"), "María-José O'Brien")
+
+    @unittest.skipIf(pandas is None, "sin pandas")
+    def test_los_dos_motores_coinciden(self):
+        contactos = [{'nombre': nombre, 'telefono': f'+57300000000{i}', 'nota': None}
+                     for i, nombre in enumerate(['Mcarolina', 'McNally', 'MCNALLY', 'mcnally lopez',
+                                                 '12 mcamila gomez'])]
+        registros = [(c and c.a_dict(), cambios, descarte)
+                     for c, cambios, descarte in limpiar_detallado_lote(contactos, 'registros')]
+        columnas = [(c and c.a_dict(), cambios, descarte)
+                    for c, cambios, descarte in limpiar_detallado_lote(contactos, 'columnas')]
+        self.assertEqual(columnas, registros)
+        self.assertEqual([c and c['nombre'] for c, _, _ in registros],
+                         ['Mcarolina', 'McNally', 'McNally', 'McNally Lopez', 'Mcamila Gomez'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Pruebas de carga_telefonos.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import carga_telefonos  # noqa: E402
+from carga_telefonos import cargar_telefonos  # noqa: E402
+
+# Primera línea con número y última sin salto ni relleno: las ventanas de
+# 8 y 16 bytes se saldrían del mmap
+LISTA = (b'5731687\n'
+         b'number,status\n'
+         b'+57 300,"valid"\r\n'
+         b'"12345678901234567890",x\n'
+         b'\n'
+         b'  5551234  \n'
+         b'123456789012345678 abc\n'
+         b'linea sin numero\n'
+         b'999,INVALID\n'
+         b'7,\n'
+         b'0,valid')
+
+
+class TestCargarTelefonos(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+
+    def escribir(self, contenido):
+        ruta = os.path.join(self.directorio, 'lista.csv')
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+        return ruta
+
+    def cargar(self, contenido):
+        numeros, estados, categorias = cargar_telefonos(self.escribir(contenido), con_estado=True)
+        return list(numeros), [categorias[e] for e in estados]
+
+    def test_bordes_del_archivo(self):
+        numeros, estados = self.cargar(LISTA)
+        self.assertEqual(numeros, [5731687, 57, 5551234, 123456789012345678, 999, 7, 0])
+        self.assertEqual(estados, ['', 'valid', '', 'abc', 'INVALID', '', 'valid'])
+
+    def test_archivos_diminutos(self):
+        self.assertEqual(self.cargar(b''), ([], []))
+        self.assertEqual(self.cargar(b'42'), ([42], ['']))
+        self.assertEqual(self.cargar(b'1,ok\n2'), ([1, 2], ['ok', '']))
+
+    def test_estado_largo_al_final(self):
+        numeros, estados = self.cargar(b'1,a\n573001234567,abcdefghijklmnopqrst')
+        self.assertEqual(numeros, [1, 573001234567])
+        self.assertEqual(estados, ['a', 'abcdefghijklmnop'])
+
+    def test_sin_numpy_mismo_resultado(self):
+        with mock.patch.object(carga_telefonos, 'np', None):
+            sin_numpy = self.cargar(LISTA)
+        self.assertEqual(sin_numpy, self.cargar(LISTA))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Pruebas de clasificador_basura.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clasificador_basura  # noqa: E402
+from clasificador_basura import (BASURA, NEGOCIO, PERSONA, ClasificadorBasura,  # noqa: E402
+                                 ejemplos_de_entrenamiento)
+from motor_limpieza import METRICAS  # noqa: E402
+
+CONTACTOS = [{'nombre': nombre, 'telefono': f'+5730000000{i:02d}', 'nota': None} for i, nombre in enumerate([
+    'Ana Ruiz', 'Carlos Perez', 'Maria Jose Suarez', 'Bo Andersen', 'Diego Cruz', 'Julian Mora',
+    'Taxi Pedro', 'Hotel Sol', 'Ferreteria Central', 'Pizza Roma',
+    '?? Kk', '01 19', '???',
+])]
+
+
+class TestClasificador(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        antes = METRICAS.registros.total()
+        cls.ejemplos = ejemplos_de_entrenamiento(CONTACTOS)
+        cls.registrados = METRICAS.registros.total() - antes
+        cls.modelo = ClasificadorBasura.entrenar(cls.ejemplos)
+
+    def test_entrenar_no_suma_a_las_metricas_del_motor(self):
+        self.assertEqual(self.registrados, 0)
+
+    def test_etiquetas(self):
+        etiquetas = dict(self.ejemplos)
+        self.assertEqual(etiquetas['Ana Ruiz'], PERSONA)
+        self.assertEqual(etiquetas['Taxi Pedro'], NEGOCIO)
+        self.assertEqual(etiquetas['01 19'], BASURA)
+
+    def _clases(self, nombres):
+        return [clase for clase, _ in self.modelo.clasificar_lote(nombres)]
+
+    def test_el_lexico_manda(self):
+        self.assertEqual(self.modelo.clasificar('Hotel Caribe'), (NEGOCIO, 1.0))
+        self.assertNotEqual(self.modelo.clasificar('Bo')[0], NEGOCIO)
+        self.assertNotIn(NEGOCIO, self._clases(['Bo', 'Ana', 'Sol Caribe', 'Julio']))
+
+    def test_sin_numpy_mismo_resultado(self):
+        nombres = ['Hotel Caribe', 'Bo', 'Ana Ruiz', '?? Kk', 'Pizza Roma', '']
+        con_numpy = self.modelo.clasificar_lote(nombres)
+        with mock.patch.object(clasificador_basura, 'np', None):
+            sin_numpy = self.modelo.clasificar_lote(nombres)
+        self.assertEqual([c for c, _ in sin_numpy], [c for c, _ in con_numpy])
+        for (_, a), (_, b) in zip(sin_numpy, con_numpy):
+            self.assertAlmostEqual(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
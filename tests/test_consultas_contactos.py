@@ -0,0 +1,41 @@
+"""
+Pruebas de consultas_contactos.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consultas_contactos import IndiceContactos  # noqa: E402
+
+CONTACTOS = [
+    {'nombre': 'César Montoya', 'telefono': '+573001110001', 'nota': 'Apt 1722 - 2023'},
+    {'nombre': 'Ana Ruiz', 'telefono': '+573001110002', 'nota': None},
+    {'nombre': 'Ana Ruiz Oficina', 'telefono': '+57 300 111 0002', 'nota': 'Apt 1722'},
+]
+
+
+class TestIndice(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceContactos(CONTACTOS)
+
+    def test_telefono_compartido_devuelve_todos(self):
+        self.assertEqual(self.indice.buscar_telefono('573001110002'), CONTACTOS[1:])
+        self.assertEqual(self.indice.buscar_telefono('+573001110001'), CONTACTOS[:1])
+        self.assertEqual(self.indice.buscar_telefono('+573009999999'), [])
+
+    def test_buscar_combina_telefono_compartido(self):
+        self.assertEqual(self.indice.buscar(telefono='+573001110002'), CONTACTOS[1:])
+        self.assertEqual(self.indice.buscar(telefono='+573001110002', apartamento='1722'), CONTACTOS[2:])
+
+    def test_prefijo(self):
+        self.assertEqual(self.indice.buscar_prefijo('cesar'), CONTACTOS[:1])
+        self.assertEqual(self.indice.buscar_prefijo('ana ruiz o'), CONTACTOS[2:])
+
+
+if __name__ == "__main__":
+    unittest.main()
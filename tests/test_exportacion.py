@@ -0,0 +1,49 @@
+"""
+Pruebas de exportacion.py: vCard 3.0
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exportacion import ANCHO_LINEA_VCARD, vcard  # noqa: E402
+
+
+def _desplegar(tarjeta):
+    """Líneas lógicas de una tarjeta: las de continuación empiezan con un espacio"""
+    return tarjeta.replace('\r\n ', '').split('\r\n')
+
+
+class TestVcard(unittest.TestCase):
+
+    def test_escapa_los_separadores(self):
+        tarjeta = vcard({'nombre': 'José Pérez; Hijo', 'telefono': '+573001234567',
+                         'nota': 'Reservó por Airbnb, Apt 1722\r\nllega tarde \\ ok'})
+        lineas = _desplegar(tarjeta)
+        self.assertIn('FN:José Pérez\\; Hijo', lineas)
+        self.assertIn('N:Pérez\\; Hijo;José;;;', lineas)
+        self.assertIn('NOTE:Reservó por Airbnb\\, Apt 1722\\nllega tarde \\\\ ok', lineas)
+        self.assertIn('CATEGORIES:Reservó,Airbnb,Apt 1722', lineas)
+        self.assertTrue(tarjeta.endswith('END:VCARD\r\n'))
+
+    def test_pliega_sin_cortar_caracteres(self):
+        nombre = 'Ñandú ' * 30
+        tarjeta = vcard({'nombre': nombre.strip(), 'telefono': '+573001234567', 'nota': None})
+        fisicas = tarjeta.split('\r\n')
+        # Cada línea física cabe en 75 octetos y sigue siendo UTF-8 válido
+        for linea in fisicas:
+            self.assertLessEqual(len(linea.encode('utf-8')), ANCHO_LINEA_VCARD)
+        self.assertTrue(any(linea.startswith(' ') for linea in fisicas))
+        self.assertIn('FN:' + nombre.strip(), _desplegar(tarjeta))
+
+    def test_sin_nombre_usa_el_telefono(self):
+        lineas = _desplegar(vcard({'nombre': None, 'telefono': '+573001234567', 'nota': None}))
+        self.assertIn('FN:+573001234567', lineas)
+        self.assertIn('N:;;;;', lineas)
+
+
+if __name__ == "__main__":
+    unittest.main()
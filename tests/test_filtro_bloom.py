@@ -0,0 +1,71 @@
+"""
+Pruebas de filtro_bloom.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import tempfile
+import unittest
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filtro_bloom import FiltroBloom  # noqa: E402
+
+NUMEROS = [573001110000 + i * 7 for i in range(500)]
+
+
+def _guardar(ruta):
+    filtro = FiltroBloom(capacidad=1000)
+    filtro.agregar(NUMEROS)
+    filtro.guardar(ruta)
+
+
+class TestFiltroBloom(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+        self.ruta = os.path.join(self.directorio, 'sin_whatsapp.bloom')
+
+    def test_guardar_y_cargar(self):
+        filtro = FiltroBloom(capacidad=1000)
+        self.assertEqual(filtro.agregar(NUMEROS + NUMEROS[:10]), len(NUMEROS))
+        filtro.guardar(self.ruta)
+
+        cargado = FiltroBloom.cargar(self.ruta)
+        self.assertEqual(len(cargado), len(NUMEROS))
+        self.assertTrue(all(cargado.contiene(n) for n in NUMEROS))
+        self.assertFalse(any(cargado.contiene(n + 1) for n in NUMEROS))
+        self.assertTrue(cargado.contiene_telefono(f'+{NUMEROS[0]}'))
+        self.assertEqual(os.listdir(self.directorio), ['sin_whatsapp.bloom'])
+
+    def test_unir(self):
+        a = FiltroBloom(capacidad=1000)
+        a.agregar(NUMEROS[:300])
+        b = FiltroBloom(capacidad=1000)
+        b.agregar(NUMEROS[200:])
+        a.unir(b)
+        self.assertEqual(len(a), len(NUMEROS))
+        self.assertTrue(all(a.contiene(n) for n in NUMEROS))
+
+    def test_unir_reconstruye_si_se_llena(self):
+        a = FiltroBloom(capacidad=100)
+        a.agregar(NUMEROS[:100])
+        b = FiltroBloom(capacidad=1000)
+        b.agregar(NUMEROS)
+        a.unir(b)
+        self.assertGreaterEqual(a.capacidad, len(NUMEROS))
+        self.assertTrue(all(a.contiene(n) for n in NUMEROS))
+
+    def test_escrituras_simultaneas(self):
+        with Pool(4) as procesos:
+            procesos.map(_guardar, [self.ruta] * 16)
+        self.assertEqual(os.listdir(self.directorio), ['sin_whatsapp.bloom'])
+        self.assertEqual(len(FiltroBloom.cargar(self.ruta)), len(NUMEROS))
+
+
+if __name__ == "__main__":
+    unittest.main()
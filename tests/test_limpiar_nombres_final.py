@@ -0,0 +1,46 @@
+"""
+Pruebas de limpiar_nombres_final.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limpiar_nombres_final import limpiar_nombre, procesar_nota  # noqa: E402
+
+
+class TestLimpiarNombre(unittest.TestCase):
+
+    def test_meses_como_palabra_completa(self):
+        # La alternativa de meses ya no corta prefijos ("Mar" de "Marcela")
+        self.assertEqual(limpiar_nombre('Marcela'), 'Marcela')
+        self.assertEqual(limpiar_nombre('Juliana'), 'Juliana')
+        self.assertEqual(limpiar_nombre('Maria Lopez'), 'Maria Lopez')
+
+    def test_mes_sin_fecha_es_un_nombre(self):
+        self.assertEqual(limpiar_nombre('Julio'), 'Julio')
+        self.assertEqual(limpiar_nombre('Julio Guecha'), 'Julio Guecha')
+        self.assertEqual(limpiar_nombre('Julio de la Cruz'), 'Julio de la Cruz')
+        self.assertEqual(limpiar_nombre('Ana Julio'), 'Ana Julio')
+
+    def test_fechas_al_inicio(self):
+        self.assertEqual(limpiar_nombre('03 04 2025erika Sotelo'), 'Erika Sotelo')
+        self.assertEqual(limpiar_nombre('Febrero de 2023ana'), 'Ana')
+        self.assertEqual(limpiar_nombre('1 de Abril de 2023sandra Varela'), 'Sandra Varela')
+        self.assertEqual(limpiar_nombre('03 Julio Guecha'), 'Guecha')
+        self.assertEqual(limpiar_nombre('Mar 6 Ago 2024yessenia Lara'), 'Yessenia Lara')
+        self.assertEqual(limpiar_nombre('Mayo 3 2024walter Cadozo'), 'Walter Cadozo')
+        self.assertEqual(limpiar_nombre('03 B Juan'), 'Juan')
+        self.assertIsNone(limpiar_nombre('Jue 16 May'))
+
+    def test_la_fecha_pasa_a_la_nota(self):
+        self.assertEqual(procesar_nota(None, 'Mar 6 Ago 2024yessenia Lara'), '6 Ago 2024')
+        self.assertEqual(procesar_nota('Apt 1102', '1 de Abril de 2023sandra'), '1 de Abril de 2023 - Apt 1102')
+        self.assertIsNone(procesar_nota(None, 'Julio Guecha'))
+
+
+if __name__ == "__main__":
+    unittest.main()
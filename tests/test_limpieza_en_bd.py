@@ -0,0 +1,68 @@
+"""
+Pruebas de limpieza_en_bd.py sobre una réplica SQLite
+
+    python3 -m pytest tests/
+"""
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limpieza_en_bd import SQLITE, limpiar_tabla, preparar_sqlite  # noqa: E402
+
+CONTACTOS = [
+    {'nombre': '1 de Abril de 2023sandra Varela Alfaro', 'telefono': '+573001110001', 'nota': None},
+    {'nombre': '10 de Enero de 2023johan Camilo Olaya Olaya', 'telefono': '+573001110002', 'nota': None},
+    {'nombre': '1 Diego Cruz', 'telefono': '+573001110003', 'nota': None},
+    {'nombre': 'Julioguecha', 'telefono': '+573001110004', 'nota': 'Apt 1102'},
+    {'nombre': 'Ana Ruiz', 'telefono': '+573001110005', 'nota': None},
+]
+
+
+class TestLimpiezaEnBd(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        entrada = os.path.join(directorio.name, 'contactos.json')
+        with open(entrada, 'w', encoding='utf-8') as f:
+            json.dump(CONTACTOS, f, ensure_ascii=False)
+        base = os.path.join(directorio.name, 'contactos.db')
+        preparar_sqlite(entrada, base, columna_nota='nota')
+        self.conexion = sqlite3.connect(base)
+        self.addCleanup(self.conexion.close)
+
+    def limpiar(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return limpiar_tabla(self.conexion, SQLITE, tamano_lote=2, columna_nota='nota')
+
+    def tabla(self):
+        return {telefono: (nombre, nota) for telefono, nombre, nota in
+                self.conexion.execute('SELECT "phoneNumber", "name", "nota" FROM "Contactos"')}
+
+    def test_no_escribe_nombres_que_quedan_solo_en_particulas(self):
+        totales = self.limpiar()
+        tabla = self.tabla()
+        self.assertGreaterEqual(totales['sospechosos'], 2)
+        self.assertEqual(tabla['+573001110001'][0], '1 de Abril de 2023sandra Varela Alfaro')
+        self.assertEqual(tabla['+573001110002'][0], '10 de Enero de 2023johan Camilo Olaya Olaya')
+        self.assertEqual(tabla['+573001110003'][0], 'Diego Cruz')
+        self.assertNotIn('De de', {nombre for nombre, _ in tabla.values()})
+
+    def test_segunda_corrida_no_cambia_nada(self):
+        self.limpiar()
+        antes = self.tabla()
+        totales = self.limpiar()
+        self.assertEqual(totales['actualizados'], 0)
+        self.assertEqual(self.tabla(), antes)
+        self.assertNotEqual(antes['+573001110004'][0], 'Guecha')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Pruebas de metricas.py
+
+    python3 -m pytest tests/
+    python3 -m unittest discover tests
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import metricas  # noqa: E402
+
+CONTACTOS = [
+    {'nombre': '03 04 2025erika Sotelo', 'telefono': '+573001112233', 'nota': None},
+    {'nombre': 'Ana Ruiz', 'telefono': '+573001112234', 'nota': None},
+    {'nombre': '01 19', 'telefono': '+573001112235', 'nota': None},
+]
+
+
+class TestCliMetricas(unittest.TestCase):
+
+    def test_cli_vuelca_las_metricas_del_motor(self):
+        # Como script, metricas.py es __main__: lo volcado tiene que ser el
+        # registro del módulo metricas, donde escribe el motor
+        with tempfile.TemporaryDirectory() as directorio:
+            entrada = os.path.join(directorio, 'contactos.json')
+            salida = os.path.join(directorio, 'metricas.prom')
+            with open(entrada, 'w', encoding='utf-8') as f:
+                json.dump(CONTACTOS, f, ensure_ascii=False)
+
+            subprocess.run([sys.executable, os.path.join(RAIZ, 'metricas.py'), entrada, '--salida', salida],
+                           cwd=directorio, env=dict(os.environ, PYTHONPATH=RAIZ),
+                           check=True, capture_output=True)
+            with open(salida, encoding='utf-8') as f:
+                texto = f.read()
+
+        self.assertIn('limpieza_etapa_resultados_total{etapa="definitiva",resultado="cambiado"}', texto)
+        self.assertIn('limpieza_etapa_resultados_total{etapa="definitiva",resultado="descartado"} 1', texto)
+        self.assertIn('limpieza_etapa_resultados_total{etapa="a_inicial",resultado="intacto"}', texto)
+
+
+class TestTasa(unittest.TestCase):
+
+    def test_tasa_en_ventana_deslizante(self):
+        procesados = metricas.Contador('prueba_total', 'Prueba')
+        reloj = [1000.0]
+        with mock.patch.object(metricas.time, 'monotonic', lambda: reloj[0]):
+            tasa = metricas._Tasa(procesados, ventana=60)
+
+            # Primer minuto: 100 por segundo
+            for _ in range(4):
+                reloj[0] += 15
+                procesados.inc(1500)
+                self.assertEqual(tasa(), 100)
+
+            # Se frena a 10 por segundo: después de un minuto ya no pesa el arranque
+            for _ in range(4):
+                reloj[0] += 15
+                procesados.inc(150)
+            self.assertEqual(tasa(), 10)
+
+            # Sin avance, la tasa cae a 0 aunque el promedio total sea alto
+            reloj[0] += 60
+            self.assertEqual(tasa(), 0)
+            reloj[0] += 15
+            self.assertEqual(tasa(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Pruebas de motor_vectorizado.py: mismo resultado que el motor por registro
+
+    python3 -m pytest tests/
+"""
+import json
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from motor_limpieza import limpiar_detallado_lote  # noqa: E402
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+# Casos que el motor por columnas resuelve por su cuenta o devuelve al motor por registro
+CASOS = ['03 04 2025erika Sotelo', 'Ana Ruiz', '01 19', '?? Kk', 'MARIA DE LOS ANGELES', 'Julioguecha',
+         '1 de Abril de 2023sandra Varela Alfaro', 'A Camilo', 'de Mar 2024 B Juan-Pablo', 'Mcarolina', '', None]
+
+
+def _resultados(contactos, motor):
+    return [(c and c.a_dict(), cambios, descarte)
+            for c, cambios, descarte in limpiar_detallado_lote(contactos, motor)]
+
+
+@unittest.skipIf(pandas is None, "sin pandas")
+class TestMotoresIguales(unittest.TestCase):
+
+    def test_libreta_del_repositorio(self):
+        with open(os.path.join(RAIZ, 'contactos_ultra_limpios.json'), 'r', encoding='utf-8') as f:
+            contactos = json.load(f)
+        self.assertEqual(_resultados(contactos, 'columnas'), _resultados(contactos, 'registros'))
+
+    def test_casos_de_borde(self):
+        contactos = [{'nombre': nombre, 'telefono': f'+5730011100{i:02d}', 'nota': 'Apt 1102 ' if i % 2 else None}
+                     for i, nombre in enumerate(CASOS)]
+        self.assertEqual(_resultados(contactos, 'columnas'), _resultados(contactos, 'registros'))
+
+
+if __name__ == "__main__":
+    unittest.main()
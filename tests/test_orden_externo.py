@@ -0,0 +1,50 @@
+"""
+Pruebas de orden_externo.py: lectura de exportaciones CSV
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orden_externo import iterar_csv  # noqa: E402
+
+
+class TestIterarCsv(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, 'contactos.csv')
+
+    def leer(self, texto):
+        with open(self.ruta, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        return [(c['nombre'], c['telefono'], c['nota']) for c in iterar_csv(self.ruta)]
+
+    def test_google_prefiere_name(self):
+        contactos = self.leer(
+            'Given Name,Name,Family Name,Notes,Phone 1 - Type,Phone 1 - Value\n'
+            'Ana,Ana Ruiz,Ruiz,Apt 1102,Mobile,+57 300 111 0001 ::: +1 555\n'
+            'Luis,,Mora,,Mobile,+573001110002\n')
+        self.assertEqual(contactos, [('Ana Ruiz', '+57 300 111 0001', 'Apt 1102'),
+                                     ('Luis Mora', '+573001110002', None)])
+
+    def test_google_nuevo_sin_name(self):
+        contactos = self.leer(
+            'First Name,Middle Name,Last Name,Nickname,Phone 1 - Label,Phone 1 - Value\n'
+            'Maria,Jose,Suarez,Majo,Mobile,+573001110003\n'
+            ',,,Taller,Work,+573001110004\n')
+        self.assertEqual(contactos, [('Maria Jose Suarez', '+573001110003', None),
+                                     (None, '+573001110004', None)])
+
+    def test_sin_columnas_conocidas_usa_la_que_contiene_nombre(self):
+        contactos = self.leer('Nombre del contacto,Celular\nPedro Gil,+573001110005\n')
+        self.assertEqual(contactos, [('Pedro Gil', '+573001110005', None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
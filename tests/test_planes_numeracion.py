@@ -0,0 +1,51 @@
+"""
+Pruebas de planes_numeracion.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import planes_numeracion  # noqa: E402
+from planes_numeracion import (DESCONOCIDO, FIJO, IMPOSIBLE, MOVIL, POSIBLE, TIPOS,  # noqa: E402
+                               cargar_planes, separar_para_validar)
+
+CASOS = [
+    (6056943337, FIJO),         # fijo colombiano sin el 57
+    (5813070235, IMPOSIBLE),    # Venezuela con 8 dígitos después del 58
+    (573001234567, MOVIL),
+    (576056943337, FIJO),
+    (6012345678, POSIBLE),      # Bogotá sin el 57 o celular de Malasia
+    (584141234567, MOVIL),
+    (14155552671, POSIBLE),
+    (99912345678, DESCONOCIDO),
+    (10 ** 16, IMPOSIBLE),      # más de 15 dígitos
+]
+
+
+class TestPlanes(unittest.TestCase):
+
+    def test_clasificar(self):
+        planes = cargar_planes()
+        for numero, tipo in CASOS:
+            self.assertEqual(planes.clasificar(numero), tipo, numero)
+
+    def test_lote_igual_que_uno_a_uno(self):
+        numeros = [numero for numero, _ in CASOS]
+        esperados = [TIPOS.index(tipo) for _, tipo in CASOS]
+        self.assertEqual(list(cargar_planes().clasificar_lote(numeros)), esperados)
+        with mock.patch.object(planes_numeracion, 'np', None):
+            self.assertEqual(list(cargar_planes().clasificar_lote(numeros)), esperados)
+
+    def test_separar_para_validar(self):
+        a_validar, rechazados, _ = separar_para_validar([numero for numero, _ in CASOS])
+        self.assertEqual(rechazados, [(n, t) for n, t in CASOS if t in (FIJO, IMPOSIBLE)])
+        self.assertEqual(list(a_validar), [n for n, t in CASOS if t not in (FIJO, IMPOSIBLE)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Pruebas de procesar_flujo.py: checkpoints y reanudación
+
+    python3 -m pytest tests/
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import procesar_flujo  # noqa: E402
+from filtro_bloom import FiltroBloom  # noqa: E402
+
+CONTACTOS = 1200
+CORTE = 700  # contactos escritos antes de la interrupción simulada
+
+
+class Interrupcion(Exception):
+    pass
+
+
+def _contactos():
+    with open(os.path.join(RAIZ, 'contactos_ultra_limpios.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)[:CONTACTOS]
+
+
+class TestReanudar(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+        self.entrada = self.ruta('libreta.json')
+        with open(self.entrada, 'w', encoding='utf-8') as f:
+            json.dump(_contactos(), f, ensure_ascii=False)
+
+        # Filtro propio en vez del del directorio de datos
+        self.ruta_filtro = self.ruta('sin_whatsapp.bloom')
+        self.guardar_filtro([573001234567])
+        for nombre, valor in (('ruta_filtro', lambda: self.ruta_filtro),
+                              ('cargar_filtro', lambda: FiltroBloom.cargar(self.ruta_filtro))):
+            parche = mock.patch.object(procesar_flujo, nombre, valor)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def guardar_filtro(self, numeros):
+        filtro = FiltroBloom(capacidad=1000)
+        filtro.agregar(numeros)
+        filtro.guardar(self.ruta_filtro)
+
+    def procesar(self, salida, **opciones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return procesar_flujo.procesar(self.entrada, salida, checkpoint_cada=200, tamano_lote=100,
+                                           ruta_muestra=salida + '.muestra', **opciones)
+
+    def interrumpir(self, salida):
+        agregar = procesar_flujo.EscritorContactos.agregar
+
+        def agregar_hasta_el_corte(escritor, contacto):
+            if escritor.escritos >= CORTE:
+                raise Interrupcion()
+            agregar(escritor, contacto)
+
+        with mock.patch.object(procesar_flujo.EscritorContactos, 'agregar', agregar_hasta_el_corte):
+            with self.assertRaises(Interrupcion):
+                self.procesar(salida)
+        self.assertTrue(os.path.exists(salida + '.checkpoint'))
+
+    def leer(self, ruta):
+        with open(ruta, 'rb') as f:
+            return f.read()
+
+    def test_reanudar_da_la_misma_salida_byte_a_byte(self):
+        completa = self.ruta('completa.json')
+        self.procesar(completa)
+
+        reanudada = self.ruta('reanudada.json')
+        self.interrumpir(reanudada)
+        self.procesar(reanudada, reanudar=True)
+
+        self.assertEqual(self.leer(reanudada), self.leer(completa))
+        self.assertEqual(self.leer(reanudada + '.muestra'), self.leer(completa + '.muestra'))
+        self.assertFalse(os.path.exists(reanudada + '.checkpoint'))
+        self.assertFalse([nombre for nombre in os.listdir(self.directorio) if nombre.endswith('.tmp')])
+
+    def test_no_reanuda_si_cambio_el_filtro(self):
+        salida = self.ruta('salida.json')
+        self.interrumpir(salida)
+        self.guardar_filtro([573001234567, 573009999999])
+        with self.assertRaisesRegex(ValueError, 'filtro_sin_whatsapp'):
+            self.procesar(salida, reanudar=True)
+
+    def test_no_reanuda_si_cambio_la_entrada(self):
+        salida = self.ruta('salida.json')
+        self.interrumpir(salida)
+        with open(self.entrada, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        with self.assertRaisesRegex(ValueError, 'cambió'):
+            self.procesar(salida, reanudar=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Pruebas de resolucion_entidades.py
+
+    python3 -m pytest tests/
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resolucion_entidades import claves_bloque, clave_fonetica, palabras_foneticas  # noqa: E402
+
+
+class TestClaves(unittest.TestCase):
+
+    def test_g_dura_y_g_suave(self):
+        self.assertEqual(clave_fonetica('Guillermo'), 'giyermo')
+        self.assertEqual(clave_fonetica('Guevara'), 'gebara')
+        self.assertEqual(clave_fonetica('Gisela'), 'jisela')
+        self.assertEqual(clave_fonetica('Jiménez'), clave_fonetica('Giménez'))
+        self.assertNotEqual(clave_fonetica('Guillermo')[0], clave_fonetica('Gisela')[0])
+
+    def test_sonidos_que_se_confunden(self):
+        self.assertEqual(clave_fonetica('Vásquez'), clave_fonetica('Basquez'))
+        self.assertEqual(clave_fonetica('Hidalgo'), 'idalgo')
+
+    def test_particulas_no_cuentan(self):
+        self.assertEqual(palabras_foneticas('De de'), ())
+        self.assertEqual(claves_bloque(palabras_foneticas('De de')), [])
+        self.assertEqual(palabras_foneticas('María de la Cruz'), ('maria', 'krus'))
+
+
+if __name__ == "__main__":
+    unittest.main()